@@ -13,4 +13,23 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Django 앱 로딩이 끝난 뒤에 import 해야 합니다
+from maintenance.live import LIVE_PATH, live_predictions  # noqa: E402
+from maintenance.streaming import STREAM_PATH, telemetry_stream  # noqa: E402
+
+
+async def application(scope, receive, send):
+    """스트리밍 엔드포인트는 본문을 조각 단위로 읽어야 하므로 Django보다 먼저 라우팅하고,
+    WebSocket 연결은 실시간 예측 채널로 보냅니다."""
+    if scope["type"] == "http" and scope["path"] == STREAM_PATH:
+        await telemetry_stream(scope, receive, send)
+        return
+    if scope["type"] == "websocket":
+        if scope["path"] == LIVE_PATH:
+            await live_predictions(scope, receive, send)
+        else:
+            await send({"type": "websocket.close", "code": 1000})
+        return
+    await django_application(scope, receive, send)
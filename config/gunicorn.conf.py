@@ -0,0 +1,27 @@
+# config/gunicorn.conf.py
+# 사용법: gunicorn -c config/gunicorn.conf.py config.wsgi
+import gc
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', '2'))
+
+# PREDICTOR_PRELOAD=true 이면 마스터가 fork 전에 앱과 모델을 한 번만 로드하고 워커들은 copy-on-write로 공유합니다
+# (모델 파일이 바뀌면 각 워커의 감시 스레드가 새 버전을 따로 로드합니다)
+preload_app = os.environ.get('PREDICTOR_PRELOAD', 'false').lower() in ('1', 'true', 'yes', 'on')
+
+
+def when_ready(server):
+    """preload 모드에서 워커를 fork 하기 전에 마스터 프로세스에서 모델을 로드합니다."""
+    if not preload_app:
+        return
+    from maintenance import views
+    views.warm_up(start_watcher=False)
+    # 이미 만들어진 객체를 GC 추적 대상에서 빼서, 워커의 GC가 공유 페이지를 건드려 복사되지 않게 합니다
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    """워커가 Django 앱을 로드한 직후(fork 이후) 모델을 미리 로드해서 첫 요청이 느려지지 않게 합니다."""
+    from maintenance import views
+    views.warm_up()
@@ -34,6 +34,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # 단계별 소요 시간(Server-Timing 헤더)을 요청 전체 기준으로 재도록 가장 바깥에 둡니다
+    "maintenance.middleware.TimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -117,3 +119,109 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# 배치 예측 API 설정
+PREDICT_BATCH_MAX_ROWS = 10000   # 한 요청에서 받을 수 있는 최대 행 수
+PREDICT_BATCH_DB_CHUNK = 500     # bulk_create 한 번에 저장할 행 수
+
+# 추론 엔진 선택: 'xgboost'(기본) 또는 'numpy'(xgboost 없이 트리 배열로 직접 평가)
+PREDICTOR_ENGINE = env('PREDICTOR_ENGINE', default='xgboost')
+
+# 예측 기록 저장 설정 (write-behind 버퍼)
+PREDICTION_LOG_ASYNC = env.bool('PREDICTION_LOG_ASYNC', default=True)  # False면 요청 안에서 바로 저장
+PREDICTION_LOG_BATCH_SIZE = 200        # 이 개수가 쌓이면 즉시 저장
+PREDICTION_LOG_FLUSH_INTERVAL = 1.0    # 최대 대기 시간 (초)
+PREDICTION_LOG_MAX_PENDING = 10000     # 버퍼 최대 크기 (가득 차면 요청이 저장을 기다립니다)
+
+# 스트리밍 수집 엔드포인트 설정 (/api/predict/stream/, ASGI 전용)
+TELEMETRY_STREAM_BATCH_SIZE = 256          # 한 번에 예측할 최대 행 수
+TELEMETRY_STREAM_MAX_LINE_BYTES = 65536    # NDJSON 한 줄의 최대 길이
+
+# 실시간 예측 WebSocket 채널 설정 (/ws/predict/, ASGI 전용)
+LIVE_PREDICTION_TICK = 0.05        # 기계별 최신 상태를 모아 예측하는 주기 (초)
+LIVE_PREDICTION_QUEUE_SIZE = 32    # 구독자별 전송 대기 메시지 수 (넘치면 오래된 것부터 버림)
+
+# 예측 결과 LRU 캐시 설정
+PREDICTION_CACHE_ENABLED = env.bool('PREDICTION_CACHE_ENABLED', default=True)
+PREDICTION_CACHE_SIZE = 4096       # 최대 저장 항목 수
+PREDICTION_CACHE_TTL = 300.0       # 항목 유효 시간 (초)
+PREDICTION_CACHE_DECIMALS = 2      # 키를 만들 때 실수 입력을 반올림할 소수점 자리수
+
+# 사전 계산 확률 격자 설정 (manage.py build_prediction_grid 로 생성)
+PREDICTION_GRID_ENABLED = env.bool('PREDICTION_GRID_ENABLED', default=False)
+PREDICTION_GRID_PATH = BASE_DIR / 'maintenance' / 'ml' / 'models' / 'prediction_grid.npy'
+PREDICTION_GRID_METHOD = 'linear'  # 'linear'(다선형 보간) 또는 'nearest'(최근접 격자점)
+
+# 차트 정적 자산 설정 (manage.py build_chart_assets 로 생성)
+CHART_ASSETS_DIR = BASE_DIR / 'chart_assets'      # 공통 plotly.js 번들과 차트별 figure JSON 저장 위치
+CHART_ASSETS_MAX_AGE = 60 * 60 * 24 * 365         # 해시 파일명 자산의 브라우저 캐시 기간 (초)
+
+# 비교 모델 동시 예측 설정 (/api/predict/?models=all)
+MODEL_REGISTRY_WORKERS = 6    # 모델별 예측을 실행할 스레드 수
+
+# 모델 핫 리로드 설정 (모델/스케일러 파일이 바뀌면 재시작 없이 새 버전으로 교체)
+MODEL_RELOAD_WATCH = env.bool('MODEL_RELOAD_WATCH', default=True)  # 파일 감시 스레드 사용 여부
+MODEL_RELOAD_POLL_INTERVAL = 5.0     # 파일 변경 확인 주기 (초)
+MODEL_RELOAD_RETRY_BASE = 1.0        # 로드 실패 시 첫 재시도 대기 시간 (초, 실패할 때마다 2배)
+MODEL_RELOAD_RETRY_MAX = 300.0       # 재시도 대기 시간 상한 (초)
+MODEL_RELOAD_WAIT_TIMEOUT = 60.0     # 관리자 리로드 요청(wait=1)이 기다리는 최대 시간 (초)
+
+# numpy 엔진 트리 배열 캐시 (메모리 맵으로 열어 워커 프로세스들이 같은 페이지를 공유합니다)
+PREDICTOR_TREE_CACHE_DIR = BASE_DIR / 'maintenance' / 'ml' / 'models' / 'tree_arrays'
+
+# 프로세스 풀 추론 설정 (큰 배치를 워커 프로세스들에 나눠 예측, 공유 메모리로 데이터 전달)
+INFERENCE_POOL_ENABLED = env.bool('INFERENCE_POOL_ENABLED', default=False)
+INFERENCE_POOL_WORKERS = env.int('INFERENCE_POOL_WORKERS', default=os.cpu_count() or 1)  # 워커 프로세스 수
+INFERENCE_POOL_MAX_BATCH_ROWS = 4096   # 워커 한 번의 작업으로 보내는 최대 행 수
+INFERENCE_POOL_MIN_ROWS = 2048         # 이보다 작은 배치는 요청 스레드에서 바로 예측합니다
+
+# 단일 예측 마이크로 배칭 설정 (동시에 들어온 /api/predict/ 요청의 모델 예측을 한 번에 처리)
+PREDICT_BATCHER_ENABLED = env.bool('PREDICT_BATCHER_ENABLED', default=False)
+PREDICT_BATCHER_MAX_ROWS = 64        # 한 번에 예측할 최대 요청 수
+PREDICT_BATCHER_MAX_WAIT_MS = 2.0    # 첫 요청이 배치를 기다리는 최대 시간 (밀리초)
+
+# 요청 계측 설정 (단계별 소요 시간, Server-Timing 헤더, /api/timings/ 히스토그램)
+INSTRUMENTATION_ENABLED = env.bool('INSTRUMENTATION_ENABLED', default=True)
+INSTRUMENTATION_SERVER_TIMING = True            # 응답에 Server-Timing 헤더를 붙입니다
+INSTRUMENTATION_PAYLOAD_SAMPLE_RATE = env.float('INSTRUMENTATION_PAYLOAD_SAMPLE_RATE', default=0.0)  # 입력/결과까지 로그로 남길 요청 비율
+INSTRUMENTATION_SLOW_MS = 500.0                 # 이보다 오래 걸린 요청은 단계별 시간을 경고 로그로 남깁니다
+
+# 예측 기록 조회 설정 (/api/history/<machine_id>/)
+HISTORY_RAW_MAX_HOURS = 6          # 이 기간 이하의 조회는 원본 기록을, 넘으면 1분 롤업을 읽습니다
+HISTORY_RAW_LIMIT = 5000           # 원본 기록 조회의 최대 행 수 (최신순)
+PREDICTION_ROLLUP_ON_WRITE = True  # 예측 기록을 저장할 때 해당 분의 롤업을 바로 다시 집계합니다
+
+# 기계별 추세 상태 설정 (/api/trend/<machine_id>/)
+MACHINE_STATE_WINDOW = 256            # 기계별로 보관하는 최근 측정값 수 (링 버퍼 크기)
+MACHINE_STATE_EWMA_ALPHA = 0.1        # 토크/온도차 EWMA 가중치
+MACHINE_STATE_MAX_MACHINES = 10000    # 상태를 보관하는 최대 기계 수 (넘으면 오래 조회하지 않은 기계부터 버림)
+MACHINE_STATE_SETTLE_SECONDS = 2.0    # 이보다 최근 기록은 다음 조회에서 반영 (예측 기록 write-behind 지연 대비)
+MACHINE_STATE_THRESHOLD = 0.5         # 기본 고장 확률 임계값
+MACHINE_STATE_HORIZON_HOURS = 24.0    # 임계값 도달 시간을 예측하는 최대 기간 (시간)
+MACHINE_STATE_HORIZON_STEPS = 97      # 예측 기간을 나누는 시점 수 (한 번의 배치 예측)
+
+# 전체 기계 위험 현황 설정 (/api/fleet/)
+FLEET_LOOKBACK_HOURS = 24.0      # 프로세스 시작 후 처음 집계할 때 읽는 최근 기록 기간 (시간)
+FLEET_REFRESH_INTERVAL = 1.0     # 새 예측 기록을 다시 읽는 최소 간격 (초)
+FLEET_REFRESH_BATCH = 5000       # 새 기록을 한 번에 읽는 행 수
+FLEET_SETTLE_SECONDS = 2.0       # 읽은 뒤 이 시간 동안은 같은 id 구간을 다시 읽음 (늦게 커밋된 앞 번호 기록 대비)
+FLEET_DISTRIBUTION_BINS = 10     # 고장 확률 분포 구간 수
+FLEET_TOP_K = 10                 # 기본 위험 상위 기계 수
+
+# 예측 설명 설정 (/api/predict/?explain=1, 특성 기여도)
+PREDICTION_EXPLAIN_EXACT_MAX_ROWS = 64   # 이보다 큰 배치는 근사 기여도(approx_contribs)로 계산합니다
+PREDICTION_EXPLAIN_MAX_ROWS = 1000       # 배치 예측에서 설명을 요청할 수 있는 최대 행 수
+PREDICTION_EXPLAIN_BUDGET_MS = 10.0      # 단일 예측 + 설명의 p95 지연 시간 목표 (manage.py check_explain_latency)
+
+# 로그 설정 (앱 로그는 WARNING 이상, 샘플링/느린 요청 계측 로그는 INFO 이상을 콘솔로 출력)
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'maintenance': {'handlers': ['console'], 'level': env('LOG_LEVEL', default='WARNING'), 'propagate': False},
+        'maintenance.timing': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
@@ -0,0 +1,8 @@
+"""
+예측 API 벤치마크
+세 단계로 나눠 측정하고 결과를 JSON으로 저장해 커밋 간에 비교합니다 (manage.py benchmark_api).
+  - micro: preprocess_input, model.predict_proba, 예측 기록 DB 저장을 각각 따로 측정
+  - endpoint: Django 테스트 클라이언트로 뷰를 호출해 미들웨어부터 응답 직렬화까지 측정
+  - load: asyncio 클라이언트로 동시 접속 수별 처리량과 p50/p95/p99 지연 시간을 측정
+    (프로세스 안의 ASGI 앱 또는 --url로 지정한 로컬 서버)
+"""
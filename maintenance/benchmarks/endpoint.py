@@ -0,0 +1,36 @@
+"""
+엔드포인트 벤치마크: Django 테스트 클라이언트로 뷰를 호출해 미들웨어, 파싱, 예측, 기록, 직렬화를 합친 시간을 측정합니다.
+"""
+import json
+import time
+
+from django.test import Client
+
+from .results import summarize
+
+
+def run(inputs, iterations=1000, warmup=50, batch_rows=100):
+    """단일 예측(/api/predict/, 캐시/격자 허용과 exact=1)과 배치 예측(/api/predict/batch/)을 측정합니다."""
+    client = Client()
+    cases = {
+        'predict': lambda i: client.post('/api/predict/', inputs[i % len(inputs)]),
+        'predict_exact': lambda i: client.post('/api/predict/', {**inputs[i % len(inputs)], 'exact': '1'}),
+        f'predict_batch_{batch_rows}': lambda i: client.post(
+            '/api/predict/batch/', json.dumps(inputs[:batch_rows]), content_type='application/json'
+        ),
+    }
+
+    results = {}
+    for name, call in cases.items():
+        count = iterations if not name.startswith('predict_batch') else max(iterations // 10, 10)
+        for i in range(warmup):
+            call(i)
+        timings, errors = [], 0
+        for i in range(count):
+            start = time.perf_counter()
+            response = call(i)
+            timings.append(time.perf_counter() - start)
+            if response.status_code != 200 or response.json().get('status') == 'error':
+                errors += 1
+        results[name] = {**summarize(timings, 'ms'), 'errors': errors}
+    return results
@@ -0,0 +1,210 @@
+"""
+부하 벤치마크: asyncio 클라이언트로 동시 접속 수별 처리량(요청/초)과 지연 시간을 측정합니다.
+
+동시 접속 수만큼의 작업자가 각자 연결 하나로 요청을 보내고 응답을 받으면 바로 다음 요청을 보냅니다 (closed loop).
+대상은 프로세스 안의 ASGI 앱(config.asgi.application)이거나 --url로 지정한 로컬 서버이며,
+외부 HTTP 라이브러리 없이 asyncio 스트림으로 HTTP/1.1 keep-alive 요청을 보냅니다.
+"""
+import asyncio
+import secrets
+import string
+import time
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+
+from .results import summarize
+
+# JsonResponse가 예측 오류를 돌려줄 때의 본문 조각 (응답 전체를 파싱하지 않고 오류를 셉니다)
+ERROR_MARKER = b'"status": "error"'
+
+
+def csrf_headers():
+    """예측 API는 CSRF 검사를 받으므로 같은 토큰을 쿠키와 헤더로 보내는 double-submit 헤더를 만듭니다."""
+    token = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(32))
+    header = settings.CSRF_HEADER_NAME.removeprefix('HTTP_').replace('_', '-')
+    return [('Cookie', f'{settings.CSRF_COOKIE_NAME}={token}'), (header, token)]
+
+
+class ASGIConnection:
+    """프로세스 안의 ASGI 앱에 HTTP 요청을 보내는 연결입니다 (네트워크를 거치지 않습니다)."""
+
+    def __init__(self, app, headers, host='testserver'):
+        self.app = app
+        self.host = host
+        self.headers = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+
+    async def request(self, method, path, body, content_type):
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': method,
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode('latin-1'),
+            'query_string': b'',
+            'root_path': '',
+            'headers': [
+                (b'host', self.host.encode('latin-1')),
+                (b'content-type', content_type.encode('latin-1')),
+                (b'content-length', str(len(body)).encode('latin-1')),
+            ] + self.headers,
+            'client': ('127.0.0.1', 0),
+            'server': (self.host, 80),
+        }
+        received = False
+        status, chunks = None, []
+
+        async def receive():
+            nonlocal received
+            if not received:
+                received = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            # 클라이언트가 연결을 끊지 않으므로 앱이 취소할 때까지 기다립니다
+            await asyncio.Event().wait()
+
+        async def send(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+
+        await self.app(scope, receive, send)
+        return status, b''.join(chunks)
+
+    async def close(self):
+        pass
+
+
+class HTTPConnection:
+    """로컬 서버에 HTTP/1.1 keep-alive 요청을 보내는 최소한의 연결입니다.
+
+    서버가 연결을 닫으면(Connection: close 또는 유휴 연결 종료) 다음 요청에서 다시 연결합니다.
+    """
+
+    def __init__(self, host, port, headers):
+        self.host = host
+        self.port = port
+        self.headers = ''.join(f'{name}: {value}\r\n' for name, value in headers)
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body, content_type):
+        for attempt in range(2):
+            reused = self.writer is not None
+            if not reused:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            head = (
+                f'{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n'
+                f'Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n{self.headers}\r\n'
+            )
+            self.writer.write(head.encode('latin-1') + body)
+            status_line = await self.reader.readline()
+            if status_line:
+                break
+            # 재사용한 연결을 서버가 이미 닫았으면 한 번만 다시 연결합니다
+            await self.close()
+            if not reused:
+                raise ConnectionError('서버가 응답 없이 연결을 닫았습니다')
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if 'content-length' in headers:
+            data = await self.reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            parts = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                parts.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            data = b''.join(parts)
+        else:
+            data = await self.reader.read()
+            headers['connection'] = 'close'
+
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, data
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+
+def connection_factory(url=None):
+    """url이 없으면 프로세스 안의 ASGI 앱, 있으면 그 서버로 보내는 연결을 만드는 함수를 반환합니다."""
+    headers = csrf_headers()
+    if url is None:
+        from config.asgi import application
+        return lambda: ASGIConnection(application, headers)
+    parts = urlsplit(url)
+    if parts.scheme != 'http':
+        raise ValueError('부하 벤치마크는 http:// 주소만 지원합니다')
+    return lambda: HTTPConnection(parts.hostname, parts.port or 80, headers)
+
+
+async def run_level(new_connection, inputs, requests, concurrency, path='/api/predict/'):
+    """동시 접속 수 concurrency로 requests개의 요청을 보내고 처리량과 지연 시간을 반환합니다."""
+    bodies = [urlencode(row).encode('latin-1') for row in inputs]
+    content_type = 'application/x-www-form-urlencoded'
+    latencies = []
+    errors = 0
+    pending = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        connection = new_connection()
+        try:
+            for i in pending:
+                start = time.perf_counter()
+                try:
+                    status, data = await connection.request('POST', path, bodies[i % len(bodies)], content_type)
+                    failed = status != 200 or ERROR_MARKER in data
+                except (OSError, ValueError, asyncio.IncompleteReadError):
+                    await connection.close()
+                    failed = True
+                latencies.append(time.perf_counter() - start)
+                errors += failed
+        finally:
+            await connection.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    seconds = time.perf_counter() - start
+    return {
+        **summarize(latencies, 'ms'),
+        'concurrency': concurrency,
+        'errors': errors,
+        'seconds': seconds,
+        'throughput_rps': len(latencies) / seconds if seconds else None,
+    }
+
+
+def run(inputs, concurrency_levels=(1, 4, 16, 64), requests=2000, url=None, warmup=50):
+    """동시 접속 수별로 부하를 걸고 {'c<동시 접속 수>': 결과} 를 반환합니다."""
+    new_connection = connection_factory(url)
+
+    async def run_all():
+        results = {}
+        for concurrency in concurrency_levels:
+            await run_level(new_connection, inputs, max(warmup, concurrency), concurrency)
+            results[f'c{concurrency}'] = await run_level(new_connection, inputs, requests, concurrency)
+        return results
+
+    return asyncio.run(run_all())
@@ -0,0 +1,52 @@
+"""
+마이크로 벤치마크: 단일 예측을 구성하는 단계를 각각 따로 측정합니다.
+"""
+import time
+
+from .. import views
+from ..prediction_log import PredictionLogWriter
+from .results import summarize
+
+
+def measure(func, args_list, iterations, warmup):
+    """args_list를 돌아가며 func(*args)를 호출하고 호출별 소요 시간(초) 목록을 반환합니다."""
+    for i in range(warmup):
+        func(*args_list[i % len(args_list)])
+    timings = []
+    for i in range(iterations):
+        args = args_list[i % len(args_list)]
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run(inputs, iterations=2000, warmup=100, db_batch=100):
+    """preprocess_input, model.predict_proba, predict_fast(캐시 없이), 예측 기록 저장(1행/배치)을 측정합니다.
+
+    DB 저장은 실제 데이터베이스에 기록하므로 테스트 데이터베이스에서 실행해야 합니다.
+    """
+    predictor = views.get_predictor()
+    records = [views.to_predictor_input(row) for row in inputs]
+    frames = [(predictor.preprocess_input(record),) for record in records]
+    results = {}
+
+    cache, predictor.cache = predictor.cache, None
+    try:
+        results['preprocess_input'] = measure(predictor.preprocess_input, [(r,) for r in records], iterations, warmup)
+        results['predict_proba'] = measure(predictor.model.predict_proba, frames, iterations, warmup)
+        results['predict_fast'] = measure(lambda record: predictor.predict_fast(record, exact=True),
+                                          [(r,) for r in records], iterations, warmup)
+    finally:
+        predictor.cache = cache
+
+    # 예측 기록 저장은 요청 경로의 write-behind 버퍼 대신 동기 저장 비용 자체를 잽니다
+    writer = PredictionLogWriter(synchronous=True)
+    probabilities = {'HDF': 0.01, 'PWF': 0.01, 'OSF': 0.01}
+    entries = [(record, 0, probabilities) for record in records]
+    db_iterations = max(iterations // 20, 10)
+    results['db_write_1'] = measure(writer.write, [([entry],) for entry in entries], db_iterations, 5)
+    batches = [(entries[i:i + db_batch],) for i in range(0, len(entries) - db_batch + 1, db_batch)] or [(entries,)]
+    results[f'db_write_{db_batch}'] = measure(writer.write, batches, max(db_iterations // 10, 5), 2)
+
+    return {name: summarize(timings, 'us') for name, timings in results.items()}
@@ -0,0 +1,111 @@
+"""
+벤치마크 측정값 요약, 입력 생성, JSON 결과 저장/비교
+"""
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+import numpy as np
+from django.conf import settings
+
+# 지연 시간 지표는 클수록, 처리량 지표는 작을수록 나빠진 것으로 봅니다
+LATENCY_KEYS = ('p50', 'p95', 'p99')
+THROUGHPUT_KEYS = ('throughput_rps',)
+
+
+def sample_inputs(count, seed=0):
+    """학습 데이터 범위 안의 무작위 API 입력(폼 필드 이름)을 count개 만듭니다 (예측 캐시 적중을 피하기 위해 사용)."""
+    rng = np.random.default_rng(seed)
+    air = rng.uniform(296.0, 304.0, count).round(1)
+    temp_diff = rng.uniform(8.0, 11.5, count).round(1)
+    return [{
+        'type': str(rng.choice(['L', 'M', 'H'])),
+        'air_temperature': str(air[i]),
+        'process_temperature': str(round(air[i] + temp_diff[i], 1)),
+        'rotational_speed': str(int(rng.integers(1200, 2800))),
+        'torque': str(round(float(rng.uniform(10.0, 70.0)), 1)),
+        'tool_wear': str(int(rng.integers(0, 250))),
+    } for i in range(count)]
+
+
+def summarize(timings, unit='ms'):
+    """소요 시간 배열(초)을 단위(ms/us) 기준 통계 dict로 요약합니다."""
+    scale = {'ms': 1e3, 'us': 1e6}[unit]
+    values = np.asarray(timings, dtype=np.float64) * scale
+    p50, p95, p99 = np.percentile(values, [50, 95, 99]) if len(values) else (float('nan'),) * 3
+    return {
+        'unit': unit,
+        'count': int(len(values)),
+        'mean': float(values.mean()) if len(values) else None,
+        'p50': float(p50),
+        'p95': float(p95),
+        'p99': float(p99),
+        'max': float(values.max()) if len(values) else None,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment():
+    """결과 비교에 필요한 실행 환경과 성능 관련 설정을 반환합니다."""
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': {
+            name: getattr(settings, name, None) for name in (
+                'PREDICTOR_ENGINE', 'PREDICTION_CACHE_ENABLED', 'PREDICTION_GRID_ENABLED',
+                'PREDICT_BATCHER_ENABLED', 'INFERENCE_POOL_ENABLED', 'PREDICTION_LOG_ASYNC',
+                'INSTRUMENTATION_ENABLED',
+            )
+        },
+    }
+
+
+def save(path, results):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def flatten(results):
+    """결과 dict를 {'layer/name': 측정 dict} 형태로 펼칩니다."""
+    flat = {}
+    for layer in ('micro', 'endpoint', 'load'):
+        for name, metrics in (results.get(layer) or {}).items():
+            flat[f'{layer}/{name}'] = metrics
+    return flat
+
+
+def compare(current, baseline, tolerance=0.1):
+    """두 결과에 모두 있는 지표를 비교해 (지표, 기준값, 현재값, 비율, 악화 여부) 목록을 반환합니다.
+
+    지연 시간이 기준보다 tolerance 비율 넘게 늘거나 처리량이 그만큼 줄면 악화로 표시합니다.
+    """
+    rows = []
+    current, baseline = flatten(current), flatten(baseline)
+    for name in sorted(current.keys() & baseline.keys()):
+        for key in LATENCY_KEYS + THROUGHPUT_KEYS:
+            new, old = current[name].get(key), baseline[name].get(key)
+            if not new or not old:
+                continue
+            ratio = new / old
+            worse = ratio > 1 + tolerance if key in LATENCY_KEYS else ratio < 1 - tolerance
+            rows.append((f'{name}.{key}', old, new, ratio, worse))
+    return rows
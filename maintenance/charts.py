@@ -0,0 +1,206 @@
+"""
+Plotly 차트 정적 자산 빌드/조회
+plotly로 저장한 차트 HTML은 파일마다 plotly.js 번들(약 3.5MB)을 통째로 포함하고 있습니다.
+빌드 단계에서 공통 번들 하나와 차트별 figure JSON으로 나누고, 내용 해시를 붙인 파일명과
+gzip/brotli 사전 압축본으로 저장해 브라우저가 오래 캐시할 수 있게 합니다.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 의존성입니다 (없으면 gzip만 만듭니다)
+    brotli = None
+
+MANIFEST_NAME = 'manifest.json'
+
+# 응답 압축 방식과 사전 압축 파일 확장자 (선호 순서)
+ENCODING_SUFFIXES = (('br', '.br'), ('gzip', '.gz'))
+
+# plotly.js 번들은 저작권 주석으로 시작하는 <script> 블록에 들어 있습니다
+PLOTLY_BUNDLE_PATTERN = re.compile(
+    r'<script type="text/javascript">(/\*\*\s*\n\* plotly\.js.*?)</script>', re.DOTALL
+)
+NEW_PLOT_MARKER = 'Plotly.newPlot('
+
+# write_asset이 만드는 파일명 (이름.내용해시.확장자[.gz|.br])
+HASHED_NAME_PATTERN = re.compile(r'^.+\.[0-9a-f]{12}\.(?:json|min\.js)(?:\.gz|\.br)?$')
+
+
+def assets_dir():
+    """빌드 결과가 저장되는 디렉터리를 반환합니다."""
+    return Path(getattr(settings, 'CHART_ASSETS_DIR', Path(settings.BASE_DIR) / 'chart_assets'))
+
+
+def content_hash(data):
+    """파일명에 붙일 내용 해시(앞 12자리)를 반환합니다."""
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def extract_chart(html):
+    """차트 HTML에서 (plotly.js 번들, figure dict)를 추출합니다.
+
+    figure는 Plotly.newPlot(div_id, data, layout, config) 호출 인자를 그대로 담습니다.
+    """
+    match = PLOTLY_BUNDLE_PATTERN.search(html)
+    if match is None:
+        raise ValueError("plotly.js 번들을 찾을 수 없습니다")
+    bundle = match.group(1)
+
+    start = html.find(NEW_PLOT_MARKER, match.end())
+    if start < 0:
+        raise ValueError("Plotly.newPlot 호출을 찾을 수 없습니다")
+
+    # 인자들은 JSON 리터럴이므로 쉼표를 건너뛰며 차례로 디코딩합니다
+    decoder = json.JSONDecoder()
+    pos = start + len(NEW_PLOT_MARKER)
+    args = []
+    while len(args) < 4:
+        while html[pos] in ' \t\r\n,':
+            pos += 1
+        value, pos = decoder.raw_decode(html, pos)
+        args.append(value)
+
+    _, data, layout, config = args
+    return bundle, {'data': data, 'layout': layout, 'config': config}
+
+
+def write_asset(output_dir, stem, suffix, data, min_compress_size=1024):
+    """해시가 붙은 파일명으로 원본과 사전 압축본을 저장하고 파일명을 반환합니다."""
+    filename = f"{stem}.{content_hash(data)}{suffix}"
+    (output_dir / filename).write_bytes(data)
+    if len(data) >= min_compress_size:
+        (output_dir / (filename + '.gz')).write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            (output_dir / (filename + '.br')).write_bytes(brotli.compress(data, quality=11))
+    return filename
+
+
+def build_assets(chart_paths, output_dir):
+    """차트 HTML 파일들을 공통 plotly.js 번들 + 차트별 figure JSON으로 나눠 저장합니다.
+
+    chart_paths: {정적 파일 경로(예: 'images/graphs/roc_curve_knn_2.html'): 실제 파일 경로}
+    반환값: manifest dict
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    bundle = None
+    charts = {}
+    for static_path, file_path in sorted(chart_paths.items()):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            chart_bundle, figure = extract_chart(f.read())
+        if bundle is None:
+            bundle = chart_bundle
+        elif chart_bundle != bundle:
+            raise ValueError(f"plotly.js 번들이 다른 차트가 있습니다: {static_path}")
+
+        figure_json = json.dumps(figure, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        charts[static_path] = write_asset(output_dir, Path(static_path).stem, '.json', figure_json)
+
+    manifest = {'charts': charts, 'plotly': None}
+    if bundle is not None:
+        manifest['plotly'] = write_asset(output_dir, 'plotly', '.min.js', bundle.encode('utf-8'))
+
+    # 매니페스트는 마지막에 원자적으로 교체해서 빌드 중에도 이전 자산이 계속 서비스되게 합니다
+    tmp_path = output_dir / (MANIFEST_NAME + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, output_dir / MANIFEST_NAME)
+    return manifest
+
+
+def manifest_filenames(manifest):
+    """매니페스트가 참조하는 자산 파일명 집합을 반환합니다."""
+    names = set(manifest['charts'].values())
+    if manifest['plotly']:
+        names.add(manifest['plotly'])
+    return names
+
+
+def prune_assets(output_dir, manifest):
+    """매니페스트가 더 이상 참조하지 않는 이전 빌드의 해시 자산(사전 압축본 포함)을 지우고 지운 파일명을 반환합니다.
+
+    chart_asset 뷰는 현재 매니페스트에 있는 파일만 제공하므로, 매니페스트를 교체한 뒤에는 바로 지워도 됩니다.
+    """
+    keep = set()
+    for name in manifest_filenames(manifest):
+        keep.add(name)
+        keep.update(name + suffix for _, suffix in ENCODING_SUFFIXES)
+    removed = []
+    for path in Path(output_dir).iterdir():
+        if path.name not in keep and HASHED_NAME_PATTERN.match(path.name) and path.is_file():
+            path.unlink()
+            removed.append(path.name)
+    return sorted(removed)
+
+
+class ChartManifest:
+    """빌드 매니페스트를 읽어 두고, 파일이 바뀌면 다시 읽는 클래스입니다."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._manifest = {'charts': {}, 'plotly': None}
+
+    def get(self):
+        """현재 매니페스트를 반환합니다. 빌드 전이면 빈 매니페스트를 반환합니다."""
+        path = self.directory / MANIFEST_NAME
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    if mtime is None:
+                        self._manifest = {'charts': {}, 'plotly': None}
+                    else:
+                        with open(path, 'r', encoding='utf-8') as f:
+                            self._manifest = json.load(f)
+                    self._mtime = mtime
+        return self._manifest
+
+    def mtime(self):
+        """마지막으로 읽은 매니페스트의 수정 시각(ns)을 반환합니다 (빌드 전이면 None)."""
+        self.get()
+        return self._mtime
+
+    def filenames(self):
+        """서비스할 수 있는 자산 파일명 집합을 반환합니다."""
+        return manifest_filenames(self.get())
+
+
+_manifest = None
+
+
+def get_manifest():
+    """프로세스 전역 ChartManifest를 반환합니다."""
+    global _manifest
+    if _manifest is None:
+        _manifest = ChartManifest(assets_dir())
+    return _manifest
+
+
+def negotiate_encoding(accept_encoding, filename):
+    """Accept-Encoding과 사전 압축본 존재 여부로 (파일 경로, Content-Encoding)을 고릅니다."""
+    accepted = set()
+    for token in accept_encoding.split(','):
+        name, _, params = token.partition(';')
+        if params.replace(' ', '') not in ('q=0', 'q=0.0'):
+            accepted.add(name.strip())
+    base = assets_dir() / filename
+    for encoding, suffix in ENCODING_SUFFIXES:
+        if encoding in accepted:
+            candidate = base.with_name(base.name + suffix)
+            if candidate.exists():
+                return candidate, encoding
+    return base, None
@@ -0,0 +1,212 @@
+"""
+기계 전체(fleet) 위험 현황 집계
+기계별 최신 예측 하나씩을 메모리에 두고 고장 확률 분포, 예측 고장 유형별 기계 수, 위험 구간별 기계 목록을
+증분으로 유지합니다. 요청마다 기록 테이블 전체를 GROUP BY 하지 않고, 마지막으로 반영한 예측 기록 id 이후의
+새 기록만 기본 키 순서로 읽어 반영하므로 응답 시간은 기록이 쌓여도 새 기록 수에만 비례합니다.
+
+DB가 유일한 원본이므로 워커 프로세스가 여러 개여도 프로세스마다 같은 집계가 만들어지고,
+기계마다 더 최근 측정값만 반영하므로 순서가 뒤바뀐 기록이 있어도 최신 상태가 과거로 돌아가지 않습니다.
+기록 id는 커밋 순서가 아니라 삽입 순서이므로, 읽은 뒤 settle초 동안은 커서를 넘기지 않고 같은 구간을
+다시 읽어 늦게 커밋된 앞 번호 기록도 반영합니다 (같은 기록을 다시 반영해도 결과는 같습니다).
+"""
+import heapq
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db.models import Max
+
+from .models import SimulatorInput, SimulatorOutput
+
+# 예측 코드별 라벨 (SimulatorOutput.FAILURE_TYPES, 정상은 API와 같이 'none')
+FAILURE_LABELS = {code: 'none' if code == 0 else name for code, name in SimulatorOutput.FAILURE_TYPES}
+
+# 위험 상위 K개를 찾을 때 쓰는 고장 확률 구간 수 (분포 구간보다 촘촘하게 나눕니다)
+RISK_INDEX_BINS = 100
+
+
+def risk_bin(risk, bins):
+    return min(int(risk * bins), bins - 1)
+
+
+class FleetAggregate:
+    """기계별 최신 예측으로 만든 fleet 집계입니다.
+
+    기계의 최신 예측이 바뀌면 이전 값을 빼고 새 값을 더하므로 갱신은 O(1)입니다.
+    위험 상위 K개는 가장 높은 확률 구간부터 기계를 모아 K개가 찬 구간까지만 정렬하므로
+    위험한 기계가 소수인 일반적인 경우 기계 수가 늘어도 조회 시간이 거의 변하지 않습니다.
+    고장 확률은 HDF+PWF+OSF 확률의 합이며, 확률 없이 저장된 기록은 분포에서 'unknown'으로 셉니다.
+    """
+
+    def __init__(self, distribution_bins=10):
+        self.distribution_bins = distribution_bins
+        self.machines = {}  # machine_id -> (측정 시각, 예측 코드, {'HDF', 'PWF', 'OSF'} 또는 None, 고장 확률 또는 None)
+        self.prediction_counts = dict.fromkeys(FAILURE_LABELS.values(), 0)
+        self.distribution = [0] * distribution_bins
+        self.unknown = 0
+        self._risk_index = [set() for _ in range(RISK_INDEX_BINS)]
+
+    def apply(self, machine_id, created_at, code, probabilities):
+        """기계의 예측 하나를 반영합니다. 이미 반영한 것보다 오래된 측정값이면 무시하고 False를 반환합니다."""
+        current = self.machines.get(machine_id)
+        if current is not None:
+            if created_at < current[0]:
+                return False
+            self._count(machine_id, current, -1)
+        risk = None if probabilities is None else min(sum(probabilities.values()), 1.0)
+        entry = (created_at, code, probabilities, risk)
+        self.machines[machine_id] = entry
+        self._count(machine_id, entry, 1)
+        return True
+
+    def _count(self, machine_id, entry, sign):
+        _, code, _, risk = entry
+        self.prediction_counts[FAILURE_LABELS.get(code, 'none')] += sign
+        if risk is None:
+            self.unknown += sign
+            return
+        self.distribution[risk_bin(risk, self.distribution_bins)] += sign
+        members = self._risk_index[risk_bin(risk, RISK_INDEX_BINS)]
+        if sign > 0:
+            members.add(machine_id)
+        else:
+            members.discard(machine_id)
+
+    def top(self, k):
+        """고장 확률이 높은 기계 k개를 높은 순으로 반환합니다."""
+        candidates = []
+        for members in reversed(self._risk_index):
+            if members:
+                candidates.extend(members)
+                if len(candidates) >= k:
+                    break
+        top = heapq.nlargest(k, candidates, key=lambda machine_id: self.machines[machine_id][3])
+        return [self.describe(machine_id) for machine_id in top]
+
+    def describe(self, machine_id):
+        created_at, code, probabilities, risk = self.machines[machine_id]
+        return {
+            'machine_id': machine_id,
+            'failure_probability': risk,
+            'prediction': FAILURE_LABELS.get(code, 'none'),
+            'probabilities': probabilities,
+            'last_seen': created_at.isoformat(),
+        }
+
+    def snapshot(self, k=10):
+        width = 1 / self.distribution_bins
+        return {
+            'machines': len(self.machines),
+            'prediction_counts': dict(self.prediction_counts),
+            'distribution': [
+                {'min': round(i * width, 6), 'max': round((i + 1) * width, 6), 'count': count}
+                for i, count in enumerate(self.distribution)
+            ],
+            'unknown_probability': self.unknown,
+            'top': self.top(k),
+        }
+
+
+class FleetMonitor:
+    """예측 기록 테이블의 새 기록을 FleetAggregate에 반영하고 집계를 반환합니다.
+
+    처음에는 lookback 기간 안의 기록으로 기계별 최신 상태를 만들고, 이후에는 커서 이후의 기록만 읽습니다.
+    커서는 settle초 전까지 읽은 기록의 마지막 id이므로 그 뒤에 읽은 구간은 다음 조회에서 다시 읽습니다.
+    조회가 몰려도 refresh_interval 안에서는 DB를 다시 읽지 않습니다.
+    """
+
+    def __init__(self, lookback_hours=24.0, refresh_interval=1.0, batch_size=5000, distribution_bins=10,
+                 settle=2.0):
+        self.lookback_hours = lookback_hours
+        self.refresh_interval = refresh_interval
+        self.batch_size = batch_size
+        self.settle = settle
+        self.aggregate = FleetAggregate(distribution_bins)
+        self.cursor = None            # settle초 이상 지난 읽기까지의 마지막 기록 id
+        self._last_read = None        # 지금까지 읽은 마지막 기록 id
+        self._unsettled = deque()     # settle초가 지나지 않은 읽기의 (읽은 시각, 마지막 기록 id)
+        self._unsettled_ids = set()   # 커서 이후에 이미 반영한 기록 id (새로 읽은 기록 수에서 제외)
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+
+    def _initial_cursor(self):
+        """lookback 기간의 첫 기록 바로 앞 id를 반환합니다 (created_at 인덱스 사용)."""
+        since = datetime.now(timezone.utc) - timedelta(hours=self.lookback_hours)
+        first = (
+            SimulatorInput.objects.filter(created_at__gte=since)
+            .order_by('created_at').values_list('pk', flat=True).first()
+        )
+        if first is not None:
+            return first - 1
+        return SimulatorInput.objects.aggregate(last=Max('pk'))['last'] or 0
+
+    def refresh(self, force=False):
+        """커서 이후의 기록을 반영하고 새로 읽은 기록 수를 반환합니다."""
+        now = time.monotonic()
+        if not force and now - self._refreshed_at < self.refresh_interval:
+            return 0
+        if self.cursor is None:
+            self.cursor = self._last_read = self._initial_cursor()
+        if self._unsettled and now - self._unsettled[0][0] >= self.settle:
+            while self._unsettled and now - self._unsettled[0][0] >= self.settle:
+                self.cursor = self._unsettled.popleft()[1]
+            self._unsettled_ids = {pk for pk in self._unsettled_ids if pk > self.cursor}
+
+        read = 0
+        position = self.cursor
+        while True:
+            rows = list(
+                SimulatorOutput.objects.filter(pk__gt=position)
+                .order_by('pk')
+                .values_list('pk', 'id__machine_id', 'id__created_at', 'prediction',
+                             'probability_hdf', 'probability_pwf', 'probability_osf')[:self.batch_size]
+            )
+            for pk, machine_id, created_at, code, hdf, pwf, osf in rows:
+                if pk not in self._unsettled_ids:
+                    self._unsettled_ids.add(pk)
+                    read += 1
+                if machine_id:
+                    probabilities = None if hdf is None else {'HDF': hdf, 'PWF': pwf, 'OSF': osf}
+                    self.aggregate.apply(machine_id, created_at, code, probabilities)
+            if rows:
+                position = rows[-1][0]
+            if len(rows) < self.batch_size:
+                break
+        if position > self._last_read:
+            self._unsettled.append((now, position))
+            self._last_read = position
+        self._refreshed_at = time.monotonic()
+        return read
+
+    def snapshot(self, k=10):
+        """새 기록을 반영한 뒤 fleet 집계를 반환합니다."""
+        with self._lock:
+            start = time.perf_counter()
+            new_rows = self.refresh()
+            return {
+                **self.aggregate.snapshot(k),
+                'new_rows': new_rows,
+                'elapsed_ms': (time.perf_counter() - start) * 1000,
+            }
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_monitor():
+    """settings 값으로 구성된 프로세스 전역 FleetMonitor를 반환합니다."""
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = FleetMonitor(
+                    lookback_hours=getattr(settings, 'FLEET_LOOKBACK_HOURS', 24.0),
+                    refresh_interval=getattr(settings, 'FLEET_REFRESH_INTERVAL', 1.0),
+                    batch_size=getattr(settings, 'FLEET_REFRESH_BATCH', 5000),
+                    distribution_bins=getattr(settings, 'FLEET_DISTRIBUTION_BINS', 10),
+                    settle=getattr(settings, 'FLEET_SETTLE_SECONDS', 2.0)
+                )
+    return _monitor
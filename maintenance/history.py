@@ -0,0 +1,227 @@
+"""
+예측 기록 시계열 조회와 1분 단위 집계(롤업)
+원본 기록(SimulatorInput/SimulatorOutput)은 (machine_id, created_at) 인덱스로 짧은 기간만 읽고,
+긴 기간은 기계별 1분 집계 테이블(PredictionRollup)을 읽어 시간/일 단위로 다시 묶습니다.
+롤업은 예측 기록을 저장하는 트랜잭션 안에서 해당 (기계, 분)만 원본에서 다시 집계해 덮어씁니다(멱등).
+같은 분을 갱신하는 트랜잭션들은 롤업 행 잠금으로 차례로 실행되므로 나중에 커밋하는 쪽이 앞선 기록까지
+포함한 집계로 덮어쓰며, manage.py rollup_predictions 로 임의 구간을 다시 만들 수 있습니다.
+"""
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum
+from django.db.models.functions import Trunc
+
+from .models import PredictionRollup, SimulatorInput, SimulatorOutput
+
+UTC = dt_timezone.utc
+
+# SimulatorOutput.prediction 코드 (고장 유형별)
+FAILURE_CODES = {'HDF': 2, 'PWF': 3, 'OSF': 4}
+
+# 롤업에 덮어쓰는 집계 필드
+ROLLUP_FIELDS = [
+    'count', 'failures', 'hdf_count', 'pwf_count', 'osf_count', 'probability_count',
+    'probability_hdf_sum', 'probability_pwf_sum', 'probability_osf_sum', 'failure_probability_max'
+]
+
+# 롤업 조회 해상도 (Trunc 단위)
+RESOLUTIONS = ('minute', 'hour', 'day')
+
+# 롤업을 다시 집계할 때 쿼리 하나에 넣는 (기계, 구간) 조건 수 (조건마다 파라미터 3개)
+RANGES_PER_QUERY = 200
+
+
+def floor_minute(value):
+    """UTC 기준으로 분 단위 내림한 시각을 반환합니다."""
+    return value.astimezone(UTC).replace(second=0, microsecond=0)
+
+
+def ceil_minute(value):
+    floored = floor_minute(value)
+    return floored if floored == value else floored + timedelta(minutes=1)
+
+
+def rollup_aggregates():
+    """원본 기록을 롤업 필드로 집계하는 식을 반환합니다."""
+    failure_probability = F('probability_hdf') + F('probability_pwf') + F('probability_osf')
+    return {
+        'count': Count('pk'),
+        'failures': Count('pk', filter=~Q(prediction=0)),
+        'hdf_count': Count('pk', filter=Q(prediction=FAILURE_CODES['HDF'])),
+        'pwf_count': Count('pk', filter=Q(prediction=FAILURE_CODES['PWF'])),
+        'osf_count': Count('pk', filter=Q(prediction=FAILURE_CODES['OSF'])),
+        'probability_count': Count('probability_hdf'),
+        'probability_hdf_sum': Sum('probability_hdf', default=0.0),
+        'probability_pwf_sum': Sum('probability_pwf', default=0.0),
+        'probability_osf_sum': Sum('probability_osf', default=0.0),
+        'failure_probability_max': Max(failure_probability),
+    }
+
+
+def aggregate_minutes(outputs):
+    """SimulatorOutput 쿼리셋을 {(machine_id, 분): 집계 dict}로 묶습니다."""
+    rows = (
+        outputs.annotate(bucket=Trunc('id__created_at', 'minute', tzinfo=UTC))
+        .values('id__machine_id', 'bucket')
+        .annotate(**rollup_aggregates())
+        .order_by()
+    )
+    return {(row['id__machine_id'], row['bucket']): {field: row[field] for field in ROLLUP_FIELDS} for row in rows}
+
+
+def minute_ranges(keys):
+    """정렬된 (machine_id, 분) 키들을 기계별로 이어지는 분끼리 묶어 (machine_id, 시작, 끝) 구간으로 반환합니다."""
+    ranges = []
+    for machine_id, minute in keys:
+        if ranges and ranges[-1][0] == machine_id and ranges[-1][2] == minute:
+            ranges[-1][2] = minute + timedelta(minutes=1)
+        else:
+            ranges.append([machine_id, minute, minute + timedelta(minutes=1)])
+    return [tuple(item) for item in ranges]
+
+
+def refresh_minute_rollups(keys):
+    """(machine_id, 분) 키들의 롤업을 원본 기록에서 다시 집계해 덮어쓰고 갱신한 행 수를 반환합니다.
+
+    transaction.atomic() 블록 안에서 호출해야 합니다. 먼저 키 순서대로 롤업 행을 upsert 해서 잠그므로
+    같은 분을 갱신하는 다른 트랜잭션은 이 트랜잭션이 커밋될 때까지 기다렸다가, 커밋된 기록까지 포함해
+    다시 집계합니다. 그래서 늦게 끝난 쪽이 작은 집계로 덮어써 건수가 줄어드는 일이 없습니다.
+    """
+    keys = sorted(set(keys))
+    if not keys:
+        return 0
+    batch_size = getattr(settings, 'PREDICT_BATCH_DB_CHUNK', 500)
+    unique_fields = ['machine_id', 'minute']
+
+    # 행 잠금: 없는 키는 빈 행을 만들고 있는 키는 같은 트랜잭션 안에서 덮어쓸 값으로 잠급니다
+    PredictionRollup.objects.bulk_create(
+        [PredictionRollup(machine_id=machine_id, minute=minute) for machine_id, minute in keys],
+        batch_size=batch_size, update_conflicts=True, unique_fields=unique_fields, update_fields=['count']
+    )
+
+    # 기계 목록 x 전체 기간이 아니라 요청한 키가 속한 (기계, 구간)만 읽습니다
+    aggregates = {}
+    ranges = minute_ranges(keys)
+    for offset in range(0, len(ranges), RANGES_PER_QUERY):
+        condition = Q()
+        for machine_id, start, stop in ranges[offset:offset + RANGES_PER_QUERY]:
+            condition |= Q(id__machine_id=machine_id, id__created_at__gte=start, id__created_at__lt=stop)
+        aggregates.update(aggregate_minutes(SimulatorOutput.objects.filter(condition)))
+    # 원본 기록이 없는 키(다른 트랜잭션이 롤백한 경우 등)는 0건으로 덮어씁니다
+    empty = {field: 0 for field in ROLLUP_FIELDS}
+    empty['failure_probability_max'] = None
+    rollups = [
+        PredictionRollup(machine_id=machine_id, minute=minute, **aggregates.get((machine_id, minute), empty))
+        for machine_id, minute in keys
+    ]
+    PredictionRollup.objects.bulk_create(
+        rollups, batch_size=batch_size, update_conflicts=True,
+        unique_fields=unique_fields, update_fields=ROLLUP_FIELDS
+    )
+    return len(rollups)
+
+
+def refresh_rollups(start, end, machine_ids=None, chunk=timedelta(days=1)):
+    """[start, end) 구간의 분 단위 롤업을 원본 기록에서 다시 집계해 덮어씁니다.
+
+    machine_ids를 주면 그 기계들만 다시 집계합니다. 메모리 사용량을 제한하기 위해 chunk 기간씩 나눠
+    트랜잭션 하나로 처리하며(refresh_minute_rollups), 갱신한 롤업 행 수를 반환합니다.
+    """
+    start, end = floor_minute(start), ceil_minute(end)
+    written = 0
+    while start < end:
+        stop = min(start + chunk, end)
+        inputs = SimulatorInput.objects.filter(created_at__gte=start, created_at__lt=stop)
+        if machine_ids is not None:
+            inputs = inputs.filter(machine_id__in=list(machine_ids))
+        keys = (
+            inputs.annotate(bucket=Trunc('created_at', 'minute', tzinfo=UTC))
+            .values_list('machine_id', 'bucket')
+            .distinct()
+            .order_by()
+        )
+        with transaction.atomic():
+            written += refresh_minute_rollups(keys)
+        start = stop
+    return written
+
+
+def raw_history(machine_id, start, end, limit=None):
+    """기계의 원본 예측 기록을 최신순으로 반환합니다 ((machine_id, created_at) 인덱스 사용)."""
+    rows = (
+        SimulatorInput.objects.filter(machine_id=machine_id, created_at__gte=start, created_at__lt=end)
+        .order_by('-created_at')
+        .values('created_at', 'type', 'air_temperature', 'process_temperature', 'rotational_speed', 'torque',
+                'tool_wear', 'simulatoroutput__prediction', 'simulatoroutput__probability_hdf',
+                'simulatoroutput__probability_pwf', 'simulatoroutput__probability_osf')
+    )
+    if limit is not None:
+        rows = rows[:limit]
+    return [{
+        'time': row['created_at'].isoformat(),
+        'type': row['type'],
+        'air_temperature': row['air_temperature'],
+        'process_temperature': row['process_temperature'],
+        'rotational_speed': row['rotational_speed'],
+        'torque': row['torque'],
+        'tool_wear': row['tool_wear'],
+        'prediction': row['simulatoroutput__prediction'],
+        'probabilities': None if row['simulatoroutput__probability_hdf'] is None else {
+            'HDF': row['simulatoroutput__probability_hdf'],
+            'PWF': row['simulatoroutput__probability_pwf'],
+            'OSF': row['simulatoroutput__probability_osf'],
+        },
+    } for row in rows]
+
+
+def rollup_series(machine_id, start, end, resolution='hour'):
+    """기계의 롤업을 resolution(minute/hour/day) 단위로 묶은 시계열을 반환합니다."""
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"지원하지 않는 해상도입니다: {resolution}")
+    rows = PredictionRollup.objects.filter(machine_id=machine_id, minute__gte=floor_minute(start), minute__lt=end)
+    sums = {field: Sum(field) for field in ROLLUP_FIELDS if field != 'failure_probability_max'}
+    rows = (
+        rows.annotate(bucket=Trunc('minute', resolution, tzinfo=UTC))
+        .values('bucket')
+        .annotate(failure_probability_max_=Max('failure_probability_max'), **sums)
+        .order_by('bucket')
+    )
+    series = []
+    for row in rows:
+        probability_count = row['probability_count']
+        series.append({
+            'time': row['bucket'].isoformat(),
+            'count': row['count'],
+            'failures': row['failures'],
+            'failure_counts': {'HDF': row['hdf_count'], 'PWF': row['pwf_count'], 'OSF': row['osf_count']},
+            'mean_probabilities': {
+                'HDF': row['probability_hdf_sum'] / probability_count,
+                'PWF': row['probability_pwf_sum'] / probability_count,
+                'OSF': row['probability_osf_sum'] / probability_count,
+            } if probability_count else None,
+            'max_failure_probability': row['failure_probability_max_'],
+        })
+    return series
+
+
+def choose_resolution(start, end):
+    """조회 기간이 짧으면 원본('raw'), 길수록 더 굵은 롤업 해상도를 고릅니다."""
+    span = end - start
+    if span <= timedelta(hours=getattr(settings, 'HISTORY_RAW_MAX_HOURS', 6)):
+        return 'raw'
+    if span <= timedelta(days=2):
+        return 'minute'
+    if span <= timedelta(days=90):
+        return 'hour'
+    return 'day'
+
+
+def history(machine_id, start, end, resolution=None):
+    """기계의 예측 기록을 조회합니다. resolution이 없으면 기간 길이에 따라 원본 또는 롤업을 선택합니다."""
+    resolution = resolution or choose_resolution(start, end)
+    if resolution == 'raw':
+        limit = getattr(settings, 'HISTORY_RAW_LIMIT', 5000)
+        return {'resolution': 'raw', 'source': 'raw', 'rows': raw_history(machine_id, start, end, limit)}
+    return {'resolution': resolution, 'source': 'rollup', 'rows': rollup_series(machine_id, start, end, resolution)}
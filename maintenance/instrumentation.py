@@ -0,0 +1,118 @@
+"""
+요청 단위 구조화 계측 (단계별 소요 시간 + 페이로드 샘플링)
+TimingMiddleware가 요청마다 RequestTimings를 컨텍스트 변수에 두고, 코드의 각 단계는
+stage('parse'), stage('model') 같은 컨텍스트 관리자로 소요 시간을 기록합니다.
+요청 밖(관리 명령, 배치 디스패처 스레드, 프로세스 풀 워커)이나 계측이 꺼진 경우 stage()는
+공용 no-op 객체를 돌려주므로 비용이 컨텍스트 변수 조회 한 번뿐입니다.
+Django 설정을 import 하지 않으므로 ml 패키지(예측기)에서도 사용할 수 있습니다.
+"""
+import contextlib
+import threading
+import time
+from contextvars import ContextVar
+
+from .metrics import Histogram
+
+_current = ContextVar('request_timings', default=None)
+_NULL_STAGE = contextlib.nullcontext()
+
+# 단계별 소요 시간(ms) 히스토그램 버킷 상한
+STAGE_BOUNDS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+
+
+class RequestTimings:
+    """요청 하나의 단계별 누적 소요 시간(초)과 샘플링된 페이로드를 보관합니다."""
+
+    __slots__ = ('started', 'durations', 'sampled', 'payload')
+
+    def __init__(self, sampled=False):
+        self.started = time.perf_counter()
+        self.durations = {}
+        self.sampled = sampled
+        self.payload = {} if sampled else None
+
+    def add(self, name, seconds):
+        """같은 이름의 단계가 여러 번 실행되면 합산합니다."""
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def total(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total=None):
+        """Server-Timing 헤더 값을 만듭니다 (dur 단위는 ms)."""
+        parts = [f'{name};dur={seconds * 1000:.3f}' for name, seconds in self.durations.items()]
+        parts.append(f'total;dur={(self.total() if total is None else total) * 1000:.3f}')
+        return ', '.join(parts)
+
+
+class _Stage:
+    __slots__ = ('timings', 'name', 'start')
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timings.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def stage(name):
+    """현재 요청의 단계 소요 시간을 기록하는 컨텍스트 관리자를 반환합니다."""
+    timings = _current.get()
+    if timings is None:
+        return _NULL_STAGE
+    return _Stage(timings, name)
+
+
+def payload(**fields):
+    """샘플링된 요청에만 입력/결과 같은 상세 페이로드를 남깁니다 (값은 기록할 때만 문자열로 바꿉니다)."""
+    timings = _current.get()
+    if timings is not None and timings.sampled:
+        timings.payload.update(fields)
+
+
+def current():
+    """현재 요청의 RequestTimings를 반환합니다 (요청 밖이면 None)."""
+    return _current.get()
+
+
+def begin(sampled=False):
+    """요청 계측을 시작하고 end()에 넘길 (RequestTimings, 토큰)을 반환합니다."""
+    timings = RequestTimings(sampled)
+    return timings, _current.set(timings)
+
+
+def end(token):
+    _current.reset(token)
+
+
+class StageStats:
+    """단계별 소요 시간 분포를 프로세스 단위로 누적합니다 (/api/timings/)."""
+
+    def __init__(self, bounds=STAGE_BOUNDS_MS):
+        self.bounds = bounds
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, durations, total):
+        for name, seconds in durations.items():
+            self._histogram(name).observe(seconds * 1000)
+        self._histogram('total').observe(total * 1000)
+
+    def _histogram(self, name):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram(self.bounds))
+        return histogram
+
+    def snapshot(self):
+        return {name: histogram.snapshot() for name, histogram in list(self._histograms.items())}
+
+
+stage_stats = StageStats()
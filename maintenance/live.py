@@ -0,0 +1,194 @@
+"""
+실시간 예측 WebSocket 채널 (ASGI)
+클라이언트는 기계 ID를 구독하고 파라미터 변경을 작은 메시지로 보내며,
+서버는 틱마다 기계별 최신 상태만 한 번에 예측해 구독자들에게 푸시합니다.
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+
+from . import views
+
+logger = logging.getLogger(__name__)
+
+# config/asgi.py에서 이 앱으로 보내는 경로
+LIVE_PATH = '/ws/predict/'
+
+
+class LivePredictionHub:
+    """기계 ID별 최신 파라미터를 모아 틱마다 한 번씩 예측하는 클래스입니다.
+
+    같은 틱 안에 들어온 여러 업데이트는 마지막 상태 하나로 합쳐지고,
+    변경된 기계들은 한 번의 predict_batch 호출로 함께 예측됩니다.
+    """
+
+    def __init__(self, tick_interval=0.05, queue_size=32):
+        self.tick_interval = tick_interval
+        self.queue_size = queue_size
+        self._states = {}
+        self._dirty = set()
+        self._subscribers = defaultdict(set)
+        self._task = None
+
+    def new_queue(self):
+        """구독자 한 명에게 보낼 메시지 큐를 만듭니다."""
+        return asyncio.Queue(maxsize=self.queue_size)
+
+    def subscribe(self, machine_id, queue):
+        """기계 ID를 구독합니다. 이미 상태가 있으면 다음 틱에 현재 예측을 보냅니다."""
+        self._subscribers[machine_id].add(queue)
+        if machine_id in self._states:
+            self._mark_dirty(machine_id)
+
+    def unsubscribe(self, machine_id, queue):
+        """구독을 해제하고, 구독자가 없는 기계의 상태는 정리합니다."""
+        subscribers = self._subscribers.get(machine_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[machine_id]
+            self._drop(machine_id)
+
+    def _drop(self, machine_id):
+        """기계의 상태와 예측 대기 표시를 함께 지웁니다."""
+        self._states.pop(machine_id, None)
+        self._dirty.discard(machine_id)
+
+    def update(self, machine_id, params):
+        """기계의 파라미터 일부 또는 전체를 갱신합니다. 예측은 다음 틱에 수행됩니다."""
+        self._states.setdefault(machine_id, {}).update(params)
+        self._mark_dirty(machine_id)
+
+    def _mark_dirty(self, machine_id):
+        self._dirty.add(machine_id)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        """변경된 기계가 없어질 때까지 틱마다 예측하고 결과를 푸시합니다.
+
+        한 틱의 실패가 다른 기계들의 갱신까지 멈추지 않도록 틱마다 예외를 기록하고 계속합니다.
+        """
+        while self._dirty:
+            await asyncio.sleep(self.tick_interval)
+            try:
+                await self._tick()
+            except Exception as e:
+                logger.error("실시간 예측 틱 실패: %s", str(e))
+
+    async def _tick(self):
+        """변경된 기계들을 한 번에 예측하고 구독자들에게 푸시합니다."""
+        # 예측 중에 마지막 구독자가 떠나 상태가 정리된 기계는 건너뜁니다
+        states = {machine_id: self._states.get(machine_id) for machine_id in self._dirty}
+        self._dirty.clear()
+        machine_ids = [machine_id for machine_id, state in states.items() if state is not None]
+        if not machine_ids:
+            return
+        rows = [dict(states[machine_id]) for machine_id in machine_ids]
+        try:
+            # 슬라이더 미리보기는 확률 격자가 있으면 격자에서 바로 응답합니다
+            results = await asyncio.to_thread(views.score_rows, rows, 0, False, False)
+        except Exception as e:
+            logger.error("실시간 예측 실패: %s", str(e))
+            results = [{'status': 'error', 'message': str(e)} for _ in machine_ids]
+
+        for machine_id, result in zip(machine_ids, results):
+            result.pop('index', None)
+            message = {'type': 'prediction', 'machine_id': machine_id, **result}
+            subscribers = self._subscribers.get(machine_id)
+            if not subscribers:
+                # 구독자 없이 업데이트만 보낸 기계의 상태는 남겨두지 않습니다
+                self._drop(machine_id)
+                continue
+            for queue in subscribers:
+                self.push(queue, message)
+
+    @staticmethod
+    def push(queue, message):
+        """큐가 가득 찬 느린 구독자에게는 가장 오래된 메시지를 버리고 최신 메시지를 넣습니다."""
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+
+_hub = None
+
+
+def get_hub():
+    """settings 값으로 구성된 프로세스 전역 LivePredictionHub를 반환합니다."""
+    global _hub
+    if _hub is None:
+        _hub = LivePredictionHub(
+            tick_interval=getattr(settings, 'LIVE_PREDICTION_TICK', 0.05),
+            queue_size=getattr(settings, 'LIVE_PREDICTION_QUEUE_SIZE', 32)
+        )
+    return _hub
+
+
+async def live_predictions(scope, receive, send):
+    """실시간 예측 WebSocket ASGI 앱입니다.
+
+    클라이언트 메시지(JSON):
+        {"action": "subscribe", "machine_id": "..."}
+        {"action": "unsubscribe", "machine_id": "..."}
+        {"action": "update", "machine_id": "...", "params": {"torque": 42.5, ...}}
+    서버 메시지(JSON):
+        {"type": "prediction", "machine_id": "...", "status": ..., "prediction": ..., ...}
+        {"type": "subscribed" | "unsubscribed" | "error", ...}
+    """
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+    # 첫 연결이면 모델을 로드하므로 이벤트 루프를 막지 않도록 스레드에서 확인합니다
+    if await asyncio.to_thread(views.get_predictor) is None:
+        await send({'type': 'websocket.close', 'code': 1011})
+        return
+    await send({'type': 'websocket.accept'})
+
+    hub = get_hub()
+    queue = hub.new_queue()
+    subscriptions = set()
+
+    async def sender():
+        while True:
+            payload = await queue.get()
+            await send({'type': 'websocket.send', 'text': json.dumps(payload, ensure_ascii=False)})
+
+    sender_task = asyncio.create_task(sender())
+    try:
+        while True:
+            message = await receive()
+            if message['type'] == 'websocket.disconnect':
+                break
+            if message['type'] != 'websocket.receive':
+                continue
+
+            try:
+                data = json.loads(message.get('text') or message.get('bytes') or b'')
+                action = data['action']
+                machine_id = str(data['machine_id'])
+            except (ValueError, TypeError, KeyError) as e:
+                hub.push(queue, {'type': 'error', 'message': f"메시지 형식이 올바르지 않습니다: {str(e)}"})
+                continue
+
+            if action == 'subscribe':
+                subscriptions.add(machine_id)
+                hub.subscribe(machine_id, queue)
+                hub.push(queue, {'type': 'subscribed', 'machine_id': machine_id})
+            elif action == 'unsubscribe':
+                subscriptions.discard(machine_id)
+                hub.unsubscribe(machine_id, queue)
+                hub.push(queue, {'type': 'unsubscribed', 'machine_id': machine_id})
+            elif action == 'update' and isinstance(data.get('params'), dict):
+                hub.update(machine_id, {field: data['params'][field]
+                                        for field in views.REQUIRED_FIELDS if field in data['params']})
+            else:
+                hub.push(queue, {'type': 'error', 'message': f"알 수 없는 요청입니다: {action}"})
+    finally:
+        for machine_id in subscriptions:
+            hub.unsubscribe(machine_id, queue)
+        sender_task.cancel()
@@ -0,0 +1,298 @@
+"""
+기계별 온라인 상태 (최근 측정값 링 버퍼 + 증분 통계 + 고장 확률 임계값 도달 시간 예측)
+예측은 측정값 한 건씩 독립적으로 수행되지만 OSF 위험은 공구 마모(Tool_Wear)와 마모도(tool_wear × torque)가
+좌우하므로, 기계마다 최근 측정값을 고정 크기 링 버퍼에 두고 공구 마모 속도, 토크 EWMA, 온도차 변화를
+측정값 하나당 O(1)로 갱신합니다. 대시보드가 새로고침할 때마다 전체 기록을 다시 계산하지 않고
+이 통계로 미래 측정값을 외삽해 HDF/PWF/OSF 확률이 임계값을 넘는 시각을 한 번의 배치 예측으로 구합니다.
+
+상태는 예측 기록 테이블(SimulatorInput)에서 마지막으로 반영한 기록 이후의 새 기록만 읽어 갱신하므로,
+워커 프로세스가 여러 개이거나 score_file로 적재한 기록도 같은 상태로 반영됩니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Q
+
+from .ml import features as feature_pipeline
+from .models import SimulatorInput
+
+# 링 버퍼 열 순서 (시각은 anchor 기준 초)
+COLUMNS = ('time', 'type', 'air_temperature', 'process_temperature', 'rotational_speed', 'torque', 'tool_wear')
+TIME, TYPE, AIR, PROCESS, SPEED, TORQUE, WEAR = range(len(COLUMNS))
+
+# predict_proba 결과의 고장 유형별 열 인덱스
+FAILURE_CLASSES = {'HDF': 2, 'PWF': 3, 'OSF': 4}
+
+
+class SlidingFit:
+    """(t, y) 점들의 최소제곱 기울기를 합계만으로 유지합니다 (점 추가/제거 O(1))."""
+
+    __slots__ = ('n', 'st', 'sy', 'stt', 'sty')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.n = 0
+        self.st = self.sy = self.stt = self.sty = 0.0
+
+    def add(self, t, y, sign=1):
+        """점을 추가합니다. sign=-1이면 같은 점을 제거합니다."""
+        self.n += sign
+        self.st += sign * t
+        self.sy += sign * y
+        self.stt += sign * t * t
+        self.sty += sign * t * y
+
+    def slope(self):
+        """기울기(y/초)를 반환합니다. 점이 2개 미만이거나 시각이 모두 같으면 None입니다."""
+        if self.n < 2:
+            return None
+        denominator = self.n * self.stt - self.st * self.st
+        if denominator <= 1e-12 * self.n * self.stt:
+            return None
+        return (self.n * self.sty - self.st * self.sy) / denominator
+
+
+class MachineState:
+    """기계 한 대의 최근 측정값 링 버퍼와 증분 통계입니다.
+
+    측정값을 넣을 때마다 다음 값을 O(1)로 갱신합니다.
+      - 공구 마모 속도: 버퍼 안 (시각, 공구 마모)의 최소제곱 기울기. 공구 마모가 줄어들면 공구 교체로 보고 다시 시작합니다
+      - 온도차 변화(drift): 버퍼 안 (시각, 온도차)의 최소제곱 기울기
+      - 토크, 온도차 EWMA
+    버퍼가 한 바퀴 돌 때마다 시각 기준(anchor)을 가장 오래된 측정값으로 옮기고 합계를 다시 계산합니다
+    (분할 상환 O(1)이며, 시각 값이 커지면서 생기는 부동소수점 오차가 쌓이지 않습니다).
+    """
+
+    def __init__(self, capacity=256, alpha=0.1):
+        self.capacity = capacity
+        self.alpha = alpha
+        self.buffer = np.zeros((capacity, len(COLUMNS)), dtype=np.float64)
+        self.size = 0
+        self.head = 0               # 다음 측정값을 쓸 위치
+        self.count = 0              # 지금까지 넣은 측정값 수 (측정값 번호로도 사용)
+        self.anchor = None          # 버퍼 시각의 기준 (epoch 초)
+        self.wear_start = 0         # 공구 마모 기울기에 포함되는 첫 측정값 번호 (마지막 공구 교체 이후)
+        self.tool_changes = 0
+        self.wear_fit = SlidingFit()
+        self.temp_fit = SlidingFit()
+        self.torque_ewma = None
+        self.temp_diff_ewma = None
+        self.cursor = None          # 마지막으로 반영한 예측 기록의 (created_at, id)
+        self.lock = threading.Lock()
+        self._projection = None     # (캐시 키, 예측 결과)
+
+    def latest(self):
+        return self.buffer[(self.head - 1) % self.capacity]
+
+    def observe(self, timestamp, type_code, air_temp, process_temp, rotational_speed, torque, tool_wear):
+        """측정값 하나를 넣고 통계를 갱신합니다 (timestamp는 epoch 초, 오래된 것부터 순서대로)."""
+        if self.anchor is None:
+            self.anchor = timestamp
+        if self.size == self.capacity:
+            self._evict()
+        if self.size and tool_wear < self.latest()[WEAR]:
+            # 공구 교체: 이전 공구의 마모 기록은 마모 속도 계산에서 뺍니다
+            self.wear_fit.reset()
+            self.wear_start = self.count
+            self.tool_changes += 1
+
+        t = timestamp - self.anchor
+        temp_diff = process_temp - air_temp
+        self.buffer[self.head] = (t, type_code, air_temp, process_temp, rotational_speed, torque, tool_wear)
+        self.wear_fit.add(t, tool_wear)
+        self.temp_fit.add(t, temp_diff)
+        if self.torque_ewma is None:
+            self.torque_ewma, self.temp_diff_ewma = torque, temp_diff
+        else:
+            self.torque_ewma += self.alpha * (torque - self.torque_ewma)
+            self.temp_diff_ewma += self.alpha * (temp_diff - self.temp_diff_ewma)
+
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.count += 1
+        if self.head == 0:
+            self._reanchor()
+
+    def _evict(self):
+        """버퍼가 가득 찼을 때 덮어쓸 가장 오래된 측정값을 합계에서 뺍니다."""
+        row = self.buffer[self.head]
+        self.temp_fit.add(row[TIME], row[PROCESS] - row[AIR], sign=-1)
+        if self.count - self.capacity >= self.wear_start:
+            self.wear_fit.add(row[TIME], row[WEAR], sign=-1)
+
+    def _reanchor(self):
+        """가장 오래된 측정값을 시각 기준으로 삼고 합계를 버퍼에서 다시 계산합니다."""
+        order = (np.arange(self.size) + self.head - self.size) % self.capacity
+        offset = self.buffer[order[0], TIME]
+        self.anchor += offset
+        self.buffer[:self.size, TIME] -= offset
+
+        rows = self.buffer[order]
+        self.temp_fit.reset()
+        self.wear_fit.reset()
+        sequence = np.arange(self.count - self.size, self.count)
+        for row, number in zip(rows.tolist(), sequence.tolist()):
+            self.temp_fit.add(row[TIME], row[PROCESS] - row[AIR])
+            if number >= self.wear_start:
+                self.wear_fit.add(row[TIME], row[WEAR])
+
+    def summary(self):
+        """최신 측정값과 추세 통계를 반환합니다 (속도/변화량은 시간당 값)."""
+        latest = self.latest()
+        wear_rate = self.wear_fit.slope()
+        drift = self.temp_fit.slope()
+        return {
+            'readings': self.size,
+            'total_readings': self.count,
+            'last_reading': {
+                'time': datetime.fromtimestamp(self.anchor + latest[TIME], tz=timezone.utc).isoformat(),
+                'type': next(key for key, code in feature_pipeline.TYPE_ENCODING.items() if code == latest[TYPE]),
+                'air_temperature': float(latest[AIR]),
+                'process_temperature': float(latest[PROCESS]),
+                'rotational_speed': int(latest[SPEED]),
+                'torque': float(latest[TORQUE]),
+                'tool_wear': int(latest[WEAR]),
+            },
+            'wear_rate_per_hour': None if wear_rate is None else wear_rate * 3600,
+            'torque_ewma': self.torque_ewma,
+            'temp_diff_ewma': self.temp_diff_ewma,
+            'temp_diff_drift_per_hour': None if drift is None else drift * 3600,
+            'tool_changes': self.tool_changes,
+        }
+
+    def projection(self, predictor, threshold=0.5, horizon_hours=24.0, steps=97):
+        """현재 추세가 이어진다고 보고 고장 유형별 확률이 threshold에 도달하는 시간을 예측합니다.
+
+        공구 마모는 마모 속도로, 온도차는 EWMA에서 drift로 외삽하고(학습 범위로 제한), 토크는 EWMA,
+        회전 속도와 제품 유형은 최신 값으로 고정합니다. horizon_hours 구간을 steps개 시점으로 나눠 한 번에 예측하고
+        처음으로 임계값을 넘는 구간 안에서 선형 보간합니다. 결과는 새 측정값이 들어올 때까지 재사용합니다.
+        """
+        key = (self.count, threshold, horizon_hours, steps, predictor)
+        if self._projection is not None and self._projection[0] == key:
+            return self._projection[1]
+
+        latest = self.latest()
+        wear_rate = max(self.wear_fit.slope() or 0.0, 0.0)
+        drift = self.temp_fit.slope() or 0.0
+        offsets = np.linspace(0.0, horizon_hours * 3600, steps)
+        features = predictor.derive_features(
+            np.full(steps, latest[TYPE]),
+            np.full(steps, latest[SPEED]),
+            np.full(steps, self.torque_ewma),
+            latest[WEAR] + wear_rate * offsets,
+            np.clip(self.temp_diff_ewma + drift * offsets, feature_pipeline.TEMP_DIFF_MIN, feature_pipeline.TEMP_DIFF_MAX)
+        )
+        probabilities = predictor.predict_proba_matrix(features)
+
+        last_time = self.anchor + latest[TIME]
+        failures = {}
+        for name, column in FAILURE_CLASSES.items():
+            values = probabilities[:, column]
+            above = np.flatnonzero(values >= threshold)
+            seconds = None
+            if len(above):
+                i = int(above[0])
+                seconds = 0.0
+                if i > 0:
+                    fraction = (threshold - values[i - 1]) / (values[i] - values[i - 1])
+                    seconds = float(offsets[i - 1] + fraction * (offsets[i] - offsets[i - 1]))
+            failures[name] = {
+                'probability': float(values[0]),
+                'max_probability': float(values.max()),
+                'hours_to_threshold': None if seconds is None else seconds / 3600,
+                'expected_at': None if seconds is None else
+                datetime.fromtimestamp(last_time + seconds, tz=timezone.utc).isoformat(),
+            }
+
+        result = {'threshold': threshold, 'horizon_hours': horizon_hours, 'failures': failures}
+        self._projection = (key, result)
+        return result
+
+
+class MachineStateStore:
+    """기계 ID별 MachineState를 LRU로 보관하고 예측 기록에서 새 측정값만 읽어 갱신합니다.
+
+    기계마다 마지막으로 반영한 기록의 (created_at, id)를 커서로 두고, 조회할 때마다
+    (machine_id, created_at) 인덱스로 커서 이후 기록만 최대 버퍼 크기만큼 읽습니다.
+    write-behind 버퍼가 조금 늦게 저장하는 기록을 건너뛰지 않도록 settle초보다 최근 기록은 다음 조회에서 반영합니다.
+    """
+
+    def __init__(self, capacity=256, alpha=0.1, max_machines=10000, settle=2.0):
+        self.capacity = capacity
+        self.alpha = alpha
+        self.max_machines = max_machines
+        self.settle = settle
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, machine_id):
+        """기계 상태를 반환합니다. 처음 조회하는 기계는 빈 상태를 만들고, 많으면 가장 오래된 것부터 버립니다."""
+        with self._lock:
+            state = self._states.get(machine_id)
+            if state is None:
+                state = self._states[machine_id] = MachineState(self.capacity, self.alpha)
+                while len(self._states) > self.max_machines:
+                    self._states.popitem(last=False)
+            self._states.move_to_end(machine_id)
+        return state
+
+    def catch_up(self, machine_id, state):
+        """커서 이후의 예측 기록을 시간 순서대로 상태에 반영하고 반영한 기록 수를 반환합니다 (state.lock 안에서 호출)."""
+        settled = datetime.now(timezone.utc) - timedelta(seconds=self.settle)
+        rows = SimulatorInput.objects.filter(machine_id=machine_id, created_at__lte=settled)
+        if state.cursor is not None:
+            created_at, pk = state.cursor
+            rows = rows.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+        # 버퍼보다 많은 새 기록이 쌓였으면 최근 capacity개만 반영합니다
+        rows = list(
+            rows.order_by('-created_at', '-pk')
+            .values_list('pk', 'created_at', 'type', 'air_temperature', 'process_temperature',
+                         'rotational_speed', 'torque', 'tool_wear')[:self.capacity]
+        )
+        for pk, created_at, type_value, *values in reversed(rows):
+            type_code = feature_pipeline.TYPE_ENCODING.get(type_value)
+            if type_code is not None:
+                state.observe(created_at.timestamp(), type_code, *values)
+        if rows:
+            state.cursor = (rows[0][1], rows[0][0])
+        return len(rows)
+
+    def trend(self, machine_id, predictor, threshold=0.5, horizon_hours=24.0, steps=97):
+        """기계의 추세 통계와 임계값 도달 예측을 반환합니다. 기록이 없는 기계이면 None을 반환합니다."""
+        state = self.get(machine_id)
+        with state.lock:
+            start = time.perf_counter()
+            new_readings = self.catch_up(machine_id, state)
+            if state.size == 0:
+                return None
+            return {
+                **state.summary(),
+                'new_readings': new_readings,
+                'projection': state.projection(predictor, threshold, horizon_hours, steps),
+                'elapsed_ms': (time.perf_counter() - start) * 1000,
+            }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """settings 값으로 구성된 프로세스 전역 MachineStateStore를 반환합니다."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = MachineStateStore(
+                    capacity=getattr(settings, 'MACHINE_STATE_WINDOW', 256),
+                    alpha=getattr(settings, 'MACHINE_STATE_EWMA_ALPHA', 0.1),
+                    max_machines=getattr(settings, 'MACHINE_STATE_MAX_MACHINES', 10000),
+                    settle=getattr(settings, 'MACHINE_STATE_SETTLE_SECONDS', 2.0)
+                )
+    return _store
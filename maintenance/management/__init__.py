@@ -0,0 +1 @@
+# 유지보수 앱의 관리 명령어 패키지
@@ -0,0 +1 @@
+# manage.py 로 실행하는 명령어 모음
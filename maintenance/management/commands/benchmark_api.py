@@ -0,0 +1,101 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from maintenance import prediction_log, views
+from maintenance.benchmarks import endpoint, load, micro, results
+
+LAYERS = ('micro', 'endpoint', 'load')
+
+
+class Command(BaseCommand):
+    """예측 API 벤치마크(micro/endpoint/load)를 실행하고 결과를 JSON으로 저장하거나 이전 결과와 비교합니다.
+
+    프로세스 안에서 실행하는 단계는 테스트 데이터베이스를 만들어 예측 기록을 쓰므로 개발 DB를 건드리지 않습니다.
+    --url을 주면 load 단계는 그 서버(예: gunicorn config.wsgi 또는 uvicorn config.asgi:application)로 요청을 보냅니다.
+    runserver는 개발용 서버라 지연 시간이 배포 환경과 크게 다르므로 비교 기준으로 쓰지 않습니다.
+    --compare로 이전 결과 파일을 주면 지표별 변화율을 출력하고, --fail-on-regression이면 악화가 있을 때 실패로 끝납니다.
+    """
+
+    help = '예측 API 벤치마크(micro/endpoint/load)를 실행하고 결과를 JSON으로 저장/비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--layers', default=','.join(LAYERS), help='실행할 단계 (쉼표로 구분: micro,endpoint,load)')
+        parser.add_argument('--iterations', type=int, default=1000, help='micro/endpoint 단계의 측정별 반복 횟수')
+        parser.add_argument('--requests', type=int, default=2000, help='load 단계의 동시 접속 수별 요청 수')
+        parser.add_argument('--concurrency', default='1,4,16,64', help='load 단계의 동시 접속 수 (쉼표로 구분)')
+        parser.add_argument('--url', help='load 단계 대상 서버 주소 (예: http://127.0.0.1:8000, 없으면 프로세스 안 ASGI 앱)')
+        parser.add_argument('--inputs', type=int, default=256, help='돌아가며 사용할 무작위 입력 수')
+        parser.add_argument('--seed', type=int, default=0, help='입력 생성 시드')
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+        parser.add_argument('--compare', help='비교할 이전 결과 JSON 파일 경로')
+        parser.add_argument('--tolerance', type=float, default=0.1, help='악화로 보는 변화율 (0.1 = 10%%)')
+        parser.add_argument('--fail-on-regression', action='store_true', help='악화된 지표가 있으면 오류로 끝냅니다')
+
+    def handle(self, *args, **options):
+        layers = [layer.strip() for layer in options['layers'].split(',') if layer.strip()]
+        unknown = set(layers) - set(LAYERS)
+        if unknown:
+            raise CommandError(f"알 수 없는 단계입니다: {', '.join(sorted(unknown))}")
+        try:
+            concurrency = [int(value) for value in options['concurrency'].split(',') if value.strip()]
+        except ValueError:
+            raise CommandError('--concurrency는 쉼표로 구분한 정수여야 합니다 (예: 1,4,16,64)')
+        baseline = results.load(options['compare']) if options['compare'] else None
+
+        if views.get_predictor() is None:
+            raise CommandError('ML 모델이 로드되지 않았습니다.')
+        inputs = results.sample_inputs(options['inputs'], options['seed'])
+        output = {'environment': results.environment(), 'options': {
+            key: options[key] for key in ('layers', 'iterations', 'requests', 'concurrency', 'url', 'inputs', 'seed')
+        }}
+
+        in_process = bool({'micro', 'endpoint'} & set(layers)) or ('load' in layers and not options['url'])
+        old_name = connection.settings_dict['NAME']
+        if in_process:
+            setup_test_environment()
+            connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            if 'micro' in layers:
+                output['micro'] = micro.run(inputs, options['iterations'])
+                self.report('micro', output['micro'])
+            if 'endpoint' in layers:
+                output['endpoint'] = endpoint.run(inputs, options['iterations'])
+                self.report('endpoint', output['endpoint'])
+            if 'load' in layers:
+                output['load'] = load.run(inputs, concurrency, options['requests'], options['url'])
+                self.report('load', output['load'])
+        finally:
+            if in_process:
+                # 응답 후 저장 대기 중인 예측 기록을 테스트 DB가 사라지기 전에 모두 씁니다
+                # (백그라운드 저장 스레드와 동시에 쓰지 않도록 스레드를 멈춘 뒤 남은 기록을 씁니다)
+                prediction_log.get_writer().close()
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                teardown_test_environment()
+
+        if options['output']:
+            results.save(options['output'], output)
+            self.stdout.write(self.style.SUCCESS(f"결과를 저장했습니다: {options['output']}"))
+        if baseline is not None:
+            self.report_comparison(output, baseline, options)
+
+    def report(self, layer, layer_results):
+        self.stdout.write(f'\n[{layer}]')
+        self.stdout.write(f"{'name':<22}{'unit':>5}{'p50':>10}{'p95':>10}{'p99':>10}{'rps':>10}{'errors':>8}")
+        for name, metrics in layer_results.items():
+            throughput = metrics.get('throughput_rps')
+            self.stdout.write(
+                f"{name:<22}{metrics['unit']:>5}{metrics['p50']:>10.2f}{metrics['p95']:>10.2f}{metrics['p99']:>10.2f}"
+                f"{'' if throughput is None else f'{throughput:,.0f}':>10}{metrics.get('errors', ''):>8}"
+            )
+
+    def report_comparison(self, output, baseline, options):
+        rows = results.compare(output, baseline, options['tolerance'])
+        commit = baseline.get('environment', {}).get('commit')
+        self.stdout.write(f"\n기준 결과와 비교 (commit {commit or '-'}, 허용 변화율 {options['tolerance']:.0%})")
+        for name, old, new, ratio, worse in rows:
+            line = f'{name:<36}{old:>12.2f}{new:>12.2f}{ratio:>8.2f}x'
+            self.stdout.write(self.style.ERROR(line + '  악화') if worse else line)
+        regressions = [row for row in rows if row[4]]
+        if regressions and options['fail_on_regression']:
+            raise CommandError(f'{len(regressions)}개 지표가 기준보다 나빠졌습니다')
@@ -0,0 +1,135 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
+from django.db.models.functions import Trunc
+
+from maintenance import history
+from maintenance.models import PredictionRollup, SimulatorInput, SimulatorOutput
+
+
+class Command(BaseCommand):
+    """예측 기록 조회 시간을 원본 기록 규모별로 측정합니다.
+
+    테스트 데이터베이스를 만들어 기계 여러 대가 일정 간격으로 예측을 기록한 것처럼 원본 기록을 채우고,
+    롤업을 만든 뒤 최근 원본 조회, 롤업 시계열 조회, 같은 시계열을 원본에서 바로 집계하는 경우를 비교합니다.
+    쿼리 계획(EXPLAIN QUERY PLAN)을 함께 출력해 인덱스 사용 여부를 확인할 수 있습니다. 개발 DB는 건드리지 않습니다.
+    """
+
+    help = '예측 기록(원본/롤업) 조회 시간을 측정합니다 (테스트 DB 사용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000, help='채울 원본 기록 수')
+        parser.add_argument('--machines', type=int, default=20, help='기계 수')
+        parser.add_argument('--interval', type=float, default=5.0, help='기계별 기록 간격 (초)')
+        parser.add_argument('--repeat', type=int, default=5, help='쿼리별 반복 횟수 (가장 빠른 값 사용)')
+        parser.add_argument('--chunk', type=int, default=20000, help='bulk_create 한 번에 넣을 행 수')
+
+    def handle(self, *args, **options):
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def best_of(self, func, repeat):
+        best, result = float('inf'), None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            best = min(best, time.perf_counter() - start)
+        return best, result
+
+    def seed(self, rows, machines, interval, chunk):
+        """기계 machines대가 interval초 간격으로 기록한 rows개의 원본 기록을 채우고 마지막 시각을 반환합니다."""
+        rng = np.random.default_rng(0)
+        end = datetime.now(timezone.utc).replace(microsecond=0)
+        per_machine = -(-rows // machines)
+        start = end - timedelta(seconds=per_machine * interval)
+        for offset in range(0, rows, chunk):
+            index = np.arange(offset, min(offset + chunk, rows))
+            air = rng.normal(300, 2, len(index))
+            prediction = rng.choice([0, 1, 2, 3, 4], len(index), p=[0.96, 0.01, 0.01, 0.01, 0.01])
+            probabilities = rng.dirichlet([20, 1, 1, 1, 1], len(index))
+            with transaction.atomic():
+                inputs = SimulatorInput.objects.bulk_create([
+                    SimulatorInput(
+                        type='L', air_temperature=float(air[k]), process_temperature=float(air[k] + 10),
+                        rotational_speed=1500, torque=40.0, tool_wear=int(i % 250),
+                        machine_id=f'M{i % machines:03d}',
+                        created_at=start + timedelta(seconds=(i // machines) * interval)
+                    )
+                    for k, i in enumerate(index.tolist())
+                ], batch_size=chunk)
+                SimulatorOutput.objects.bulk_create([
+                    SimulatorOutput(
+                        id=simulator_input, prediction=int(prediction[k]),
+                        probability_hdf=float(probabilities[k, 2]),
+                        probability_pwf=float(probabilities[k, 3]),
+                        probability_osf=float(probabilities[k, 4])
+                    )
+                    for k, simulator_input in enumerate(inputs)
+                ], batch_size=chunk)
+        return start, end
+
+    def raw_series(self, machine_id, start, end, resolution):
+        """롤업 없이 원본 기록에서 같은 시계열을 바로 집계합니다 (비교 기준)."""
+        return list(
+            SimulatorOutput.objects.filter(id__machine_id=machine_id, id__created_at__gte=start, id__created_at__lt=end)
+            .annotate(bucket=Trunc('id__created_at', resolution, tzinfo=history.UTC))
+            .values('bucket')
+            .annotate(**history.rollup_aggregates())
+            .order_by('bucket')
+        )
+
+    def explain(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                return ' / '.join(str(row[-1]) for row in cursor.fetchall())
+            cursor.execute(f'EXPLAIN {sql}', params)
+            return ' / '.join(str(row[0]) for row in cursor.fetchall())
+
+    def run(self, options):
+        rows, machines, repeat = options['rows'], options['machines'], options['repeat']
+        self.stdout.write(f'원본 기록 {rows:,}행, 기계 {machines}대, 기록 간격 {options["interval"]}초')
+
+        seed_start = time.perf_counter()
+        start, end = self.seed(rows, machines, options['interval'], options['chunk'])
+        self.stdout.write(f'원본 기록 적재: {time.perf_counter() - seed_start:.1f}초 ({start.isoformat()} ~ {end.isoformat()})')
+
+        rollup_start = time.perf_counter()
+        written = history.refresh_rollups(start, end + timedelta(minutes=1))
+        self.stdout.write(f'롤업 집계: {written:,}행, {time.perf_counter() - rollup_start:.1f}초')
+
+        machine_id = 'M000'
+        end = end + timedelta(seconds=1)
+        queries = [
+            ('raw 최근 1시간', lambda: history.raw_history(machine_id, end - timedelta(hours=1), end)),
+            ('raw 최근 24시간', lambda: history.raw_history(machine_id, end - timedelta(hours=24), end)),
+            ('rollup 7일/시간', lambda: history.rollup_series(machine_id, end - timedelta(days=7), end, 'hour')),
+            ('rollup 전체/일', lambda: history.rollup_series(machine_id, start, end, 'day')),
+            ('원본 집계 7일/시간', lambda: self.raw_series(machine_id, end - timedelta(days=7), end, 'hour')),
+            ('원본 집계 전체/일', lambda: self.raw_series(machine_id, start, end, 'day')),
+        ]
+        self.stdout.write(f"{'query':<20}{'ms':>10}{'rows':>10}")
+        for name, query in queries:
+            seconds, result = self.best_of(query, repeat)
+            self.stdout.write(f'{name:<20}{seconds * 1000:>10.2f}{len(result):>10,}')
+
+        self.stdout.write('\n쿼리 계획')
+        plans = [
+            ('raw', SimulatorInput.objects.filter(
+                machine_id=machine_id, created_at__gte=end - timedelta(hours=1), created_at__lt=end
+            ).order_by('-created_at')),
+            ('rollup', PredictionRollup.objects.filter(
+                machine_id=machine_id, minute__gte=end - timedelta(days=7), minute__lt=end
+            ).values('machine_id').annotate(failure_probability_max_=Max('failure_probability_max'))),
+        ]
+        for name, queryset in plans:
+            self.stdout.write(f'{name}: {self.explain(queryset)}')
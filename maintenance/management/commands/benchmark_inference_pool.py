@@ -0,0 +1,73 @@
+import os
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from maintenance import views
+from maintenance.ml.process_pool import InferencePool
+
+
+class Command(BaseCommand):
+    """큰 배치 예측 처리량을 현재 스레드(inline)와 프로세스 풀(워커 수별)로 비교합니다.
+
+    무작위 특성 행렬 하나를 만들어 같은 입력으로 측정하고, 풀 결과가 inline 결과와
+    일치하는지도 확인합니다. 첫 호출은 워커 시작과 모델 로드가 포함되므로 예열로 제외합니다.
+    """
+
+    help = '큰 배치 예측 처리량(rows/sec)을 inline과 프로세스 풀 워커 수별로 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='배치 행 수')
+        parser.add_argument('--workers', default='1,2,4', help='측정할 풀 워커 수 (쉼표로 구분)')
+        parser.add_argument('--repeat', type=int, default=3, help='설정별 반복 횟수 (가장 빠른 값 사용)')
+        parser.add_argument('--shard-rows', type=int,
+                            default=getattr(settings, 'INFERENCE_POOL_MAX_BATCH_ROWS', 4096),
+                            help='워커 한 번의 작업으로 보내는 최대 행 수')
+
+    def best_of(self, func, repeat):
+        """func를 repeat번 실행해 가장 짧은 소요 시간(초)과 마지막 결과를 반환합니다."""
+        best, result = float('inf'), None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            best = min(best, time.perf_counter() - start)
+        return best, result
+
+    def handle(self, *args, **options):
+        predictor = views.get_predictor()
+        if predictor is None:
+            raise CommandError('ML 모델이 로드되지 않았습니다.')
+        try:
+            worker_counts = [int(value) for value in options['workers'].split(',') if value.strip()]
+        except ValueError:
+            raise CommandError('--workers는 쉼표로 구분한 정수여야 합니다 (예: 1,2,4)')
+
+        rows = options['rows']
+        n_classes = len(predictor.classes)
+        rng = np.random.default_rng(0)
+        # XGBClassifier는 n_features_in_, TreeEnsemble은 n_features에 특성 수가 있습니다
+        n_features = getattr(predictor.model, 'n_features_in_', None) or predictor.model.n_features
+        features = rng.normal(size=(rows, n_features)).astype(np.float32)
+
+        self.stdout.write(f"engine={predictor.engine}, rows={rows}, CPU={os.cpu_count()}")
+        self.stdout.write(f"{'backend':<16}{'seconds':>10}{'rows/sec':>14}{'speedup':>10}")
+
+        predictor.model.predict_proba(features[:1000])
+        inline_seconds, expected = self.best_of(lambda: predictor.model.predict_proba(features), options['repeat'])
+        self.stdout.write(f"{'inline':<16}{inline_seconds:>10.3f}{rows / inline_seconds:>14,.0f}{1.0:>10.2f}")
+
+        for workers in worker_counts:
+            pool = InferencePool(views.model_path, views.scaler_path, engine=predictor.engine, workers=workers,
+                                 max_batch_rows=options['shard_rows'], min_rows=0)
+            try:
+                pool.predict_proba(features[:workers * options['shard_rows']], n_classes)
+                seconds, result = self.best_of(lambda: pool.predict_proba(features, n_classes), options['repeat'])
+            finally:
+                pool.shutdown()
+            max_diff = float(np.abs(result - expected).max())
+            self.stdout.write(
+                f"{f'pool x{workers}':<16}{seconds:>10.3f}{rows / seconds:>14,.0f}"
+                f"{inline_seconds / seconds:>10.2f}  (최대 확률 차이 {max_diff:.1e})"
+            )
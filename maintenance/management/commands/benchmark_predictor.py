@@ -0,0 +1,68 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from maintenance import views
+
+
+class Command(BaseCommand):
+    """단일 예측 경로의 지연 시간을 측정하는 마이크로 벤치마크입니다.
+
+    기존 pandas 기반 predict()와 pandas 없는 predict_fast()를 같은 입력으로
+    반복 실행하고 p50/p95/p99 지연 시간을 마이크로초 단위로 출력합니다.
+    예측 캐시가 켜져 있으면 두 경로는 캐시 없이 측정하고, 캐시 적중 경로를 따로 측정합니다.
+    """
+
+    help = '단일 예측 경로(predict / predict_fast)의 지연 시간을 측정합니다'
+
+    # 측정에 사용하는 대표 입력값
+    SAMPLE_INPUT = {
+        'type': 'M',
+        'Air_Temperature': 298.1,
+        'Process_Temperature': 308.6,
+        'Rotational_Speed': 1551,
+        'Torque': 42.8,
+        'Tool_Wear': 108
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000, help='경로별 측정 반복 횟수')
+        parser.add_argument('--warmup', type=int, default=100, help='측정 전 예열 반복 횟수')
+
+    def measure(self, func, iterations, warmup):
+        """func를 반복 호출하고 호출별 소요 시간(마이크로초) 배열을 반환합니다."""
+        for _ in range(warmup):
+            func(self.SAMPLE_INPUT)
+        timings = np.empty(iterations, dtype=np.float64)
+        for i in range(iterations):
+            start = time.perf_counter_ns()
+            func(self.SAMPLE_INPUT)
+            timings[i] = (time.perf_counter_ns() - start) / 1000
+        return timings
+
+    def handle(self, *args, **options):
+        predictor = views.get_predictor()
+        if predictor is None:
+            raise CommandError('ML 모델이 로드되지 않았습니다.')
+
+        iterations = options['iterations']
+        warmup = options['warmup']
+
+        cache, predictor.cache = predictor.cache, None
+        try:
+            legacy = self.measure(predictor.predict, iterations, warmup)
+            fast = self.measure(predictor.predict_fast, iterations, warmup)
+        finally:
+            predictor.cache = cache
+
+        rows = [('predict', legacy), ('predict_fast', fast)]
+        if cache is not None:
+            rows.append(('cache_hit', self.measure(predictor.predict_fast, iterations, warmup)))
+
+        self.stdout.write(f"{'경로':<14}{'p50(us)':>12}{'p95(us)':>12}{'p99(us)':>12}")
+        for name, timings in rows:
+            p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+            self.stdout.write(f"{name:<14}{p50:>12.1f}{p95:>12.1f}{p99:>12.1f}")
+        speedup = np.median(legacy) / np.median(fast)
+        self.stdout.write(self.style.SUCCESS(f"p50 기준 {speedup:.1f}배 빨라졌습니다"))
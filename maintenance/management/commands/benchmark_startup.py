@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# 새 인터프리터에서 URLconf까지 import 하고, 이어서 첫 모델 로드 시간을 잽니다
+STARTUP_SCRIPT = """
+import os, sys, time
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+start = time.perf_counter()
+import django
+django.setup()
+import config.urls
+boot = time.perf_counter() - start
+heavy = [name for name in ('pandas', 'sklearn', 'scipy', 'xgboost') if name in sys.modules]
+sys.stderr.write('{marker}\\n')
+start = time.perf_counter()
+if {warm_up}:
+    from maintenance import views
+    views.warm_up()
+warm = time.perf_counter() - start
+print(f"{{boot}}|{{warm}}|{{','.join(heavy)}}")
+"""
+
+
+class Command(BaseCommand):
+    """워커 시작 비용을 측정합니다.
+
+    별도 프로세스에서 python -X importtime 으로 Django 설정과 URLconf import를 실행하고,
+    모듈별 누적 import 시간 상위 항목과 첫 모델 로드(warm_up) 시간을 보고합니다.
+    """
+
+    help = '워커 시작 시 import 시간(모듈별)과 모델 로드 시간을 측정합니다'
+
+    # importtime 출력에서 URLconf import 단계와 warm_up 단계를 구분하는 표시
+    WARM_UP_MARKER = '--- warm_up ---'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20, help='출력할 모듈 수 (누적 시간 기준)')
+        parser.add_argument('--no-warm-up', action='store_true', help='모델 로드(warm_up) 시간은 측정하지 않습니다')
+
+    def handle(self, *args, **options):
+        script = STARTUP_SCRIPT.format(warm_up=not options['no_warm_up'], marker=self.WARM_UP_MARKER)
+        env = dict(os.environ, PYTHONPATH=str(settings.BASE_DIR))
+
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True
+        )
+        wall = time.perf_counter() - start
+        if proc.returncode != 0:
+            raise CommandError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else '측정 실패')
+
+        imports = self.parse_importtime(proc.stderr)
+        boot, warm, heavy = proc.stdout.strip().splitlines()[-1].split('|')
+
+        self.stdout.write(f"{'module':<50}{'phase':>10}{'self(ms)':>12}{'cumulative(ms)':>16}")
+        for name, phase, self_us, cumulative_us in sorted(imports, key=lambda row: -row[3])[:options['top']]:
+            self.stdout.write(f"{name:<50}{phase:>10}{self_us / 1000:>12.1f}{cumulative_us / 1000:>16.1f}")
+
+        self.stdout.write('')
+        self.stdout.write(f"Django 설정 + URLconf import: {float(boot) * 1000:.0f}ms")
+        if not options['no_warm_up']:
+            self.stdout.write(f"모델 로드 (warm_up): {float(warm) * 1000:.0f}ms")
+        self.stdout.write(f"프로세스 전체: {wall * 1000:.0f}ms")
+        self.stdout.write(f"URLconf import 후 로드된 무거운 라이브러리: {heavy or '없음'}")
+
+    @classmethod
+    def parse_importtime(cls, stderr):
+        """-X importtime 출력에서 (모듈 이름, 단계, self us, cumulative us) 목록을 만듭니다."""
+        rows = []
+        phase = 'boot'
+        for line in stderr.splitlines():
+            if line == cls.WARM_UP_MARKER:
+                phase = 'warm_up'
+                continue
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            rows.append((name.strip(), phase, int(self_us), int(cumulative_us)))
+        return rows
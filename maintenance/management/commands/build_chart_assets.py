@@ -0,0 +1,55 @@
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from maintenance import charts
+
+
+class Command(BaseCommand):
+    """static/images 아래 plotly 차트 HTML을 공통 번들 + figure JSON 자산으로 빌드합니다.
+
+    결과 파일명에는 내용 해시가 붙고 gzip(brotli 모듈이 있으면 brotli도) 사전 압축본이 함께 저장됩니다.
+    차트 HTML을 다시 만들었다면 이 명령을 다시 실행하면 됩니다.
+    자산은 CHART_ASSETS_DIR에 저장되며, 새 매니페스트가 참조하지 않는 이전 빌드의 해시 자산은 지웁니다.
+    """
+
+    help = 'Plotly 차트 HTML을 공통 plotly.js 번들과 차트별 figure JSON으로 나눠 저장합니다'
+
+    # 빌드 대상 차트 디렉터리 (static 기준 경로)
+    CHART_DIRS = ('images/graphs', 'images/confusion_matrix')
+
+    def handle(self, *args, **options):
+        static_root = Path(settings.BASE_DIR) / 'static'
+        chart_paths = {}
+        for chart_dir in self.CHART_DIRS:
+            for file_path in sorted((static_root / chart_dir).glob('*.html')):
+                chart_paths[f'{chart_dir}/{file_path.name}'] = file_path
+        if not chart_paths:
+            raise CommandError('빌드할 차트 HTML이 없습니다')
+
+        # chart_asset 뷰와 템플릿 태그가 읽는 디렉터리(CHART_ASSETS_DIR)에만 빌드합니다
+        output_dir = charts.assets_dir()
+        try:
+            manifest = charts.build_assets(chart_paths, output_dir)
+        except ValueError as e:
+            raise CommandError(str(e))
+        # 새 매니페스트로 교체한 뒤 이전 빌드의 해시 자산을 지웁니다
+        removed = charts.prune_assets(output_dir, manifest)
+
+        source_bytes = sum(os.path.getsize(path) for path in chart_paths.values())
+        self.stdout.write(f"원본 차트 {len(chart_paths)}개: {source_bytes / 1e6:.1f}MB")
+
+        for name in [manifest['plotly']] + list(manifest['charts'].values()):
+            sizes = [f"{os.path.getsize(output_dir / name) / 1e3:.1f}KB"]
+            for encoding, suffix in charts.ENCODING_SUFFIXES:
+                if (output_dir / (name + suffix)).exists():
+                    sizes.append(f"{encoding} {os.path.getsize(output_dir / (name + suffix)) / 1e3:.1f}KB")
+            self.stdout.write(f"  {name}: {', '.join(sizes)}")
+
+        if removed:
+            self.stdout.write(f"이전 빌드 자산 {len(removed)}개를 지웠습니다")
+        if charts.brotli is None:
+            self.stdout.write('brotli 모듈이 없어 gzip 압축본만 만들었습니다')
+        self.stdout.write(self.style.SUCCESS(f'차트 자산을 {output_dir}에 저장했습니다'))
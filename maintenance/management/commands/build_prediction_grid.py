@@ -0,0 +1,78 @@
+import os
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from maintenance.ml.grid import PredictionGrid, model_digest
+from maintenance.ml.models.config import MLConfig
+from maintenance.ml.predictor import MillingMachinePredictor
+
+
+class Command(BaseCommand):
+    """MLConfig.FEATURE_CONFIG 범위의 격자점에서 모델 확률을 사전 계산합니다.
+
+    결과는 (type, 온도차, 회전 속도, 토크, 공구 마모, 클래스) 형태의 float32 .npy 파일과
+    축 정보 JSON으로 저장되며, 서버는 이 파일을 메모리 맵으로 열어 조회합니다.
+    """
+
+    help = '모델 확률 격자를 사전 계산해 메모리 맵 .npy 파일로 저장합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--temp-diff-steps', type=int, default=10, help='온도차 축 격자점 수')
+        parser.add_argument('--rpm-steps', type=int, default=32, help='회전 속도 축 격자점 수')
+        parser.add_argument('--torque-steps', type=int, default=32, help='토크 축 격자점 수')
+        parser.add_argument('--tool-wear-steps', type=int, default=32, help='공구 마모 축 격자점 수')
+        parser.add_argument('--output', default=str(settings.PREDICTION_GRID_PATH), help='저장할 .npy 파일 경로')
+
+    def handle(self, *args, **options):
+        base_dir = settings.BASE_DIR / 'maintenance' / 'ml' / 'models'
+        model_path = base_dir / 'model_xgboost.json'
+        scaler_path = base_dir / 'scaler_params.json'
+        predictor = MillingMachinePredictor(model_path, scaler_path, engine='xgboost')
+
+        features = MLConfig.FEATURE_CONFIG['features']
+
+        def axis(name, steps):
+            return np.linspace(features[name]['min'], features[name]['max'], steps)
+
+        axes = [
+            np.linspace(predictor.TEMP_DIFF_MIN, predictor.TEMP_DIFF_MAX, options['temp_diff_steps']),
+            axis('rotational_speed', options['rpm_steps']),
+            axis('torque', options['torque_steps']),
+            axis('tool_wear', options['tool_wear_steps'])
+        ]
+        n_types = len(features['type']['options'])
+        shape = (n_types,) + tuple(len(a) for a in axes) + (len(predictor.classes),)
+
+        output = options['output']
+        tmp_output = output + '.tmp'
+        grid = np.lib.format.open_memmap(tmp_output, mode='w+', dtype=np.float32, shape=shape)
+
+        # 온도차 한 값마다 회전 속도 × 토크 × 공구 마모 평면을 한 번에 예측합니다
+        speed, torque, tool_wear = (a.ravel() for a in np.meshgrid(axes[1], axes[2], axes[3], indexing='ij'))
+        start = time.perf_counter()
+        for type_encoded in range(n_types):
+            for td_idx, temp_diff in enumerate(axes[0]):
+                matrix = predictor.derive_features(
+                    np.full(len(speed), type_encoded, dtype=np.float64), speed, torque, tool_wear,
+                    np.full(len(speed), temp_diff, dtype=np.float64)
+                )
+                grid[type_encoded, td_idx] = predictor.model.predict_proba(matrix).reshape(shape[2:])
+        grid.flush()
+        del grid
+        elapsed = time.perf_counter() - start
+
+        PredictionGrid.save_metadata(
+            tmp_output, axes, predictor.classes, model_digest(model_path, scaler_path)
+        )
+        os.replace(PredictionGrid.metadata_path(tmp_output), PredictionGrid.metadata_path(output))
+        os.replace(tmp_output, output)
+
+        n_points = int(np.prod(shape[:-1]))
+        size_mb = os.path.getsize(output) / 1024 / 1024
+        self.stdout.write(self.style.SUCCESS(
+            f"격자 {shape[:-1]} ({n_points}점, {size_mb:.1f}MB)를 {elapsed:.1f}초에 계산했습니다 "
+            f"({n_points / elapsed:.0f}점/초): {output}"
+        ))
@@ -0,0 +1,92 @@
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from maintenance import views
+from maintenance.benchmarks.results import sample_inputs
+from maintenance.ml.explain import ATTRIBUTION, EXPLAINED_CLASSES
+
+
+class Command(BaseCommand):
+    """예측 설명(explain=1)의 정확성과 지연 시간 목표를 검증합니다.
+
+    기여도 합 + base_value가 부스터의 margin 출력과 같은지, 원시 입력 기여도 합이 모델 특성 기여도 합과 같은지 확인하고,
+    캐시 없는 단일 예측 + 설명의 p95 지연 시간이 PREDICTION_EXPLAIN_BUDGET_MS 안인지 검사합니다.
+    캐시 적중과 배치(정확/근사) 설명의 행당 비용도 함께 보고합니다.
+    """
+
+    help = '예측 설명(특성 기여도)의 정확성과 지연 시간 목표(p95)를 검증합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=300, help='단일 요청 측정 반복 횟수')
+        parser.add_argument('--budget-ms', type=float,
+                            default=getattr(settings, 'PREDICTION_EXPLAIN_BUDGET_MS', 10.0),
+                            help='캐시 없는 단일 예측 + 설명의 p95 지연 시간 목표 (ms)')
+        parser.add_argument('--atol', type=float, default=1e-3, help='margin 비교 허용 오차')
+
+    def p95_ms(self, func, records, iterations):
+        """모든 입력으로 한 번씩 예열한 뒤 iterations번 호출한 p95 지연 시간(ms)을 반환합니다."""
+        for record in records:
+            func(record)
+        timings = []
+        for i in range(iterations):
+            start = time.perf_counter()
+            func(records[i % len(records)])
+            timings.append(time.perf_counter() - start)
+        return float(np.percentile(timings, 95)) * 1000
+
+    def check_additivity(self, predictor, records, atol):
+        """설명 값이 부스터 margin 출력을 정확히 나누는지 확인하고 최대 오차를 반환합니다."""
+        from xgboost import DMatrix
+        features, valid_idx, _, _ = predictor.build_feature_matrix(records)
+        explanations = predictor.explainer.explain(features)
+        booster = predictor.explainer.booster()
+        margins = booster.predict(
+            DMatrix(features.astype(np.float32), feature_names=booster.feature_names), output_margin=True
+        )
+        max_error = 0.0
+        for row, explanation in enumerate(explanations):
+            for label, column in EXPLAINED_CLASSES.items():
+                inputs = sum(explanation['inputs'][label].values())
+                model_features = sum(explanation['features'][label].values())
+                total = explanation['base_values'][label] + model_features
+                max_error = max(max_error, abs(total - margins[row, column]), abs(inputs - model_features))
+        if max_error > atol:
+            raise CommandError(f'기여도 합이 margin과 일치하지 않습니다 (최대 오차 {max_error:.2e})')
+        if not np.allclose(ATTRIBUTION.sum(axis=1), 1.0):
+            raise CommandError('원시 입력 분배 행렬의 행 합이 1이 아닙니다')
+        return max_error
+
+    def handle(self, *args, **options):
+        predictor = views.get_predictor()
+        if predictor is None:
+            raise CommandError('ML 모델이 로드되지 않았습니다.')
+        records = [views.to_predictor_input(row) for row in sample_inputs(512, seed=1)]
+        iterations = options['iterations']
+
+        max_error = self.check_additivity(predictor, records[:100], options['atol'])
+        self.stdout.write(f'기여도 합 검증: 최대 오차 {max_error:.2e}')
+
+        cache, predictor.cache = predictor.cache, None
+        try:
+            cold = self.p95_ms(lambda record: predictor.predict_fast(record, explain=True), records, iterations)
+            plain = self.p95_ms(predictor.predict_fast, records, iterations)
+        finally:
+            predictor.cache = cache
+        self.stdout.write(f'단일 예측 p95: {plain:.2f}ms, 예측 + 설명(캐시 없음) p95: {cold:.2f}ms')
+        if cache is not None:
+            hit = self.p95_ms(lambda record: predictor.predict_fast(record, explain=True), records[:50], iterations)
+            self.stdout.write(f'예측 + 설명(캐시 적중) p95: {hit:.3f}ms')
+
+        exact_rows = predictor.explainer.exact_max_rows
+        for label, rows in (('정확', exact_rows), ('근사', min(exact_rows * 8, len(records)))):
+            start = time.perf_counter()
+            predictor.predict_batch(records[:rows], explain=True)
+            seconds = time.perf_counter() - start
+            self.stdout.write(f'배치 {rows}행 예측 + 설명({label}): {seconds * 1000:.1f}ms (행당 {seconds * 1000 / rows:.3f}ms)')
+
+        if cold > options['budget_ms']:
+            raise CommandError(f"예측 + 설명 p95 {cold:.2f}ms가 목표 {options['budget_ms']:.2f}ms를 넘었습니다")
+        self.stdout.write(self.style.SUCCESS(f"예측 + 설명 p95가 목표 {options['budget_ms']:.2f}ms 안에 있습니다"))
@@ -0,0 +1,68 @@
+import itertools
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from maintenance.ml.models.config import MLConfig
+from maintenance.ml.predictor import MillingMachinePredictor
+
+
+class Command(BaseCommand):
+    """NumPy 트리 엔진과 XGBClassifier.predict_proba의 결과가 일치하는지 검증합니다.
+
+    MLConfig.FEATURE_CONFIG 범위에서 격자 입력을 생성해 두 엔진으로 예측하고,
+    확률의 최대 오차와 예측 클래스 불일치 수를 보고합니다.
+    """
+
+    help = 'NumPy 트리 엔진과 XGBoost의 예측 결과 일치 여부를 검증합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--points', type=int, default=6, help='연속형 특성별 격자 점 개수')
+        parser.add_argument('--atol', type=float, default=1e-5, help='허용하는 확률 절대 오차')
+
+    def build_grid(self, points):
+        """FEATURE_CONFIG 범위 위의 격자 입력을 predictor 입력 형식으로 생성합니다."""
+        features = MLConfig.FEATURE_CONFIG['features']
+
+        def axis(name):
+            return np.linspace(features[name]['min'], features[name]['max'], points).tolist()
+
+        # 공정 온도는 허용 온도차 범위 안에서 공기 온도 기준으로 생성합니다
+        temp_diffs = np.linspace(7.6, 12.1, points).tolist()
+        for product_type, air_temp, temp_diff, speed, torque, tool_wear in itertools.product(
+            features['type']['options'], axis('air_temperature'), temp_diffs,
+            axis('rotational_speed'), axis('torque'), axis('tool_wear')
+        ):
+            yield {
+                'type': product_type,
+                'Air_Temperature': air_temp,
+                'Process_Temperature': air_temp + temp_diff,
+                'Rotational_Speed': speed,
+                'Torque': torque,
+                'Tool_Wear': tool_wear
+            }
+
+    def handle(self, *args, **options):
+        base_dir = settings.BASE_DIR / 'maintenance' / 'ml' / 'models'
+        model_path = base_dir / 'model_xgboost.json'
+        scaler_path = base_dir / 'scaler_params.json'
+
+        reference = MillingMachinePredictor(model_path, scaler_path, engine='xgboost')
+        candidate = MillingMachinePredictor(model_path, scaler_path, engine='numpy')
+
+        records = list(self.build_grid(options['points']))
+        features, valid_idx, _, _ = reference.build_feature_matrix(records)
+        if not len(valid_idx):
+            raise CommandError('검증할 유효한 격자 입력이 없습니다.')
+
+        expected = reference.model.predict_proba(features)
+        actual = candidate.model.predict_proba(features)
+
+        max_error = float(np.abs(expected - actual).max())
+        mismatches = int((expected.argmax(axis=1) != actual.argmax(axis=1)).sum())
+        self.stdout.write(f"격자 입력 {len(valid_idx)}개, 최대 확률 오차 {max_error:.2e}, 클래스 불일치 {mismatches}개")
+
+        if max_error > options['atol'] or mismatches:
+            raise CommandError('NumPy 트리 엔진의 결과가 XGBoost와 일치하지 않습니다.')
+        self.stdout.write(self.style.SUCCESS('NumPy 트리 엔진이 XGBoost와 일치합니다.'))
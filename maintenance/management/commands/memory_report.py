@@ -0,0 +1,116 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def memory_usage():
+    """현재 프로세스의 RSS/PSS/USS(KB)를 /proc/self/smaps_rollup에서 읽습니다.
+
+    PSS는 공유 페이지를 공유하는 프로세스 수로 나눈 값이라, 워커들의 PSS 합계가 실제 노드 메모리 사용량입니다.
+    """
+    fields = {}
+    with open('/proc/self/smaps_rollup', 'r') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    return {
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'uss': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    }
+
+
+class Command(BaseCommand):
+    """워커 프로세스별 메모리 사용량을 preload 여부에 따라 비교합니다.
+
+    gunicorn과 같은 방식으로 os.fork()한 워커 N개를 띄우고, 각 워커에서 모델 로드 전/후와
+    예측 후의 RSS, PSS, USS를 측정합니다.
+    - per-worker: 워커마다 fork 이후에 모델을 로드합니다 (기본 gunicorn 동작)
+    - preload: 부모가 fork 전에 모델을 로드하고 워커들은 copy-on-write로 공유합니다
+    """
+
+    help = 'preload 여부에 따른 워커별 RSS/PSS/USS 메모리 사용량을 비교합니다'
+
+    SAMPLE = {'type': 'M', 'Air_Temperature': 300.0, 'Process_Temperature': 310.0,
+              'Rotational_Speed': 1500, 'Torque': 40.0, 'Tool_Wear': 100}
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='fork 할 워커 수')
+        parser.add_argument('--predictions', type=int, default=200, help='워커마다 수행할 예측 횟수')
+
+    def handle(self, *args, **options):
+        if not os.path.exists('/proc/self/smaps_rollup'):
+            raise CommandError('/proc/self/smaps_rollup을 읽을 수 없는 환경입니다 (Linux 전용)')
+
+        from maintenance import views
+        if views.model_holder.current is not None:
+            raise CommandError('모델이 이미 로드된 프로세스에서는 per-worker 모드를 측정할 수 없습니다')
+
+        # per-worker를 먼저 측정해야 부모가 아직 모델과 라이브러리를 로드하지 않은 상태에서 fork 합니다
+        results = {'per-worker': self.run_workers(views, options, preload=False)}
+        if not views.warm_up(start_watcher=False):
+            raise CommandError(f'모델 로드 실패: {views.model_holder.last_error}')
+        parent = memory_usage()
+        results['preload'] = self.run_workers(views, options, preload=True)
+
+        self.stdout.write(f"engine={getattr(settings, 'PREDICTOR_ENGINE', 'xgboost')}, workers={options['workers']}")
+        self.stdout.write(f"preload 부모 프로세스: RSS {parent['rss'] / 1024:.1f}MB, PSS {parent['pss'] / 1024:.1f}MB")
+        self.stdout.write(f"{'mode':<12}{'stage':<14}{'RSS(MB)':>10}{'PSS(MB)':>10}{'USS(MB)':>10}{'PSS 합계(MB)':>14}")
+        for mode, workers in results.items():
+            for stage in ('before_load', 'after_load', 'after_predict', 'all_ready'):
+                rows = [worker[stage] for worker in workers]
+                avg = {key: sum(row[key] for row in rows) / len(rows) / 1024 for key in ('rss', 'pss', 'uss')}
+                total_pss = sum(row['pss'] for row in rows) / 1024
+                self.stdout.write(
+                    f"{mode:<12}{stage:<14}{avg['rss']:>10.1f}{avg['pss']:>10.1f}{avg['uss']:>10.1f}{total_pss:>14.1f}"
+                )
+
+    def run_workers(self, views, options, preload):
+        """워커를 fork 해서 측정하고 워커별 측정값 목록을 반환합니다.
+
+        PSS는 다른 워커들의 상태에 따라 달라지므로, 모든 워커가 예측을 마친 뒤 부모가 신호를 보내
+        한 번 더 측정(all_ready)하고 종료시킵니다.
+        """
+        children = []
+        for _ in range(options['workers']):
+            result_r, result_w = os.pipe()
+            release_r, release_w = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.close(result_r)
+                os.close(release_w)
+                try:
+                    report = {'before_load': memory_usage()}
+                    if not preload:
+                        views.warm_up(start_watcher=False)
+                    report['after_load'] = memory_usage()
+                    predictor = views.model_holder.current.predictor
+                    for _ in range(options['predictions']):
+                        predictor.predict_fast(self.SAMPLE)
+                    report['after_predict'] = memory_usage()
+                    os.write(result_w, (json.dumps(report) + '\n').encode())
+                    os.read(release_r, 1)
+                    os.write(result_w, (json.dumps(memory_usage()) + '\n').encode())
+                finally:
+                    os._exit(0)
+            os.close(result_w)
+            os.close(release_r)
+            children.append((pid, os.fdopen(result_r, 'r'), release_w))
+
+        reports = []
+        for _, reader, _ in children:
+            line = reader.readline()
+            if not line:
+                raise CommandError('워커 측정 실패')
+            reports.append(json.loads(line))
+
+        for report, (pid, reader, release_w) in zip(reports, children):
+            os.write(release_w, b'1')
+            report['all_ready'] = json.loads(reader.readline())
+            reader.close()
+            os.close(release_w)
+            os.waitpid(pid, 0)
+        return reports
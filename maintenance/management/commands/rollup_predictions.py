@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils.dateparse import parse_datetime
+
+from maintenance import history
+from maintenance.models import SimulatorInput
+
+
+class Command(BaseCommand):
+    """예측 기록의 기계별 1분 롤업(PredictionRollup)을 원본 기록에서 다시 집계합니다.
+
+    롤업은 해당 분을 원본에서 다시 집계해 덮어쓰므로 여러 번 실행해도 결과가 같습니다.
+    PREDICTION_ROLLUP_ON_WRITE를 끈 경우나 기존 기록으로 롤업을 처음 만들 때 사용합니다.
+    """
+
+    help = '예측 기록의 기계별 1분 롤업을 다시 집계합니다 (기본: 전체 기간)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='이 시각(ISO 8601) 이후의 기록만 다시 집계합니다')
+        parser.add_argument('--hours', type=float, help='최근 N시간의 기록만 다시 집계합니다')
+        parser.add_argument('--machine', action='append', dest='machines', help='이 기계만 다시 집계합니다 (여러 번 지정 가능)')
+
+    def handle(self, *args, **options):
+        bounds = SimulatorInput.objects.aggregate(first=Min('created_at'), last=Max('created_at'))
+        if bounds['first'] is None:
+            self.stdout.write('예측 기록이 없습니다.')
+            return
+
+        start, end = bounds['first'], bounds['last'] + timedelta(minutes=1)
+        if options['since']:
+            since = parse_datetime(options['since'])
+            if since is None:
+                raise CommandError('--since는 ISO 8601 형식이어야 합니다 (예: 2024-01-01T00:00:00+09:00)')
+            start = max(start, since if since.tzinfo else since.replace(tzinfo=timezone.utc))
+        if options['hours'] is not None:
+            start = max(start, datetime.now(timezone.utc) - timedelta(hours=options['hours']))
+
+        written = history.refresh_rollups(start, end, machine_ids=options['machines'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{start.isoformat()} ~ {end.isoformat()} 구간의 롤업 {written:,}행을 다시 집계했습니다.'
+        ))
@@ -0,0 +1,257 @@
+import re
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from maintenance import views
+from maintenance.ml import features as feature_pipeline
+from maintenance.prediction_log import PredictionLogWriter
+
+# 결과 파일에 추가하는 열 (확률 열은 API 응답의 probabilities 키 순서)
+PROBABILITY_COLUMNS = {'prob_none': 0, 'prob_HDF': 2, 'prob_PWF': 3, 'prob_OSF': 4}
+
+
+def normalize_column(name):
+    """열 이름을 API 필드 이름 형식으로 바꿉니다. 예: 'Air temperature [K]' -> 'air_temperature'"""
+    name = re.sub(r'\[.*?\]', '', str(name)).strip().lower()
+    return re.sub(r'[^a-z0-9]+', '_', name).strip('_')
+
+
+def parse_timestamps(values):
+    """측정 시각 열을 UTC 시각 Series로 바꿉니다.
+
+    시간대가 없는 값은 settings.TIME_ZONE 기준으로 해석하고, 해석할 수 없는 값은 NaT입니다.
+    """
+    import pandas as pd
+    with warnings.catch_warnings():
+        # 시간대가 있는 값과 없는 값이 섞이면 object 열로 파싱되며, 아래에서 값마다 처리하므로 경고는 무시합니다
+        warnings.simplefilter('ignore', FutureWarning)
+        stamps = pd.to_datetime(values, errors='coerce', format='mixed')
+    if isinstance(stamps.dtype, pd.DatetimeTZDtype):
+        return stamps.dt.tz_convert('UTC')
+    if stamps.dtype != object:
+        return stamps.dt.tz_localize(settings.TIME_ZONE, ambiguous='NaT', nonexistent='NaT').dt.tz_convert('UTC')
+
+    def to_utc(value):
+        if pd.isna(value):
+            return pd.NaT
+        value = pd.Timestamp(value)
+        if value.tzinfo is None:
+            value = value.tz_localize(settings.TIME_ZONE, ambiguous='NaT', nonexistent='NaT')
+        return value.tz_convert('UTC') if not pd.isna(value) else pd.NaT
+    return pd.to_datetime(stamps.map(to_utc), utc=True)
+
+
+def require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise CommandError('Parquet 입출력에는 pyarrow 패키지가 필요합니다 (pip install pyarrow)')
+    return pyarrow
+
+
+class Command(BaseCommand):
+    """과거 측정값 파일(CSV/Parquet)을 청크 단위로 읽어 고장 예측 결과를 일괄 생성합니다.
+
+    청크마다 열 단위 벡터 연산으로 특성(온도차, 전력, 마모도, 제품 유형 인코딩)을 만들고
+    한 번의 predict_proba 호출로 예측한 뒤 바로 출력하므로, 메모리 사용량은 파일 크기가 아니라
+    --chunk-size에 비례합니다. 결과는 CSV/Parquet 파일(입력 열 + 예측 열)로 쓰거나
+    --to-db로 SimulatorInput/SimulatorOutput에 bulk_create로 저장합니다.
+    --timestamp-column을 주면 그 열의 측정 시각을 created_at으로 저장하므로 과거 기록이 이력/롤업의
+    해당 시각에 들어갑니다 (없으면 적재 시각).
+    입력 열 이름은 API 필드 이름(air_temperature 등)이나 원본 데이터셋 이름(Air temperature [K] 등)을 사용할 수 있습니다.
+    """
+
+    help = 'CSV/Parquet 측정값 파일을 청크 단위로 예측해 파일 또는 데이터베이스에 저장합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='입력 파일 경로 (.csv 또는 .parquet)')
+        parser.add_argument('--output', help='결과 파일 경로 (.csv 또는 .parquet)')
+        parser.add_argument('--to-db', action='store_true', help='성공한 행을 SimulatorInput/SimulatorOutput에 저장합니다')
+        parser.add_argument('--chunk-size', type=int, default=50000, help='한 번에 읽고 예측할 행 수')
+        parser.add_argument('--timestamp-column',
+                            help='측정 시각 열 이름. --to-db로 저장할 때 created_at으로 사용합니다 '
+                                 '(시간대가 없으면 TIME_ZONE 기준)')
+
+    def handle(self, *args, **options):
+        input_path = Path(options['input'])
+        output_path = Path(options['output']) if options['output'] else None
+        if output_path is None and not options['to_db']:
+            raise CommandError('--output 또는 --to-db 중 하나 이상을 지정해야 합니다')
+        if not input_path.exists():
+            raise CommandError(f'입력 파일이 없습니다: {input_path}')
+        for path in filter(None, (input_path, output_path)):
+            if path.suffix.lower() not in ('.csv', '.parquet'):
+                raise CommandError(f'지원하지 않는 파일 형식입니다: {path.name} (.csv 또는 .parquet)')
+        if options['chunk_size'] <= 0:
+            raise CommandError('--chunk-size는 1 이상이어야 합니다')
+
+        predictor = views.get_predictor()
+        if predictor is None:
+            raise CommandError('ML 모델이 로드되지 않았습니다.')
+
+        writer = self.open_output(output_path)
+        db_writer = PredictionLogWriter(synchronous=True) if options['to_db'] else None
+        total = succeeded = 0
+        score_seconds = 0.0
+        start = time.perf_counter()
+        try:
+            for chunk in self.read_chunks(input_path, options['chunk_size']):
+                score_start = time.perf_counter()
+                scored, pairs = self.score_chunk(predictor, chunk, options['timestamp_column'])
+                score_seconds += time.perf_counter() - score_start
+
+                if writer is not None:
+                    writer(scored)
+                if db_writer is not None and pairs:
+                    db_writer.write(pairs)
+
+                total += len(chunk)
+                succeeded += int((scored['status'] == 'success').sum())
+                elapsed = time.perf_counter() - start
+                self.stdout.write(f'{total:,}행 처리 ({total / elapsed:,.0f} rows/sec)')
+        finally:
+            if writer is not None:
+                writer(None)
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'완료: {total:,}행 중 {succeeded:,}행 성공, {total - succeeded:,}행 실패, '
+            f'{elapsed:.1f}초 ({total / elapsed if elapsed else 0:,.0f} rows/sec, 특성 계산+예측 {score_seconds:.1f}초)'
+        ))
+
+    def read_chunks(self, path, chunk_size):
+        """입력 파일을 DataFrame 청크 단위로 읽습니다."""
+        import pandas as pd
+        if path.suffix.lower() == '.parquet':
+            require_pyarrow()
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+                yield batch.to_pandas()
+            return
+
+        # 제품 유형 열은 문자열로 읽어야 'L'/'M'/'H' 외의 값도 오류 메시지로 그대로 돌려줄 수 있습니다
+        header = pd.read_csv(path, nrows=0).columns
+        type_columns = [column for column in header if normalize_column(column) == 'type']
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype={column: str for column in type_columns})
+
+    def score_chunk(self, predictor, chunk, timestamp_column=None):
+        """청크 하나를 예측해 (예측 열이 추가된 DataFrame, DB 저장용 (입력값, 예측 코드, 확률) 목록)을 반환합니다.
+
+        timestamp_column을 주면 그 열의 측정 시각을 입력값의 created_at으로 넣고, 해석할 수 없는 행은 오류로 처리합니다.
+        """
+        import pandas as pd
+        columns = {normalize_column(column): column for column in chunk.columns}
+        missing = [field for field in views.REQUIRED_FIELDS if field not in columns]
+        if timestamp_column is not None and timestamp_column not in chunk.columns:
+            if normalize_column(timestamp_column) not in columns:
+                missing.append(timestamp_column)
+            else:
+                timestamp_column = columns[normalize_column(timestamp_column)]
+        if missing:
+            raise CommandError(f"입력 파일에 필수 열이 없습니다: {', '.join(missing)}")
+
+        n_rows = len(chunk)
+        raw = np.column_stack([
+            pd.to_numeric(chunk[columns[field]], errors='coerce').to_numpy(dtype=np.float64)
+            for field in views.REQUIRED_FIELDS[1:]
+        ]) if n_rows else np.empty((0, len(predictor.RAW_FIELDS)))
+        # API(to_predictor_input)와 같이 회전 속도와 공구 마모는 정수로 버립니다
+        raw[:, 2] = np.trunc(raw[:, 2])
+        raw[:, 4] = np.trunc(raw[:, 4])
+
+        types = chunk[columns['type']].astype(str).str.strip().to_numpy(dtype=object)
+        errors = {}
+        type_encoded = feature_pipeline.encode_types(types, errors)
+        timestamps = None
+        if timestamp_column is not None:
+            timestamps = parse_timestamps(chunk[timestamp_column]).reset_index(drop=True)
+            for i in np.flatnonzero(timestamps.isna().to_numpy()).tolist():
+                errors.setdefault(i, f"측정 시각을 해석할 수 없습니다: {chunk[timestamp_column].iloc[i]}")
+
+        features, valid_idx = predictor.build_feature_columns(type_encoded, raw, errors)
+        probabilities = predictor.predict_proba_matrix(features) if len(valid_idx) else np.empty((0, len(predictor.classes)))
+
+        predicted = np.asarray(predictor.classes)[probabilities.argmax(axis=1)] if len(valid_idx) else np.empty(0, dtype=int)
+        names = np.array([predictor.failure_types(pred) for pred in range(len(predictor.classes))], dtype=object)
+
+        valid = np.zeros(n_rows, dtype=bool)
+        valid[valid_idx] = True
+        scored = chunk.copy()
+        prediction = np.full(n_rows, None, dtype=object)
+        prediction[valid_idx] = names[predicted]
+        scored['prediction'] = prediction
+        for column, class_index in PROBABILITY_COLUMNS.items():
+            values = np.full(n_rows, np.nan)
+            values[valid_idx] = probabilities[:, class_index]
+            scored[column] = values
+        scored['temp_difference'] = np.where(valid, raw[:, 1] - raw[:, 0], np.nan)
+        scored['power'] = np.where(valid, feature_pipeline.calculate_power(raw[:, 2], raw[:, 3]), np.nan)
+        status = np.full(n_rows, 'success', dtype=object)
+        message = np.full(n_rows, None, dtype=object)
+        for i, text in errors.items():
+            status[i] = 'error'
+            message[i] = text
+        scored['status'] = status
+        scored['message'] = message
+
+        codes = [views.PREDICTION_CODES.get(name, 0) for name in names[predicted].tolist()]
+        machine_ids = (
+            chunk[columns['machine_id']].fillna('').astype(str).str.slice(0, 64).to_numpy(dtype=object)
+            if 'machine_id' in columns else None
+        )
+        pairs = []
+        for row, (i, code) in enumerate(zip(valid_idx.tolist(), codes)):
+            input_data = {
+                'type': types[i],
+                'Air_Temperature': float(raw[i, 0]),
+                'Process_Temperature': float(raw[i, 1]),
+                'Rotational_Speed': int(raw[i, 2]),
+                'Torque': float(raw[i, 3]),
+                'Tool_Wear': int(raw[i, 4])
+            }
+            if machine_ids is not None:
+                input_data['machine_id'] = machine_ids[i]
+            if timestamps is not None:
+                input_data['created_at'] = timestamps[i].to_pydatetime()
+            failure_probabilities = {
+                'HDF': float(probabilities[row, 2]),
+                'PWF': float(probabilities[row, 3]),
+                'OSF': float(probabilities[row, 4])
+            }
+            pairs.append((input_data, code, failure_probabilities))
+        return scored, pairs
+
+    def open_output(self, path):
+        """청크 DataFrame을 이어서 쓰는 함수를 반환합니다. None을 넘기면 파일을 닫습니다."""
+        if path is None:
+            return None
+        if path.suffix.lower() == '.parquet':
+            pyarrow = require_pyarrow()
+            import pyarrow.parquet as pq
+            state = {'writer': None}
+
+            def write_parquet(frame):
+                if frame is None:
+                    if state['writer'] is not None:
+                        state['writer'].close()
+                    return
+                table = pyarrow.Table.from_pandas(frame, preserve_index=False)
+                if state['writer'] is None:
+                    state['writer'] = pq.ParquetWriter(path, table.schema)
+                state['writer'].write_table(table.cast(state['writer'].schema))
+            return write_parquet
+
+        state = {'header': True}
+
+        def write_csv(frame):
+            if frame is None:
+                return
+            frame.to_csv(path, mode='w' if state['header'] else 'a', header=state['header'], index=False)
+            state['header'] = False
+        return write_csv
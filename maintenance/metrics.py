@@ -0,0 +1,33 @@
+"""
+프로세스 내 지표 수집용 히스토그램
+요청 단계별 소요 시간(instrumentation)과 마이크로 배칭의 배치 크기/큐 대기 시간(ml.batcher)이 함께 사용합니다.
+Django 설정을 import 하지 않으므로 ml 패키지에서도 사용할 수 있습니다.
+"""
+import threading
+from bisect import bisect_left
+
+
+class Histogram:
+    """상한값(bounds) 기준 누적 버킷 히스토그램입니다. 마지막 버킷은 상한보다 큰 값(+Inf)입니다."""
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.counts[bisect_left(self.bounds, value)] += 1
+            self.total += 1
+            self.sum += value
+
+    def snapshot(self):
+        """버킷별 개수와 합계를 반환합니다 (le: 버킷 상한)."""
+        with self._lock:
+            counts = list(self.counts)
+            total, value_sum = self.total, self.sum
+        buckets = [{'le': bound, 'count': count} for bound, count in zip(self.bounds, counts)]
+        buckets.append({'le': '+Inf', 'count': counts[-1]})
+        return {'count': total, 'sum': value_sum, 'mean': value_sum / total if total else None, 'buckets': buckets}
@@ -0,0 +1,55 @@
+import json
+import logging
+import random
+
+from django.conf import settings
+
+from . import instrumentation
+
+# 샘플링된 요청과 느린 요청의 구조화 로그 (JSON 한 줄)
+timing_logger = logging.getLogger('maintenance.timing')
+
+
+class TimingMiddleware:
+    """요청마다 단계별 소요 시간을 모아 Server-Timing 헤더와 단계별 히스토그램에 기록하는 미들웨어입니다.
+
+    INSTRUMENTATION_PAYLOAD_SAMPLE_RATE 비율의 요청은 입력/결과 페이로드까지 로그로 남기고,
+    INSTRUMENTATION_SLOW_MS보다 오래 걸린 요청은 샘플링과 무관하게 단계별 시간을 경고로 남깁니다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'INSTRUMENTATION_ENABLED', True)
+        self.server_timing = getattr(settings, 'INSTRUMENTATION_SERVER_TIMING', True)
+        self.sample_rate = getattr(settings, 'INSTRUMENTATION_PAYLOAD_SAMPLE_RATE', 0.0)
+        self.slow_ms = getattr(settings, 'INSTRUMENTATION_SLOW_MS', 500.0)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        timings, token = instrumentation.begin(sampled)
+        try:
+            response = self.get_response(request)
+        finally:
+            instrumentation.end(token)
+
+        total = timings.total()
+        instrumentation.stage_stats.observe(timings.durations, total)
+        if self.server_timing:
+            response['Server-Timing'] = timings.server_timing(total)
+
+        slow = total * 1000 >= self.slow_ms
+        if sampled or slow:
+            level = logging.WARNING if slow else logging.INFO
+            if timing_logger.isEnabledFor(level):
+                timing_logger.log(level, json.dumps({
+                    'method': request.method,
+                    'path': request.path,
+                    'status': response.status_code,
+                    'total_ms': round(total * 1000, 3),
+                    'stages_ms': {name: round(seconds * 1000, 3) for name, seconds in timings.durations.items()},
+                    'payload': timings.payload
+                }, ensure_ascii=False, default=str))
+        return response
@@ -0,0 +1,80 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def fill_missing_created_at(apps, schema_editor):
+    """생성 시각 없이 저장된 기존 기록은 NOT NULL로 바꾸기 전에 마이그레이션 시각으로 채웁니다."""
+    SimulatorInput = apps.get_model('maintenance', 'SimulatorInput')
+    SimulatorInput.objects.filter(created_at__isnull=True).update(created_at=django.utils.timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maintenance', '0002_alter_simulatorinput_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PredictionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('machine_id', models.CharField(blank=True, default='', max_length=64)),
+                ('minute', models.DateTimeField()),
+                ('count', models.IntegerField(default=0)),
+                ('failures', models.IntegerField(default=0)),
+                ('hdf_count', models.IntegerField(default=0)),
+                ('pwf_count', models.IntegerField(default=0)),
+                ('osf_count', models.IntegerField(default=0)),
+                ('probability_count', models.IntegerField(default=0)),
+                ('probability_hdf_sum', models.FloatField(default=0.0)),
+                ('probability_pwf_sum', models.FloatField(default=0.0)),
+                ('probability_osf_sum', models.FloatField(default=0.0)),
+                ('failure_probability_max', models.FloatField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='simulatorinput',
+            name='machine_id',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='simulatoroutput',
+            name='probability_hdf',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='simulatoroutput',
+            name='probability_osf',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='simulatoroutput',
+            name='probability_pwf',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_missing_created_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='simulatorinput',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='simulatorinput',
+            index=models.Index(fields=['machine_id', 'created_at'], name='input_machine_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='simulatorinput',
+            index=models.Index(fields=['created_at'], name='input_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionrollup',
+            index=models.Index(fields=['minute'], name='rollup_minute_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='predictionrollup',
+            constraint=models.UniqueConstraint(fields=('machine_id', 'minute'), name='rollup_machine_minute_uniq'),
+        ),
+    ]
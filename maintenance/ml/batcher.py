@@ -0,0 +1,131 @@
+"""
+단일 행 예측 요청 마이크로 배칭
+동시에 들어온 /api/predict/ 요청들의 모델 예측을 모아 한 번의 predict_batch 호출로 처리합니다.
+요청 스레드는 Future를 기다리며, ASGI 서버에서도 Django 뷰는 스레드에서 실행되므로 같은 큐에서 묶입니다.
+스트리밍/WebSocket 경로(streaming.py, live.py)는 이미 여러 행을 모아 score_rows로 한 번에 예측하므로
+이 배처를 거치지 않습니다.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from ..metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """단일 행 예측 요청을 최대 max_batch_rows 행 또는 max_wait_ms 밀리초 동안 모아 한 번에 예측하는 클래스입니다.
+
+    첫 요청이 큐에 들어온 시점부터 max_wait_ms가 지나거나 행 수가 찼을 때 배치를 보냅니다.
+    배치 안에서 예측기(모델 버전)가 다르면 예측기별로 나눠 호출하므로, 모델 교체 중에도
+    각 요청은 자신이 잡은 버전으로 예측됩니다. 캐시와 격자 조회는 요청 쪽에서 먼저 처리되고
+    모델 예측이 필요한 요청만 여기로 들어옵니다.
+    """
+
+    # 배치 크기 / 큐 대기 시간(ms) 히스토그램 버킷 상한
+    BATCH_SIZE_BOUNDS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+    QUEUE_WAIT_BOUNDS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100)
+
+    def __init__(self, max_batch_rows=64, max_wait_ms=2.0):
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+
+        self.batch_size = Histogram(self.BATCH_SIZE_BOUNDS)
+        self.queue_wait_ms = Histogram(self.QUEUE_WAIT_BOUNDS)
+        self.batches = 0
+        self.requests = 0
+
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._dispatcher = None
+        self._dispatcher_pid = None
+
+    def submit(self, predictor, input_data):
+        """요청을 큐에 넣고 결과(predict_fast와 같은 형식의 dict)를 받을 Future를 반환합니다."""
+        self._ensure_dispatcher()
+        future = Future()
+        self._queue.put((predictor, input_data, future, time.monotonic()))
+        return future
+
+    def predict(self, predictor, input_data):
+        """요청 스레드에서 배치 결과를 기다립니다."""
+        return self.submit(predictor, input_data).result()
+
+    def _ensure_dispatcher(self):
+        """디스패처 스레드를 시작합니다. fork 된 자식 프로세스에서는 새로 시작합니다."""
+        pid = os.getpid()
+        if self._dispatcher is not None and self._dispatcher_pid == pid:
+            return
+        with self._lock:
+            if self._dispatcher is not None and self._dispatcher_pid == pid:
+                return
+            if self._dispatcher_pid != pid:
+                # 부모의 큐에 남아 있던 요청은 부모 스레드가 기다리므로 자식에서는 새 큐를 씁니다
+                self._queue = queue.SimpleQueue()
+            self._dispatcher = threading.Thread(target=self._run, name='predict-batcher', daemon=True)
+            self._dispatcher_pid = pid
+            self._dispatcher.start()
+
+    def _collect(self):
+        """첫 요청을 기다린 뒤, 행 수가 차거나 대기 시간이 끝날 때까지 요청을 모읍니다."""
+        batch = [self._queue.get()]
+        deadline = batch[0][3] + self.max_wait
+        while len(batch) < self.max_batch_rows:
+            timeout = deadline - time.monotonic()
+            try:
+                # 대기 시간이 지났어도 이미 큐에 들어와 있는 요청은 함께 보냅니다
+                batch.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                self._dispatch(batch)
+            except Exception as e:
+                logger.error("배치 예측 실패: %s", str(e))
+                for _, _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _dispatch(self, batch):
+        """예측기별로 묶어 predict_batch를 호출하고 결과를 각 Future에 돌려줍니다."""
+        started = time.monotonic()
+        groups = {}
+        for item in batch:
+            groups.setdefault(id(item[0]), []).append(item)
+            self.queue_wait_ms.observe((started - item[3]) * 1000)
+
+        for items in groups.values():
+            predictor = items[0][0]
+            self.batch_size.observe(len(items))
+            try:
+                results = predictor.predict_batch([item[1] for item in items], exact=True)
+            except Exception as e:
+                for _, _, future, _ in items:
+                    future.set_exception(e)
+                continue
+            for (_, _, future, _), result in zip(items, results):
+                result.pop('index', None)
+                future.set_result(result)
+
+        with self._lock:
+            self.batches += len(groups)
+            self.requests += len(batch)
+
+    def stats(self):
+        """배치 크기와 큐 대기 시간 분포를 반환합니다 (max_batch_rows / max_wait_ms 조정용)."""
+        return {
+            'max_batch_rows': self.max_batch_rows,
+            'max_wait_ms': self.max_wait * 1000,
+            'requests': self.requests,
+            'batches': self.batches,
+            'batch_size': self.batch_size.snapshot(),
+            'queue_wait_ms': self.queue_wait_ms.snapshot()
+        }
@@ -0,0 +1,101 @@
+"""
+예측 결과 LRU 캐시
+시뮬레이터 입력 공간은 작고 범위가 정해져 있어서 같은 설정이 반복해서 예측됩니다.
+입력값을 정규화(양자화)한 튜플을 키로 결과를 보관하고, 모델이 바뀌면 자동으로 비웁니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """크기와 TTL이 제한된 스레드 안전 LRU 예측 캐시입니다.
+
+    키는 (type, 공기 온도, 공정 온도, 회전 속도, 토크, 공구 마모)를 소수점 decimals 자리로
+    반올림한 튜플이며, 예측도 이 정규화된 값으로 수행하므로 같은 키는 항상 같은 결과를 가집니다.
+    version(모델/스케일러 파일 상태)이 바뀌면 저장된 항목을 모두 버립니다.
+    """
+
+    # 키를 구성하는 predictor 입력 필드 순서
+    FIELDS = ('Air_Temperature', 'Process_Temperature', 'Rotational_Speed', 'Torque', 'Tool_Wear')
+
+    def __init__(self, max_size=4096, ttl=300.0, decimals=2):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.decimals = decimals
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def make_key(self, input_data):
+        """predictor 입력을 정규화된 캐시 키 튜플로 변환합니다."""
+        return (input_data['type'],) + tuple(
+            round(float(input_data[field]), self.decimals) for field in self.FIELDS
+        )
+
+    def canonical_input(self, key):
+        """캐시 키를 다시 predictor 입력 형식으로 되돌립니다."""
+        return dict(zip(('type',) + self.FIELDS, key))
+
+    def get(self, key, version):
+        """저장된 결과를 반환하고, 없거나 만료되었으면 None을 반환합니다."""
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, version, value):
+        """결과를 저장하고, 크기를 넘으면 가장 오래 사용하지 않은 항목부터 버립니다."""
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """저장된 항목을 모두 버립니다 (카운터는 유지합니다)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """캐시 크기 조정에 사용할 카운터들을 반환합니다."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
+
+    def _check_version(self, version):
+        """모델 버전이 바뀌었으면 캐시를 비웁니다. 호출 측에서 lock을 잡고 있어야 합니다."""
+        if version != self._version:
+            if self._version is not None:
+                self._entries.clear()
+                self.invalidations += 1
+            self._version = version
@@ -0,0 +1,175 @@
+"""
+특성 공학 파이프라인
+원시 측정값(제품 유형, 공기/공정 온도, 회전 속도, 토크, 공구 마모)을 모델 입력 특성으로 바꾸는
+규칙을 한 곳에 모았습니다. 단일 예측, 배치 예측, 오프라인 일괄 예측(score_file), 확률 격자 생성이
+모두 이 모듈을 사용하므로 경로마다 계산식이나 검증 규칙이 달라지지 않습니다.
+
+배열 함수는 길이에 상관없이 NumPy 열 배열로 동작하며, 검증은 행별 오류 메시지를 모아서 반환하고
+첫 번째 잘못된 행에서 멈추지 않습니다. 스케일링은 스케일러 파일을 감시하는 MillingMachinePredictor가 담당합니다.
+"""
+import math
+
+import numpy as np
+
+# 제품 유형 라벨 인코딩
+TYPE_ENCODING = {'L': 0, 'M': 1, 'H': 2}
+
+# predictor 입력에서 읽는 원시 측정값 필드 순서 (원시값 행렬의 열 순서)
+RAW_FIELDS = ['Air_Temperature', 'Process_Temperature', 'Rotational_Speed', 'Torque', 'Tool_Wear']
+
+# 모델 입력 컬럼 순서 (학습 데이터셋의 컬럼 이름)
+MODEL_FEATURES = ['Type_encoded', 'Rotational speed', 'Tool wear', 'Temperature difference', 'Power', 'Wear degree']
+
+# 스케일러를 적용하는 컬럼 (Type_encoded를 제외한 나머지)
+SCALED_FEATURES = MODEL_FEATURES[1:]
+
+# 모델 컬럼별로 계산에 쓰인 원시 입력 (API 필드 이름). 설명(explain)에서 파생 특성의 기여도를 원시 입력으로 되돌릴 때 사용합니다
+FEATURE_SOURCES = {
+    'Type_encoded': ('type',),
+    'Rotational speed': ('rotational_speed',),
+    'Tool wear': ('tool_wear',),
+    'Temperature difference': ('air_temperature', 'process_temperature'),
+    'Power': ('rotational_speed', 'torque'),
+    'Wear degree': ('tool_wear', 'torque'),
+}
+
+# 온도차 제약조건 (K)
+TEMP_DIFF_MIN = 7.6
+TEMP_DIFF_MAX = 12.1
+
+# 검증 오류 메시지 (모든 경로가 같은 문구로 응답합니다)
+NOT_FINITE_MESSAGE = "입력값은 유한한 숫자여야 합니다"
+TEMP_ORDER_MESSAGE = "공정 온도는 반드시 공기 온도보다 높아야 합니다"
+TEMP_RANGE_MESSAGE = f"온도차는 {TEMP_DIFF_MIN}K에서 {TEMP_DIFF_MAX}K 사이여야 합니다"
+
+
+def unknown_type_message(value):
+    return f"알 수 없는 제품 유형입니다: {value}"
+
+
+def calculate_power(speed, torque):
+    """회전 속도와 토크로부터 전력을 계산합니다 (스칼라/배열 모두 가능).
+    전력(W) = 2π × 회전속도(rpm) × 토크(Nm) /60"""
+    return 2 * np.pi * speed * torque / 60
+
+
+def calculate_wear_degree(tool_wear, torque):
+    """공구 마모도와 토크로부터 마모 정도(Wear degree)를 계산합니다."""
+    return tool_wear * torque
+
+
+def check_row(type_value, air_temp, process_temp, *values):
+    """단일 입력을 배치 검증(validate)과 같은 순서와 메시지로 검증합니다.
+
+    잘못된 입력이면 ValueError를 발생시키고, 정상이면 (제품 유형 코드, 온도차)를 반환합니다.
+    """
+    type_code = TYPE_ENCODING.get(type_value)
+    if type_code is None:
+        raise ValueError(unknown_type_message(type_value))
+    if not all(map(math.isfinite, (air_temp, process_temp) + values)):
+        raise ValueError(NOT_FINITE_MESSAGE)
+    temp_diff = process_temp - air_temp
+    if temp_diff <= 0:
+        raise ValueError(TEMP_ORDER_MESSAGE)
+    if not (TEMP_DIFF_MIN <= temp_diff <= TEMP_DIFF_MAX):
+        raise ValueError(TEMP_RANGE_MESSAGE)
+    return type_code, temp_diff
+
+
+def fill_row(out, type_code, rotational_speed, torque, tool_wear, temp_diff):
+    """모델 컬럼 순서의 (스케일링 전) 특성 한 행을 out 버퍼에 씁니다. derive의 단일 행 버전입니다."""
+    out[0] = type_code
+    out[1] = rotational_speed
+    out[2] = tool_wear
+    out[3] = temp_diff
+    out[4] = calculate_power(rotational_speed, torque)
+    out[5] = calculate_wear_degree(tool_wear, torque)
+    return out
+
+
+def encode_types(values, errors):
+    """제품 유형 값 배열을 코드(float) 배열로 바꿉니다. 알 수 없는 값은 NaN이고 errors에 메시지를 추가합니다."""
+    codes = np.array([TYPE_ENCODING.get(value, np.nan) for value in values], dtype=np.float64)
+    for i in np.flatnonzero(np.isnan(codes)).tolist():
+        errors.setdefault(i, unknown_type_message(values[i]))
+    return codes
+
+
+def parse_records(records):
+    """predictor 입력(dict) 목록을 (제품 유형 코드 배열, 원시값 행렬, {행: 오류})로 변환합니다.
+
+    필드 파싱만 행마다 수행하며, 파싱에 실패한 행은 원시값이 NaN으로 남고 오류가 기록됩니다.
+    """
+    n_rows = len(records)
+    raw = np.full((n_rows, len(RAW_FIELDS)), np.nan, dtype=np.float64)
+    type_encoded = np.zeros(n_rows, dtype=np.float64)
+    errors = {}
+    for i, record in enumerate(records):
+        try:
+            type_encoded[i] = TYPE_ENCODING[record['type']]
+        except KeyError:
+            errors[i] = unknown_type_message(record.get('type'))
+            continue
+        except (TypeError, AttributeError):
+            errors[i] = "입력 행은 객체 형식이어야 합니다"
+            continue
+        try:
+            raw[i] = [float(record[field]) for field in RAW_FIELDS]
+        except KeyError as e:
+            errors[i] = f"필수 필드 누락: {e.args[0]}"
+        except (TypeError, ValueError) as e:
+            errors[i] = f"데이터 형식 오류: {str(e)}"
+    return type_encoded, raw, errors
+
+
+def validate(raw, errors):
+    """원시값 행렬에 검증 규칙을 마스크로 적용하고 유효한 행 인덱스를 반환합니다.
+
+    실패한 행은 errors에 메시지를 추가합니다 (이미 오류가 있는 행은 첫 오류를 유지합니다).
+    """
+    air_temp, process_temp = raw[:, 0], raw[:, 1]
+    temp_diff = process_temp - air_temp
+    invalid = np.zeros(len(raw), dtype=bool)
+    if errors:
+        invalid[list(errors)] = True
+
+    # 앞의 규칙에 이미 걸린 행은 다음 규칙에서 제외해 행마다 첫 오류 하나만 남깁니다
+    with np.errstate(invalid='ignore'):
+        checks = [
+            (~np.isfinite(raw).all(axis=1), NOT_FINITE_MESSAGE),
+            (temp_diff <= 0, TEMP_ORDER_MESSAGE),
+            ((temp_diff < TEMP_DIFF_MIN) | (temp_diff > TEMP_DIFF_MAX), TEMP_RANGE_MESSAGE),
+        ]
+    for mask, message in checks:
+        failed = mask & ~invalid
+        if failed.any():
+            errors.update(dict.fromkeys(np.flatnonzero(failed).tolist(), message))
+            invalid |= failed
+    return np.flatnonzero(~invalid)
+
+
+def derive_columns(type_encoded, rotational_speed, torque, tool_wear, temp_diff):
+    """열 배열들로 모델 컬럼 순서의 (스케일링 전) 특성 행렬을 만듭니다."""
+    features = np.empty((len(type_encoded), len(MODEL_FEATURES)), dtype=np.float64)
+    features[:, 0] = type_encoded
+    features[:, 1] = rotational_speed
+    features[:, 2] = tool_wear
+    features[:, 3] = temp_diff
+    features[:, 4] = calculate_power(rotational_speed, torque)
+    features[:, 5] = calculate_wear_degree(tool_wear, torque)
+    return features
+
+
+def derive(type_encoded, raw):
+    """제품 유형 코드 배열과 원시값 행렬로 모델 컬럼 순서의 (스케일링 전) 특성 행렬을 만듭니다."""
+    air_temp, process_temp, rotational_speed, torque, tool_wear = raw.T
+    return derive_columns(type_encoded, rotational_speed, torque, tool_wear, process_temp - air_temp)
+
+
+def build(type_encoded, raw, errors):
+    """검증과 특성 계산을 한 번에 수행합니다.
+
+    반환값: (유효한 행의 스케일링 전 특성 행렬, 유효한 행 인덱스)
+    """
+    valid_idx = validate(raw, errors)
+    return derive(type_encoded[valid_idx], raw[valid_idx]), valid_idx
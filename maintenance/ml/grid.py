@@ -0,0 +1,137 @@
+"""
+고장 확률 사전 계산 격자
+MLConfig.FEATURE_CONFIG 범위 안의 격자점(type × 온도차 × 회전 속도 × 토크 × 공구 마모)에서
+모델 확률을 미리 계산해 메모리 맵 .npy 파일로 저장하고, 조회 시 보간해서 반환합니다.
+"""
+import bisect
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+
+
+def model_digest(model_path, scaler_path):
+    """모델과 스케일러 파일 내용의 해시를 반환합니다 (격자가 현재 모델로 만들어졌는지 확인용)."""
+    digest = hashlib.sha256()
+    for path in (model_path, scaler_path):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class PredictionGrid:
+    """사전 계산된 확률 격자를 조회하는 클래스입니다.
+
+    probabilities 배열의 형태는 (type, 온도차, 회전 속도, 토크, 공구 마모, 클래스)이며,
+    type 축은 라벨 인코딩 값(L=0, M=1, H=2) 그대로 인덱스로 사용합니다.
+    연속 축은 다선형(multilinear) 보간 또는 최근접 격자점으로 조회합니다.
+    """
+
+    # 연속형 격자 축 순서
+    AXES = ('temp_difference', 'rotational_speed', 'torque', 'tool_wear')
+
+    def __init__(self, probabilities, axes, classes, digest=None):
+        self.probabilities = probabilities
+        self.axes = [np.asarray(axis, dtype=np.float64) for axis in axes]
+        self._axis_lists = [axis.tolist() for axis in self.axes]
+        self.classes = list(classes)
+        self.digest = digest
+
+    @staticmethod
+    def metadata_path(path):
+        """격자 배열 파일과 함께 저장되는 축 정보 JSON 경로를 반환합니다."""
+        return Path(path).with_suffix('.json')
+
+    @classmethod
+    def load(cls, path):
+        """격자 파일을 메모리 맵으로 엽니다 (실제 데이터는 조회한 부분만 읽힙니다)."""
+        with open(cls.metadata_path(path), 'r') as f:
+            metadata = json.load(f)
+        probabilities = np.load(path, mmap_mode='r')
+        axes = [metadata['axes'][name] for name in cls.AXES]
+        expected = (probabilities.shape[0],) + tuple(len(axis) for axis in axes) + (len(metadata['classes']),)
+        if probabilities.shape != expected:
+            raise ValueError(f"격자 파일 형태가 축 정보와 다릅니다: {probabilities.shape} != {expected}")
+        return cls(probabilities, axes, metadata['classes'], metadata.get('model_digest'))
+
+    @classmethod
+    def save_metadata(cls, path, axes, classes, digest):
+        """축 정보와 모델 해시를 JSON으로 저장합니다."""
+        metadata = {
+            'axes': {name: np.asarray(axis).tolist() for name, axis in zip(cls.AXES, axes)},
+            'classes': list(classes),
+            'model_digest': digest
+        }
+        with open(cls.metadata_path(path), 'w') as f:
+            json.dump(metadata, f)
+
+    def lookup_one(self, type_encoded, values, method='linear'):
+        """단일 입력의 확률 목록을 조회합니다. 격자 범위 밖이면 None을 반환합니다.
+
+        한 행 조회는 배열 연산 준비 비용이 더 크므로 인덱스 계산은 파이썬으로 하고,
+        주변 2×2×2×2 블록만 잘라서 가중합합니다.
+        """
+        if not 0 <= type_encoded < self.probabilities.shape[0]:
+            return None
+
+        lower, weight = [], []
+        for axis, value in zip(self._axis_lists, values):
+            if not axis[0] <= value <= axis[-1]:
+                return None
+            idx = min(bisect.bisect_right(axis, value) - 1, len(axis) - 2)
+            lower.append(idx)
+            weight.append((value - axis[idx]) / (axis[idx + 1] - axis[idx]))
+
+        if method == 'nearest':
+            index = tuple(idx + (t >= 0.5) for idx, t in zip(lower, weight))
+            return self.probabilities[(type_encoded,) + index].tolist()
+        if method != 'linear':
+            raise ValueError(f"알 수 없는 보간 방식입니다: {method}")
+
+        block = self.probabilities[(type_encoded,) + tuple(slice(idx, idx + 2) for idx in lower)]
+        corner_weight = np.ones((), dtype=np.float64)
+        for t in weight:
+            corner_weight = np.multiply.outer(corner_weight, (1.0 - t, t))
+        return np.tensordot(corner_weight, block, axes=len(lower)).tolist()
+
+    def lookup(self, type_encoded, values, method='linear'):
+        """여러 입력의 확률을 격자에서 조회합니다.
+
+        type_encoded: (n,) 라벨 인코딩된 제품 유형
+        values: (n, 4) AXES 순서의 원시값 (온도차, 회전 속도, 토크, 공구 마모)
+        반환값: ((n, 클래스 수) 확률, (n,) 격자 범위 안에 있는지 여부)
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        type_idx = np.asarray(type_encoded, dtype=np.intp)
+        n_rows = values.shape[0]
+
+        inside = (type_idx >= 0) & (type_idx < self.probabilities.shape[0])
+        lower, weight = [], []
+        for axis, column in zip(self.axes, values.T):
+            inside &= (column >= axis[0]) & (column <= axis[-1])
+            idx = np.clip(np.searchsorted(axis, column, side='right') - 1, 0, len(axis) - 2)
+            t = (column - axis[idx]) / (axis[idx + 1] - axis[idx])
+            lower.append(idx)
+            weight.append(np.clip(t, 0.0, 1.0))
+
+        type_idx = np.where(inside, type_idx, 0)
+        probabilities = np.zeros((n_rows, self.probabilities.shape[-1]), dtype=np.float64)
+
+        if method == 'nearest':
+            index = tuple(idx + (t >= 0.5) for idx, t in zip(lower, weight))
+            probabilities[:] = self.probabilities[(type_idx,) + index]
+        elif method == 'linear':
+            # 4차원 셀의 16개 꼭짓점을 가중합합니다
+            for corner in range(1 << len(self.AXES)):
+                index = [type_idx]
+                corner_weight = np.ones(n_rows, dtype=np.float64)
+                for bit, (idx, t) in enumerate(zip(lower, weight)):
+                    upper = (corner >> bit) & 1
+                    index.append(idx + upper)
+                    corner_weight *= t if upper else 1.0 - t
+                probabilities += corner_weight[:, None] * self.probabilities[tuple(index)]
+        else:
+            raise ValueError(f"알 수 없는 보간 방식입니다: {method}")
+
+        return probabilities, inside
@@ -0,0 +1,164 @@
+"""
+버전 관리되는 모델 보관소 (재시작 없는 모델 교체)
+모델/스케일러 파일을 감시하거나 관리자 요청을 받아 새 버전을 백그라운드에서 로드하고,
+스모크 예측으로 검증한 뒤 참조 하나만 바꿔 끼웁니다. 진행 중인 요청은 시작할 때 잡은
+이전 버전으로 끝까지 처리됩니다. 로드에 실패하면 지수 백오프로 다시 시도합니다.
+"""
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ModelVersion:
+    """서비스 중인 모델 한 버전입니다."""
+    number: int
+    predictor: object
+    registry: object
+    files: tuple        # 로드 시점의 감시 파일 상태 ((경로, mtime_ns, 크기), ...)
+    loaded_at: float    # time.time()
+
+
+def files_state(paths):
+    """감시 대상 파일들의 (경로, mtime_ns, 크기) 튜플을 반환합니다. 없는 파일은 (경로, None, None)입니다."""
+    state = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            state.append((str(path), stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            state.append((str(path), None, None))
+    return tuple(state)
+
+
+def smoke_test(predictor, sample):
+    """새 예측기로 샘플 입력을 예측해 정상적인 확률이 나오는지 확인합니다 (캐시/격자 미사용)."""
+    result = predictor.predict_batch([sample], exact=True)[0]
+    if result['status'] != 'success':
+        raise ValueError(f"스모크 예측 실패: {result.get('message')}")
+    probabilities = list(result['probabilities'].values())
+    if not all(math.isfinite(p) and 0.0 <= p <= 1.0 for p in probabilities):
+        raise ValueError(f"스모크 예측 확률이 올바르지 않습니다: {probabilities}")
+    return result
+
+
+class ModelHolder:
+    """현재 모델 버전을 보관하고, 파일 변경/관리자 요청 시 새 버전으로 교체하는 클래스입니다.
+
+    loader()는 (predictor, registry)를 반환해야 하며, 교체 전에 smoke_test로 검증합니다.
+    요청 처리 코드는 current를 한 번 읽어 지역 변수로 사용해야 같은 요청 안에서 버전이 섞이지 않습니다.
+    """
+
+    def __init__(self, loader, watched_paths, sample, poll_interval=5.0, retry_base=1.0, retry_max=300.0):
+        self.loader = loader
+        self.watched_paths = list(watched_paths)
+        self.sample = sample
+        self.poll_interval = poll_interval
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+
+        self.current = None
+        self.last_error = None
+        self.failures = 0
+        self._load_lock = threading.RLock()
+        self._watcher = None
+        self._watcher_pid = None
+        self._watcher_lock = threading.Lock()  # 로드 중에도 요청이 기다리지 않도록 _load_lock과 따로 둡니다
+        self._next_attempt = 0.0
+
+    def load(self, reason='요청'):
+        """새 버전을 로드/검증하고 성공하면 교체합니다. 이미 로드 중이면 그 작업이 끝날 때까지 기다립니다."""
+        with self._load_lock:
+            files = files_state(self.watched_paths)
+            start = time.perf_counter()
+            try:
+                predictor, registry = self.loader()
+                smoke_test(predictor, self.sample)
+            except Exception as e:
+                self.failures += 1
+                # 네이티브 라이브러리 오류는 스택 트레이스가 붙어 오므로 첫 줄만 남깁니다
+                self.last_error = (str(e).strip().splitlines() or [type(e).__name__])[0]
+                logger.error("모델 로드 실패 (%s, %d회 연속): %s", reason, self.failures, self.last_error)
+                self._next_attempt = time.monotonic() + self.retry_delay()
+                return False
+
+            number = self.current.number + 1 if self.current is not None else 1
+            # 참조 하나만 바꾸므로 이전 버전을 잡고 있는 요청은 그대로 끝까지 처리됩니다
+            self.current = ModelVersion(number, predictor, registry, files, time.time())
+            self.failures = 0
+            self.last_error = None
+            logger.info("모델 버전 %d 적용 (%s, %.0fms)", number, reason, (time.perf_counter() - start) * 1000)
+            return True
+
+    def ensure_loaded(self, reason='첫 사용'):
+        """아직 로드된 버전이 없으면 지금 로드하고 현재 버전을 반환합니다.
+
+        직전 로드가 실패했다면 백오프 시간이 지나기 전까지는 다시 시도하지 않고 None을 반환하므로,
+        모델이 깨진 동안 요청마다 로드를 반복하지 않습니다.
+        """
+        current = self.current
+        if current is not None:
+            return current
+        if self.failures and time.monotonic() < self._next_attempt:
+            return None
+        with self._load_lock:
+            # 다른 스레드가 먼저 로드했으면 그 결과를 사용합니다
+            if self.current is None:
+                self.load(reason)
+        return self.current
+
+    def reload_async(self, reason='관리자 요청'):
+        """백그라운드 스레드에서 다시 로드합니다. 완료를 기다릴 수 있도록 스레드를 반환합니다."""
+        thread = threading.Thread(target=self.load, args=(reason,), name='model-reload', daemon=True)
+        thread.start()
+        return thread
+
+    def needs_reload(self):
+        """로드된 버전이 없거나 감시 파일이 바뀌었으면 True를 반환합니다."""
+        return self.current is None or files_state(self.watched_paths) != self.current.files
+
+    def retry_delay(self):
+        """연속 실패 횟수에 따른 다음 재시도 대기 시간(초)을 반환합니다."""
+        return min(self.retry_base * (2 ** max(self.failures - 1, 0)), self.retry_max)
+
+    def start_watcher(self):
+        """파일 감시 스레드를 시작합니다. fork 된 자식 프로세스에서 호출하면 새로 시작합니다."""
+        pid = os.getpid()
+        if self._watcher is not None and self._watcher_pid == pid and self._watcher.is_alive():
+            return
+        # 동시에 들어온 첫 요청들이 각자 감시 스레드를 시작하지 않도록 잠근 뒤 다시 확인합니다
+        with self._watcher_lock:
+            if self._watcher is not None and self._watcher_pid == pid and self._watcher.is_alive():
+                return
+            self._watcher_pid = pid
+            self._watcher = threading.Thread(target=self._watch, name='model-watcher', daemon=True)
+            self._watcher.start()
+
+    def _watch(self):
+        while True:
+            delay = self.retry_delay() if self.failures else self.poll_interval
+            time.sleep(delay)
+            try:
+                if self.needs_reload():
+                    self.load('파일 변경' if self.current is not None else '재시도')
+            except Exception as e:
+                logger.error("모델 감시 중 오류: %s", str(e))
+
+    def status(self):
+        """현재 버전과 마지막 로드 상태를 반환합니다."""
+        current = self.current
+        return {
+            'version': current.number if current else None,
+            'loaded_at': current.loaded_at if current else None,
+            'files': [{'path': os.path.basename(path), 'mtime_ns': mtime, 'size': size}
+                      for path, mtime, size in current.files] if current else [],
+            'stale': self.needs_reload(),
+            'failures': self.failures,
+            'last_error': self.last_error,
+            'next_retry_seconds': self.retry_delay() if self.failures else None
+        }
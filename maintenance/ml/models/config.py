@@ -1,3 +1,6 @@
+from .. import features
+
+
 class MLConfig:
     # Feature configurations
     FEATURE_CONFIG = {
@@ -71,29 +74,20 @@ class MLConfig:
     # Feature engineering configurations
     @staticmethod
     def calculate_derived_features(input_data):
-        """Calculate derived features from raw input data"""
-        type_encoded_map = {'L': 0, 'M': 1, 'H': 2}
-        type_encoded = type_encoded_map.get(input_data.get('type', 'L'), 0)
-        
+        """Calculate derived features from raw input data (maintenance.ml.features 규칙 사용)"""
         rotational_speed = float(input_data.get('rotational_speed'))
         tool_wear = float(input_data.get('tool_wear'))
         torque = float(input_data.get('torque'))
-        process_temp = float(input_data.get('process_temperature'))
-        air_temp = float(input_data.get('air_temperature'))
-        
-        # Calculate derived features
-        temp_difference = process_temp - air_temp
-        power = rotational_speed * torque
-        wear_degree = tool_wear * torque
-        
-        return {
-            'type_encoded': type_encoded,
-            'rotational_speed': rotational_speed,
-            'tool_wear': tool_wear,
-            'temp_difference': temp_difference,
-            'power': power,
-            'wear_degree': wear_degree
-        }
+
+        # 예측기와 같은 검증/계산식을 사용합니다 (전력은 2π·rpm·토크/60, 알 수 없는 type은 오류)
+        type_encoded, temp_difference = features.check_row(
+            input_data.get('type', 'L'), float(input_data.get('air_temperature')),
+            float(input_data.get('process_temperature')), rotational_speed, torque, tool_wear
+        )
+        values = features.fill_row(
+            [0.0] * len(features.MODEL_FEATURES), type_encoded, rotational_speed, torque, tool_wear, temp_difference
+        )
+        return dict(zip(MLConfig.FEATURE_NAMES, values))
 
     # Feature names for the model
     FEATURE_NAMES = [
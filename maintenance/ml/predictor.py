@@ -1,29 +1,81 @@
 import json
+import logging
+import os
+import threading
 import numpy as np
-import pandas as pd
+from .. import instrumentation
+from . import features as feature_pipeline
+from .explain import ContributionExplainer
 from .models.config import MLConfig
-from sklearn.preprocessing import StandardScaler
-from xgboost import XGBClassifier
+from .tree_engine import TreeEnsemble
+
+logger = logging.getLogger(__name__)
 
 class MillingMachinePredictor:
     """밀링 머신의 고장을 예측하는 클래스입니다.
     이 클래스는 실시간으로 측정되는 작동 파라미터를 기반으로 잠재적인 고장을 예측합니다."""
 
-    def __init__(self, model_path, scaler_path):
-        """예측기를 초기화합니다. 모델 파일을 로드하고 필요한 상수들을 정의합니다."""
-        self.model = XGBClassifier()
-        self.model.load_model(model_path)
+    # 특성 계산 규칙은 features 모듈에 있으며, 기존 코드와의 호환을 위해 상수를 그대로 노출합니다
+    RAW_FIELDS = feature_pipeline.RAW_FIELDS
+    TYPE_ENCODING = feature_pipeline.TYPE_ENCODING
+    SCALED_FEATURES = feature_pipeline.SCALED_FEATURES
+    TEMP_DIFF_MIN = feature_pipeline.TEMP_DIFF_MIN
+    TEMP_DIFF_MAX = feature_pipeline.TEMP_DIFF_MAX
+
+    def __init__(self, model_path, scaler_path, engine='xgboost', cache=None, grid=None, grid_method='linear',
+                 tree_cache_dir=None, pool=None, batcher=None, explain_exact_max_rows=64):
+        """예측기를 초기화합니다. 모델 파일을 로드하고 필요한 상수들을 정의합니다.
+
+        engine='numpy'이면 xgboost를 import하지 않고 TreeEnsemble로 같은 모델을 평가합니다.
+        cache(PredictionCache)를 주면 predict/predict_fast 결과를 입력값 기준으로 재사용합니다.
+        grid(PredictionGrid)를 주면 exact=False인 조회를 사전 계산된 격자에서 보간해 응답합니다.
+        tree_cache_dir를 주면 numpy 엔진의 트리 배열을 그 디렉터리에 저장해 두고 메모리 맵으로 열어
+        여러 워커 프로세스가 같은 페이지를 공유합니다.
+        pool(InferencePool)을 주면 predict_batch의 큰 배치를 워커 프로세스들에 나눠 예측합니다.
+        batcher(MicroBatcher)를 주면 predict_fast에서 모델 예측이 필요한 요청을 다른 동시 요청들과 모아 예측합니다.
+        explain_exact_max_rows보다 큰 배치의 특성 기여도 설명은 근사(approx_contribs)로 계산합니다.
+        """
+        self.engine = engine
+        self.model_path = model_path
+        # 캐시 무효화 기준이 되는 모델/스케일러 파일 상태는 파일을 읽기 전에 한 번만 기록합니다.
+        # 파일이 바뀌면 ModelHolder가 새 예측기를 만들어 검증한 뒤 교체하므로 이 값은 바뀌지 않습니다.
+        self.version = (os.stat(model_path).st_mtime_ns, os.stat(scaler_path).st_mtime_ns)
+        self.cache = cache
+        self.grid = grid
+        self.grid_method = grid_method
+        self.pool = pool
+        self.batcher = batcher
+        if engine == 'numpy':
+            if tree_cache_dir is not None:
+                self.model = TreeEnsemble.load_cached(model_path, tree_cache_dir)
+            else:
+                self.model = TreeEnsemble.from_json(model_path)
+            self.booster = None
+            self._score_rows = self.model.predict_proba
+        elif engine == 'xgboost':
+            from xgboost import XGBClassifier
+            self.model = XGBClassifier()
+            self.model.load_model(model_path)
+            self.booster = self.model.get_booster()
+            self._score_rows = self.booster.inplace_predict
+        else:
+            raise ValueError(f"알 수 없는 추론 엔진입니다: {engine}")
+        self.classes = self.model.classes_.tolist()
+        self.explainer = ContributionExplainer(model_path, booster=self.booster, exact_max_rows=explain_exact_max_rows)
         self.scaler_path = scaler_path
         self.config = MLConfig
-        
-        # 온도차 제약조건을 정의합니다
-        self.TEMP_DIFF_MIN = 7.6
-        self.TEMP_DIFF_MAX = 12.1
+
+        # 스케일러 파라미터는 로드할 때 한 번만 읽어 배열로 보관합니다.
+        # 스케일러 파일이 바뀌면 모델과 함께 새 버전으로 로드/검증/교체됩니다 (ModelHolder)
+        self._scaler_mean, self._scaler_scale = self.read_scaler(scaler_path)
+
+        # 단일 예측 fast path용 스레드별 재사용 버퍼
+        self._buffers = threading.local()
 
     def calculate_power(self, speed, torque):
         """회전 속도와 토크로부터 전력을 계산합니다.
         전력(W) = 2π × 회전속도(rpm) × 토크(Nm) /60"""
-        return 2 * np.pi * speed * torque / 60
+        return feature_pipeline.calculate_power(speed, torque)
 
     def failure_types(self, pred):
         """현재 상태가 어떤 고장 조건에 해당하는지 확인합니다.
@@ -41,6 +93,24 @@ class MillingMachinePredictor:
             return 'OSF'  # 공구 마모가 임계값을 초과하면 과변형 고장
         return 'none'  # 모든 값이 정상 범위 내에 있음
 
+    def format_result(self, pred, probabilities, temp_diff, power, tool_wear):
+        """예측 클래스와 확률 목록, 계산값을 API 응답 형식으로 만듭니다."""
+        return {
+            'status': 'success',
+            'prediction': self.failure_types(pred),
+            'probabilities': {
+                'none': probabilities[0],
+                'HDF': probabilities[2],
+                'PWF': probabilities[3],
+                'OSF': probabilities[4]
+            },
+            'calculated_values': {
+                'temp_difference': temp_diff,
+                'power': power,
+                'tool_wear': tool_wear
+            }
+        }
+
         # 스케일러 위치를 통해 JSON 파일로부터 스케일러 파라미터 로드합니다
     def load_scaler_params(self, scaler_path):
         with open(scaler_path, 'r') as f:
@@ -48,84 +118,230 @@ class MillingMachinePredictor:
         return scaler_params
 
         # 스케일러 파라미터 값을 받고 스케일러를 반환합니다
+        # 예측 경로는 scale_features()로 직접 계산하므로 scikit-learn은 이 메소드를 쓸 때만 import 합니다
     def restore_scaler(self, scaler_params):
+        from sklearn.preprocessing import StandardScaler
         scaler = StandardScaler()
         scaler.mean_ = np.array(scaler_params['mean'])
         scaler.scale_ = np.array(scaler_params['scale'])
         return scaler
 
-    def preprocess_input(self, input_data):
-        """입력 데이터를 전처리하여 모델이 예측할 수 있는 형태로 변환합니다."""
+    def read_scaler(self, scaler_path):
+        """스케일러 파일에서 평균/스케일 배열(float64)을 읽고 크기를 검증합니다."""
+        scaler_params = self.load_scaler_params(scaler_path)
+        mean = np.asarray(scaler_params['mean'], dtype=np.float64)
+        scale = np.asarray(scaler_params['scale'], dtype=np.float64)
+        expected = (len(self.SCALED_FEATURES),)
+        if mean.shape != expected or scale.shape != expected:
+            raise ValueError(
+                f"스케일러 파라미터 크기가 올바르지 않습니다: mean={mean.shape}, scale={scale.shape}"
+            )
+        return mean, scale
+
+    def scale_features(self, values):
+        """캐시된 평균/스케일로 (x - mean) / scale 을 벡터 연산으로 적용합니다."""
+        return (values - self._scaler_mean) / self._scaler_scale
+
+    def _row_buffers(self):
+        """현재 스레드의 재사용 버퍼(모델 입력 float32 1행, 스케일링용 float64)를 반환합니다."""
+        buffers = self._buffers
         try:
-            print("입력 데이터:", input_data)
+            return buffers.row, buffers.scratch
+        except AttributeError:
+            width = len(feature_pipeline.MODEL_FEATURES)
+            buffers.row = np.zeros((1, width), dtype=np.float32)
+            buffers.scratch = np.zeros(width, dtype=np.float64)
+            return buffers.row, buffers.scratch
 
-            # 기본 특성들을 추출하고 숫자로 변환합니다
-            air_temp = float(input_data['Air_Temperature'])
-            process_temp = float(input_data['Process_Temperature'])
+    def cache_version(self):
+        """캐시 무효화 기준이 되는 모델/스케일러 파일 상태(로드 시점)를 반환합니다."""
+        return self.version
+
+    def _cached(self, compute, input_data):
+        """캐시가 있으면 정규화된 입력으로 조회하고, 없으면 계산해서 저장합니다."""
+        if self.cache is None:
+            return compute(input_data)
+        try:
+            key = self.cache.make_key(input_data)
+        except (KeyError, TypeError, ValueError):
+            # 키를 만들 수 없는 입력은 예측 함수가 오류 응답을 만들도록 그대로 넘깁니다
+            return compute(input_data)
+
+        version = self.cache_version()
+        result = self.cache.get(key, version)
+        if result is None:
+            result = compute(self.cache.canonical_input(key))
+            if result['status'] == 'success':
+                self.cache.put(key, version, result)
+        return result
+
+    def predict_fast(self, input_data, exact=True, explain=False):
+        """pandas 없이 단일 입력을 예측합니다.
+
+        exact=False이고 격자가 설정되어 있으면 격자 보간 결과를 먼저 사용하고,
+        격자 밖이거나 정확한 값이 필요하면 (캐시를 거쳐) 모델로 예측합니다.
+        explain=True이면 결과에 특성 기여도 설명('explanation')을 추가합니다.
+        """
+        result = None
+        if not exact and self.grid is not None:
+            result = self._predict_from_grid(input_data)
+        if result is None:
+            result = self._cached(self._predict_row if self.batcher is None else self._predict_row_batched, input_data)
+        if explain and result['status'] == 'success':
+            # 캐시에 있는 결과 객체는 그대로 두고 설명을 붙인 새 dict를 반환합니다
+            result = {**result, 'explanation': self.explain(input_data)}
+        return result
+
+    def explain(self, input_data):
+        """단일 입력의 특성 기여도 설명을 반환합니다.
+
+        캐시가 있으면 예측 결과와 같은 정규화 키(뒤에 'explain'을 붙인 키)로 같은 캐시에 보관하므로
+        같은 입력이 반복되면 다시 계산하지 않고, 모델이 바뀌면 예측 결과와 함께 비워집니다.
+        """
+        if self.cache is None:
+            return self.explain_batch([input_data])[0]
+        try:
+            key = self.cache.make_key(input_data)
+        except (KeyError, TypeError, ValueError):
+            return self.explain_batch([input_data])[0]
+
+        version = self.cache_version()
+        explanation = self.cache.get(key + ('explain',), version)
+        if explanation is None:
+            explanation = self.explain_batch([self.cache.canonical_input(key)])[0]
+            if explanation is not None:
+                self.cache.put(key + ('explain',), version, explanation)
+        return explanation
+
+    def explain_batch(self, records):
+        """여러 입력의 특성 기여도 설명을 한 번의 pred_contribs 호출로 계산합니다 (검증에 실패한 행은 None)."""
+        features, valid_idx, _, _ = self.build_feature_matrix(records)
+        explanations = [None] * len(records)
+        if len(valid_idx):
+            with instrumentation.stage('explain'):
+                for i, explanation in zip(valid_idx.tolist(), self.explainer.explain(features)):
+                    explanations[i] = explanation
+        return explanations
+
+    def _predict_row_batched(self, input_data):
+        """단일 입력을 동시에 들어온 다른 요청들과 한 번의 predict_batch 호출로 예측합니다."""
+        # 배치 대기 시간을 포함한 모델 단계 시간으로 기록합니다
+        with instrumentation.stage('model'):
+            return self.batcher.predict(self, input_data)
+
+    def _predict_from_grid(self, input_data):
+        """확률 격자에서 단일 입력을 보간합니다. 격자로 답할 수 없는 입력이면 None을 반환합니다."""
+        # 검증 오류는 모델 경로가 같은 메시지로 응답하도록 넘깁니다
+        try:
             rotational_speed = float(input_data['Rotational_Speed'])
             torque = float(input_data['Torque'])
             tool_wear = float(input_data['Tool_Wear'])
+            type_encoded, temp_diff = feature_pipeline.check_row(
+                input_data['type'], float(input_data['Air_Temperature']), float(input_data['Process_Temperature']),
+                rotational_speed, torque, tool_wear
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
 
-            # 온도차를 계산하고 검증합니다
-            temp_diff = process_temp - air_temp
-            if temp_diff <= 0:
-                raise ValueError("공정 온도는 반드시 공기 온도보다 높아야 합니다")
-            if not (self.TEMP_DIFF_MIN <= temp_diff <= self.TEMP_DIFF_MAX):
-                raise ValueError(f"온도차는 {self.TEMP_DIFF_MIN}K에서 {self.TEMP_DIFF_MAX}K 사이여야 합니다")
-
-            # 파생 특성들을 계산합니다
-            power = self.calculate_power(rotational_speed, torque)
-            wear_degree = tool_wear * torque
-
-            # type을 라벨 인코딩합니다
-            if input_data['type'] == 'L':
-                Type_encoded = 0
-            elif input_data['type'] == 'M':
-                Type_encoded = 1
-            else:
-                Type_encoded = 2
+        probabilities = self.grid.lookup_one(
+            type_encoded, (temp_diff, rotational_speed, torque, tool_wear), self.grid_method
+        )
+        if probabilities is None:
+            return None
 
-            # 분석 데이터셋 생성
-            data = {
-                'Type_encoded': Type_encoded,
-                'Rotational speed': rotational_speed,
-                'Tool wear': tool_wear,
-                'Temperature difference': temp_diff,
-                'Power': power,
-                'Wear degree': wear_degree
-            }
-            df = pd.DataFrame([data])
+        pred = self.classes[max(range(len(probabilities)), key=probabilities.__getitem__)]
+        result = self.format_result(
+            pred, probabilities, temp_diff, self.calculate_power(rotational_speed, torque), tool_wear
+        )
+        result['source'] = 'grid'
+        return result
 
-            # 스케일링할 features 정의합니다
-            features = ['Rotational speed', 'Tool wear', 'Temperature difference', 'Power', 'Wear degree']
+    def _predict_row(self, input_data):
+        """pandas 없이 단일 입력을 예측하는 fast path 입니다.
 
-            # 스케일러 파라미터를 로드합니다
-            scaler_params = self.load_scaler_params(self.scaler_path)
+        모델 컬럼 순서(Type_encoded, Rotational speed, Tool wear, Temperature difference,
+        Power, Wear degree)로 재사용 버퍼를 채우고 Booster.inplace_predict
+        (numpy 엔진이면 TreeEnsemble.predict_proba)로 바로 예측합니다.
+        반환 형식은 predict()와 같습니다.
+        """
+        try:
+            with instrumentation.stage('preprocess'):
+                rotational_speed = float(input_data['Rotational_Speed'])
+                torque = float(input_data['Torque'])
+                tool_wear = float(input_data['Tool_Wear'])
+                type_encoded, temp_diff = feature_pipeline.check_row(
+                    input_data['type'], float(input_data['Air_Temperature']), float(input_data['Process_Temperature']),
+                    rotational_speed, torque, tool_wear
+                )
+
+                # 스케일링은 float64로 계산한 뒤 모델 입력 버퍼(float32)에 복사합니다
+                row, scratch = self._row_buffers()
+                feature_pipeline.fill_row(scratch, type_encoded, rotational_speed, torque, tool_wear, temp_diff)
+                power = float(scratch[4])
+                scaled = scratch[1:]
+                np.subtract(scaled, self._scaler_mean, out=scaled)
+                np.divide(scaled, self._scaler_scale, out=scaled)
+                row[0] = scratch
 
-            # 스케일러 복원합니다
-            scaler = self.restore_scaler(scaler_params)
+            with instrumentation.stage('model'):
+                probabilities = self._score_rows(row)[0].tolist()
+            pred = self.classes[max(range(len(probabilities)), key=probabilities.__getitem__)]
 
-            # 학습된 스케일링을 분석 데이터셋에 적용시킵니다
-            df[features] = scaler.transform(df[features])
+            return self.format_result(pred, probabilities, temp_diff, power, tool_wear)
 
-            print("전처리된 데이터:", df)
+        except Exception as e:
+            return {
+                'status': 'error',
+                'message': str(e)
+            }
+
+    def preprocess_input(self, input_data):
+        """입력 데이터를 전처리하여 모델이 예측할 수 있는 형태로 변환합니다."""
+        # pandas는 이 기존 경로에서만 사용하므로 처음 호출될 때 import 합니다
+        import pandas as pd
+        try:
+            # 기본 특성들을 추출하고 숫자로 변환합니다
+            rotational_speed = float(input_data['Rotational_Speed'])
+            torque = float(input_data['Torque'])
+            tool_wear = float(input_data['Tool_Wear'])
+
+            # 제품 유형과 온도차를 검증하고 파생 특성들을 계산합니다 (다른 경로와 같은 features 모듈 사용)
+            type_encoded, temp_diff = feature_pipeline.check_row(
+                input_data['type'], float(input_data['Air_Temperature']), float(input_data['Process_Temperature']),
+                rotational_speed, torque, tool_wear
+            )
+            values = feature_pipeline.fill_row(
+                [0.0] * len(feature_pipeline.MODEL_FEATURES), type_encoded, rotational_speed, torque, tool_wear, temp_diff
+            )
+
+            # 분석 데이터셋 생성
+            df = pd.DataFrame([dict(zip(feature_pipeline.MODEL_FEATURES, values))])
+
+            # 캐시된 스케일러 파라미터로 학습된 스케일링을 적용시킵니다
+            features = self.SCALED_FEATURES
+            df[features] = self.scale_features(df[features].to_numpy(dtype=np.float64))
             return df
 
         except Exception as e:
-            print(f"전처리 중 오류 발생: {str(e)}")
+            logger.debug("전처리 중 오류 발생: %s", e)
             raise
 
     def predict(self, input_data):
-        """입력 데이터를 기반으로 고장 유형을 예측합니다."""
-        try:
-            print("예측 시작 - 입력 데이터:", input_data)
+        """입력 데이터를 기반으로 고장 유형을 예측합니다 (캐시가 설정되어 있으면 먼저 조회합니다)."""
+        return self._cached(self._predict_frame, input_data)
 
+    def _predict_frame(self, input_data):
+        """pandas DataFrame 전처리를 거쳐 고장 유형을 예측합니다."""
+        try:
             # 데이터를 전처리합니다
-            processed_data = self.preprocess_input(input_data)
-            print("전처리된 데이터 shape:", processed_data.shape)
+            with instrumentation.stage('preprocess'):
+                processed_data = self.preprocess_input(input_data)
 
             # 예측을 시작합니다
-            pred = self.model.predict(processed_data)
+            with instrumentation.stage('model'):
+                pred = self.model.predict(processed_data)
+                # 모델의 예측 확률을 구합니다
+                probabilities = self.model.predict_proba(processed_data)[0]
 
             # 고장 유형을 확인합니다
             failure_type = self.failure_types(pred)
@@ -135,15 +351,6 @@ class MillingMachinePredictor:
             power = self.calculate_power(float(input_data['Rotational_Speed']), float(input_data['Torque']))
             tool_wear = float(input_data['Tool_Wear'])
 
-            # 모델의 예측 확률을 구합니다
-            probabilities = self.model.predict_proba(processed_data)[0]
-            
-            print("계산된 값들:")
-            print(f"온도차: {temp_diff:.1f}K")
-            print(f"전력: {power:.1f}W")
-            print(f"공구 마모: {tool_wear}min")
-            print("최종 예측:", failure_type)
-            
             return {
                 'status': 'success',
                 'prediction': failure_type,
@@ -161,8 +368,104 @@ class MillingMachinePredictor:
             }
 
         except Exception as e:
-            print(f"예측 중 오류 발생: {str(e)}")
+            logger.debug("예측 중 오류 발생: %s", e)
             return {
                 'status': 'error',
                 'message': str(e)
-            }
\ No newline at end of file
+            }
+
+    def build_feature_matrix(self, records):
+        """여러 입력을 모델 컬럼 순서의 스케일링된 특성 행렬로 변환합니다.
+
+        행 단위 검증 오류는 예외로 중단하지 않고 모아서 반환합니다.
+        반환값: (특성 행렬, 유효한 행 인덱스, 원시값 행렬, {행 인덱스: 오류 메시지})
+        """
+        # 필드 파싱은 행마다 수행하고, 이후 계산은 모두 벡터 연산으로 처리합니다
+        type_encoded, raw, errors = feature_pipeline.parse_records(records)
+        features, valid_idx = self.build_feature_columns(type_encoded, raw, errors)
+        return features, valid_idx, raw, errors
+
+    def build_feature_columns(self, type_encoded, raw, errors):
+        """열 단위 입력(제품 유형 코드 배열, RAW_FIELDS 순서의 원시값 행렬)을 검증하고 특성 행렬로 변환합니다.
+
+        검증에 실패한 행은 errors에 메시지를 추가합니다 (이미 있는 행은 그대로 둡니다).
+        반환값: (유효한 행의 특성 행렬, 유효한 행 인덱스)
+        """
+        features, valid_idx = feature_pipeline.build(type_encoded, raw, errors)
+        features[:, 1:] = self.scale_features(features[:, 1:])
+        return features, valid_idx
+
+    def derive_features(self, type_encoded, rotational_speed, torque, tool_wear, temp_diff):
+        """원시값 배열들로부터 모델 컬럼 순서의 스케일링된 특성 행렬을 만듭니다."""
+        features = feature_pipeline.derive_columns(type_encoded, rotational_speed, torque, tool_wear, temp_diff)
+        features[:, 1:] = self.scale_features(features[:, 1:])
+        return features
+
+    def predict_proba_matrix(self, features):
+        """특성 행렬의 확률을 계산합니다. 풀이 있고 배치가 충분히 크면 워커 프로세스들에서 계산합니다."""
+        if self.pool is not None and len(features) >= self.pool.min_rows:
+            from .process_pool import ModelVersionMismatch
+            try:
+                # 워커는 이 예측기가 로드한 것과 같은 파일/버전으로만 예측합니다
+                return self.pool.predict_proba(
+                    features, len(self.classes), self.model_path, self.scaler_path, self.version
+                )
+            except ModelVersionMismatch as e:
+                # 파일이 이미 교체되었으면 검증된 이 버전의 모델로 직접 예측합니다
+                logger.warning("추론 풀을 쓰지 않고 직접 예측합니다: %s", str(e))
+        return self.model.predict_proba(features)
+
+    def predict_batch(self, records, exact=True, explain=False):
+        """여러 입력을 한 번의 predict_proba 호출로 예측합니다.
+
+        결과는 입력 순서대로 반환되며, 각 행은 predict()와 같은 형식이거나
+        검증에 실패한 경우 해당 행의 오류 메시지를 담습니다.
+        exact=False이고 격자가 설정되어 있으면 격자 범위 안의 행은 보간값으로 응답하고
+        (결과에 'source': 'grid' 표시), 나머지 행만 모델로 예측합니다.
+        explain=True이면 성공한 행 전체의 특성 기여도 설명을 한 번의 pred_contribs 호출로 계산해 추가합니다.
+        """
+        with instrumentation.stage('preprocess'):
+            features, valid_idx, raw, errors = self.build_feature_matrix(records)
+
+        results = [None] * len(records)
+        for i, message in errors.items():
+            results[i] = {'index': i, 'status': 'error', 'message': message}
+
+        if len(valid_idx):
+            valid_raw = raw[valid_idx]
+            temp_diff = valid_raw[:, 1] - valid_raw[:, 0]
+            power = self.calculate_power(valid_raw[:, 2], valid_raw[:, 3])
+            tool_wear = valid_raw[:, 4]
+
+            from_grid = np.zeros(len(valid_idx), dtype=bool)
+            probabilities = np.empty((len(valid_idx), len(self.classes)), dtype=np.float64)
+            if not exact and self.grid is not None:
+                grid_values = np.column_stack([temp_diff, valid_raw[:, 2], valid_raw[:, 3], tool_wear])
+                grid_probabilities, from_grid = self.grid.lookup(features[:, 0], grid_values, self.grid_method)
+                probabilities[from_grid] = grid_probabilities[from_grid]
+            if not from_grid.all():
+                with instrumentation.stage('model'):
+                    probabilities[~from_grid] = self.predict_proba_matrix(features[~from_grid])
+            predicted = self.model.classes_[probabilities.argmax(axis=1)].tolist()
+
+            temp_diff = temp_diff.tolist()
+            power = power.tolist()
+            tool_wear = tool_wear.tolist()
+            probabilities = probabilities.tolist()
+            from_grid = from_grid.tolist()
+
+            for row, i in enumerate(valid_idx.tolist()):
+                result = self.format_result(
+                    predicted[row], probabilities[row], temp_diff[row], power[row], tool_wear[row]
+                )
+                result['index'] = i
+                if from_grid[row]:
+                    result['source'] = 'grid'
+                results[i] = result
+
+            if explain:
+                with instrumentation.stage('explain'):
+                    for i, explanation in zip(valid_idx.tolist(), self.explainer.explain(features)):
+                        results[i]['explanation'] = explanation
+
+        return results
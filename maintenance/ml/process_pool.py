@@ -0,0 +1,159 @@
+"""
+프로세스 풀 추론 백엔드
+큰 배치를 여러 워커 프로세스(각자 MillingMachinePredictor 보유)에 나눠 예측해 GIL의 영향을 피합니다.
+특성 행렬과 결과 확률은 pickle 대신 공유 메모리(multiprocessing.shared_memory)로 주고받고,
+각 워커는 자기 구간(행 범위)만 읽고 써서 결과가 입력 순서대로 모입니다.
+"""
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스 전역 상태 (initializer에서 채웁니다)
+_worker = {}
+
+
+class ModelVersionMismatch(RuntimeError):
+    """워커가 디스크에서 읽은 모델이 부모 예측기가 로드/검증한 버전과 다를 때 발생합니다."""
+
+
+def _model_version(model_path, scaler_path):
+    """모델/스케일러 파일의 현재 상태입니다 (MillingMachinePredictor.version과 같은 형식)."""
+    return tuple(os.stat(path).st_mtime_ns for path in (model_path, scaler_path))
+
+
+def _init_worker(engine, threads):
+    """워커 프로세스 초기화: 설정만 보관하고 모델은 첫 작업에서 로드합니다."""
+    _worker.update(engine=engine, threads=threads, predictor=None, key=None)
+
+
+def _worker_predictor(model_path, scaler_path, version):
+    """부모 예측기와 같은 파일/버전의 예측기를 반환합니다.
+
+    처음 보는 버전이면 파일에서 다시 로드하고, 읽은 파일이 요청한 버전이 아니면(파일이 이미 교체되어
+    ModelHolder가 아직 검증하지 않은 모델이면) ModelVersionMismatch를 발생시킵니다.
+    """
+    key = (model_path, scaler_path, version)
+    if _worker['predictor'] is None or _worker['key'] != key:
+        from .predictor import MillingMachinePredictor
+        predictor = MillingMachinePredictor(model_path, scaler_path, engine=_worker['engine'])
+        if predictor.version != version:
+            raise ModelVersionMismatch(f"요청한 모델 버전 {version}이 아니라 {predictor.version}을 읽었습니다")
+        if predictor.booster is not None:
+            # 프로세스마다 OpenMP 스레드를 여러 개 쓰면 코어를 서로 빼앗으므로 워커당 스레드 수를 제한합니다
+            predictor.booster.set_param({'nthread': _worker['threads']})
+        _worker['predictor'] = predictor
+        _worker['key'] = key
+    return _worker['predictor']
+
+
+def _score_shard(model_path, scaler_path, version, features_name, output_name, n_rows, n_features, n_classes, start, stop):
+    """공유 메모리의 [start, stop) 행을 예측해 결과 공유 메모리의 같은 위치에 씁니다."""
+    predictor = _worker_predictor(model_path, scaler_path, version)
+    features_shm = shared_memory.SharedMemory(name=features_name)
+    output_shm = shared_memory.SharedMemory(name=output_name)
+    try:
+        features = np.ndarray((n_rows, n_features), dtype=np.float32, buffer=features_shm.buf)
+        output = np.ndarray((n_rows, n_classes), dtype=np.float32, buffer=output_shm.buf)
+        output[start:stop] = predictor.model.predict_proba(features[start:stop])
+        del features, output
+    finally:
+        features_shm.close()
+        output_shm.close()
+    return stop - start
+
+
+class InferencePool:
+    """특성 행렬을 구간으로 나눠 워커 프로세스들에서 predict_proba를 실행하는 클래스입니다.
+
+    MillingMachinePredictor.predict_batch가 min_rows 이상인 배치에 이 풀을 사용합니다.
+    워커는 spawn 방식으로 시작하므로 부모의 스레드(로그 기록, 모델 감시 등)를 물려받지 않습니다.
+    워커 프로세스들은 처음 예측할 때 만들고 만든 프로세스 ID를 기억합니다. preload 모드에서 fork 된
+    gunicorn 워커는 마스터의 작업/결과 큐를 함께 쓰지 않도록 자기 워커 프로세스들을 새로 만듭니다.
+    """
+
+    def __init__(self, model_path, scaler_path, engine='xgboost', workers=None, max_batch_rows=4096,
+                 min_rows=2048, threads_per_worker=1):
+        self.model_path = str(model_path)
+        self.scaler_path = str(scaler_path)
+        self.workers = workers or os.cpu_count() or 1
+        self.max_batch_rows = max_batch_rows
+        self.min_rows = min_rows
+        self.engine = engine
+        self.threads_per_worker = threads_per_worker
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def _get_executor(self):
+        """현재 프로세스가 만든 실행기를 반환합니다. fork 된 자식 프로세스에서는 새로 만듭니다."""
+        pid = os.getpid()
+        if self._executor is not None and self._pid == pid:
+            return self._executor
+        with self._lock:
+            if self._executor is None or self._pid != pid:
+                # 부모에게서 물려받은 실행기는 부모의 것이므로 종료하지 않고 버립니다
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(self.engine, self.threads_per_worker)
+                )
+                self._pid = pid
+        return self._executor
+
+    def predict_proba(self, features, n_classes, model_path=None, scaler_path=None, version=None):
+        """(n, 특성 수) 행렬의 클래스별 확률을 입력 순서대로 반환합니다.
+
+        예측기는 자신의 파일 경로와 로드 시점 버전(predictor.version)을 넘겨 워커가 정확히 그 모델로 예측하게 합니다.
+        생략하면 풀을 만들 때의 경로와 현재 파일 상태를 사용합니다 (벤치마크용).
+        워커가 그 버전을 읽을 수 없으면 ModelVersionMismatch가 발생합니다.
+        """
+        model_path = str(model_path or self.model_path)
+        scaler_path = str(scaler_path or self.scaler_path)
+        if version is None:
+            version = _model_version(model_path, scaler_path)
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        n_rows, n_features = features.shape
+        if n_rows == 0:
+            return np.empty((0, n_classes), dtype=np.float32)
+
+        features_shm = shared_memory.SharedMemory(create=True, size=features.nbytes)
+        output_shm = shared_memory.SharedMemory(create=True, size=n_rows * n_classes * 4)
+        try:
+            np.ndarray(features.shape, dtype=np.float32, buffer=features_shm.buf)[:] = features
+
+            # 워커 수보다 구간이 적으면 코어가 놀기 때문에, 구간 크기는 max_batch_rows와 균등 분할 중 작은 값입니다
+            shard_rows = max(1, min(self.max_batch_rows, -(-n_rows // self.workers)))
+            executor = self._get_executor()
+            futures = [
+                executor.submit(
+                    _score_shard, model_path, scaler_path, version, features_shm.name, output_shm.name,
+                    n_rows, n_features, n_classes, start, min(start + shard_rows, n_rows)
+                )
+                for start in range(0, n_rows, shard_rows)
+            ]
+            for future in futures:
+                future.result()
+
+            output = np.ndarray((n_rows, n_classes), dtype=np.float32, buffer=output_shm.buf)
+            result = output.copy()
+            del output
+            return result
+        finally:
+            features_shm.close()
+            features_shm.unlink()
+            output_shm.close()
+            output_shm.unlink()
+
+    def shutdown(self):
+        if self._executor is not None and self._pid == os.getpid():
+            self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,143 @@
+"""
+비교 모델 레지스트리
+모델 비교 페이지의 분류기들을 실제 입력으로 함께 예측해 보기 위한 레지스트리입니다.
+직렬화된 모델 파일이 있는 모델만 처음 사용할 때 로드하며, 전처리(특성 행렬 생성)는
+기본 예측기에서 한 번만 수행한 뒤 모든 모델에 같은 행렬을 넘깁니다.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 모델 키(reports.MODEL_REPORTS와 같은 키) -> 직렬화 파일 이름
+# xgboost는 기본 예측기(MillingMachinePredictor)의 모델을 그대로 사용합니다.
+MODEL_FILES = {
+    'logistic': 'model_logistic.joblib',
+    'knn': 'model_knn.joblib',
+    'svm': 'model_svm.joblib',
+    'decision_tree': 'model_dtc.joblib',
+    'random_forest': 'model_rfc.joblib',
+    'xgboost': 'model_xgboost.json',
+}
+PRIMARY_MODEL = 'xgboost'
+
+# 모델 버전이 바뀌면 레지스트리는 새로 만들어지지만, 병렬 예측 스레드 풀은 프로세스에 하나만 두고 같이 씁니다
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor(max_workers=6):
+    """프로세스 전역 병렬 예측 스레드 풀을 반환합니다 (처음 호출할 때 max_workers로 만듭니다)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='model-registry')
+    return _executor
+
+
+class ModelRegistry:
+    """모델을 지연 로드하고, 하나의 입력을 여러 모델로 병렬 예측하는 클래스입니다.
+
+    scikit-learn 모델은 joblib으로 저장된 predict_proba 지원 분류기여야 하며,
+    기본 예측기와 같은 특성 순서/스케일링으로 학습되었다고 가정합니다.
+    """
+
+    def __init__(self, predictor, models_dir, max_workers=6):
+        self.predictor = predictor
+        self.models_dir = Path(models_dir)
+        self.max_workers = max_workers
+        self._models = {PRIMARY_MODEL: predictor.model}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def available(self):
+        """모델 파일이 있는 모델 키 목록을 반환합니다."""
+        return [key for key, filename in MODEL_FILES.items()
+                if key in self._models or (self.models_dir / filename).exists()]
+
+    def get(self, key):
+        """모델을 반환합니다. 처음 요청될 때 파일에서 로드합니다."""
+        model = self._models.get(key)
+        if model is not None:
+            return model
+        with self._lock:
+            if key in self._models:
+                return self._models[key]
+            if key in self._errors:
+                raise RuntimeError(self._errors[key])
+            path = self.models_dir / MODEL_FILES[key]
+            try:
+                import joblib
+                model = joblib.load(path)
+                if not hasattr(model, 'predict_proba'):
+                    raise TypeError("predict_proba를 지원하지 않는 모델입니다")
+            except Exception as e:
+                # 깨진 파일을 요청마다 다시 읽지 않도록 실패도 기억해 둡니다
+                self._errors[key] = f"{path.name} 로드 실패: {str(e)}"
+                logger.error("비교 모델 로드 실패 (%s): %s", key, str(e))
+                raise RuntimeError(self._errors[key])
+            self._models[key] = model
+            logger.info("비교 모델 로드: %s", key)
+            return model
+
+    def _score_one(self, key, features, temp_diff, power, tool_wear):
+        """한 모델로 예측하고 (결과, 소요 시간 ms)를 반환합니다. 로드 시간도 포함됩니다."""
+        start = time.perf_counter()
+        try:
+            model = self.get(key)
+            probabilities = model.predict_proba(features)[0]
+
+            # 모델마다 클래스 순서/구성이 다를 수 있으므로 기본 예측기 클래스 순서로 맞춥니다
+            aligned = np.zeros(len(self.predictor.classes), dtype=np.float64)
+            for cls, p in zip(np.asarray(model.classes_).tolist(), probabilities):
+                aligned[self.predictor.classes.index(int(cls))] = p
+            pred = self.predictor.classes[int(aligned.argmax())]
+            result = self.predictor.format_result(pred, aligned.tolist(), temp_diff, power, tool_wear)
+        except Exception as e:
+            result = {'status': 'error', 'message': str(e)}
+        result['elapsed_ms'] = (time.perf_counter() - start) * 1000
+        return result
+
+    def predict_all(self, input_data, keys=None):
+        """하나의 입력을 여러 모델로 병렬 예측합니다.
+
+        keys가 None이면 사용 가능한 모든 모델을 사용합니다.
+        반환값: {'status', 'models': {키: 결과}, 'unavailable': [...], 'timings': {...}}
+        """
+        start = time.perf_counter()
+        available = self.available()
+        keys = available if keys is None else keys
+        unavailable = [key for key in keys if key not in available]
+        keys = [key for key in keys if key in available]
+
+        # 전처리는 기본 예측기에서 한 번만 수행합니다
+        features, valid_idx, raw, errors = self.predictor.build_feature_matrix([input_data])
+        if errors:
+            return {'status': 'error', 'message': errors[0]}
+        air_temp, process_temp, rotational_speed, torque, tool_wear = raw[0].tolist()
+        temp_diff = process_temp - air_temp
+        power = float(self.predictor.calculate_power(rotational_speed, torque))
+        preprocess_ms = (time.perf_counter() - start) * 1000
+
+        executor = get_executor(self.max_workers)
+        futures = {
+            key: executor.submit(self._score_one, key, features, temp_diff, power, tool_wear)
+            for key in keys
+        }
+        models = {key: future.result() for key, future in futures.items()}
+
+        return {
+            'status': 'success',
+            'models': models,
+            'unavailable': unavailable,
+            'timings': {
+                'preprocess_ms': preprocess_ms,
+                'total_ms': (time.perf_counter() - start) * 1000
+            }
+        }
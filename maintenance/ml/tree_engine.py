@@ -0,0 +1,310 @@
+"""
+XGBoost 트리 앙상블을 NumPy 배열로 평가하는 추론 엔진
+저장된 model_xgboost.json을 한 번만 파싱해 배열로 펼쳐두고,
+xgboost를 import하지 않고도 여러 행을 벡터 연산으로 예측합니다.
+평가용 배열은 .npy 파일로 저장해 두고 메모리 맵으로 열 수 있어서,
+여러 워커 프로세스가 같은 물리 메모리(페이지 캐시)를 읽기 전용으로 공유합니다.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+
+class TreeEnsemble:
+    """XGBoost JSON 모델을 배열로 보관하고 predict_proba를 제공하는 클래스입니다.
+
+    JSON의 트리들은 먼저 노드별 평탄 배열(특성 인덱스, 임계값, 왼쪽/오른쪽 자식, 리프 값)로
+    변환됩니다. 예측은 QuickScorer 방식의 비트마스크 평가를 사용합니다.
+    각 분할 노드는 조건이 거짓(오른쪽 이동)일 때 도달할 수 없게 되는 왼쪽 서브트리의
+    리프 비트를 가지고 있고, 트리별로 이 비트들을 OR 한 뒤 남은 가장 왼쪽 리프가 도착 리프가 됩니다.
+    분할 노드는 특성별로 (슬롯, 트리) 배열에 모아두므로 행 × 노드 단위의 gather 없이
+    브로드캐스팅 비교만으로 모든 트리를 한 번에 평가합니다.
+    """
+
+    # 한 번에 평가할 최대 행 수 (행 × 슬롯 × 트리 크기의 임시 배열 메모리를 제한합니다)
+    CHUNK_ROWS = 64
+
+    def __init__(self, feature, threshold, left, right, default_left, value,
+                 roots, tree_class, n_classes, n_features, base_score, feature_names=None):
+        # 노드별 평탄 배열 (모든 트리를 이어 붙이고, 자식 인덱스는 전역 인덱스입니다)
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.tree_class = tree_class
+        self.n_classes = n_classes
+        self.n_features = n_features
+        self.base_score = base_score
+        self.feature_names = feature_names
+        self.classes_ = np.arange(n_classes)
+
+        self._build_bitmasks()
+
+        # 트리별 리프 값을 클래스별 마진으로 더하기 위한 (트리 수, 클래스 수) 행렬
+        n_trees = len(roots)
+        self._class_matrix = np.zeros((n_trees, n_classes), dtype=np.float32)
+        self._class_matrix[np.arange(n_trees), tree_class] = 1.0
+
+    @classmethod
+    def from_json(cls, model_path):
+        """XGBoost가 저장한 JSON 모델 파일을 읽어 엔진을 생성합니다."""
+        with open(model_path, 'r') as f:
+            learner = json.load(f)['learner']
+
+        objective = learner['objective']['name']
+        if objective != 'multi:softprob':
+            raise ValueError(f"지원하지 않는 목적 함수입니다: {objective}")
+
+        booster = learner['gradient_booster']
+        if booster['name'] != 'gbtree':
+            raise ValueError(f"지원하지 않는 부스터입니다: {booster['name']}")
+
+        model = booster['model']
+        params = learner['learner_model_param']
+
+        features, thresholds, lefts, rights, defaults, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        for tree in model['trees']:
+            if any(tree['split_type']):
+                raise ValueError("범주형 분할이 있는 트리는 지원하지 않습니다")
+
+            left = np.asarray(tree['left_children'], dtype=np.int32)
+            right = np.asarray(tree['right_children'], dtype=np.int32)
+            is_leaf = left == -1
+            # 리프 노드의 split_conditions에는 리프 값이 저장되어 있습니다
+            conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+
+            features.append(np.asarray(tree['split_indices'], dtype=np.int32))
+            thresholds.append(np.where(is_leaf, np.float32(np.nan), conditions))
+            lefts.append(np.where(is_leaf, -1, left + offset))
+            rights.append(np.where(is_leaf, -1, right + offset))
+            defaults.append(np.asarray(tree['default_left'], dtype=bool))
+            values.append(np.where(is_leaf, conditions, np.float32(0)))
+            roots.append(offset)
+            offset += len(left)
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            default_left=np.concatenate(defaults),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.int32),
+            tree_class=np.asarray(model['tree_info'], dtype=np.int32),
+            n_classes=int(params['num_class']),
+            n_features=int(params['num_feature']),
+            base_score=float(params['base_score']),
+            feature_names=learner.get('feature_names')
+        )
+
+    # save()/load()로 저장하는 배열 속성 (특성별 테이블은 이름 뒤에 _<특성 번호>를 붙여 저장합니다)
+    NODE_ARRAYS = ('feature', 'threshold', 'left', 'right', 'default_left', 'value', 'roots', 'tree_class')
+    EVAL_ARRAYS = ('_leaf_values', '_leaf_offset', '_class_matrix')
+    FEATURE_ARRAYS = ('_split_threshold', '_split_bits', '_split_default_left')
+
+    @staticmethod
+    def source_digest(model_path):
+        """배열 캐시가 어떤 모델 파일로 만들어졌는지 확인하기 위한 해시를 반환합니다."""
+        with open(model_path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def save(self, directory, digest=None):
+        """평가에 필요한 배열을 디렉터리에 .npy 파일로 저장합니다.
+
+        임시 디렉터리에 모두 쓴 뒤 이름을 바꾸므로 읽는 쪽은 완성된 디렉터리만 보게 됩니다.
+        저장된 디렉터리는 다른 프로세스가 메모리 맵으로 열고 있을 수 있으므로 덮어쓰지 않으며,
+        이미 있으면 (동시에 저장한 다른 프로세스의 결과로 보고) 그대로 둡니다.
+        """
+        directory = Path(directory)
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=directory.name + '.', dir=directory.parent))
+        try:
+            for name in self.NODE_ARRAYS + self.EVAL_ARRAYS:
+                np.save(tmp_dir / f'{name.lstrip("_")}.npy', getattr(self, name))
+            for name in self.FEATURE_ARRAYS:
+                for f, array in enumerate(getattr(self, name)):
+                    np.save(tmp_dir / f'{name.lstrip("_")}_{f}.npy', array)
+            metadata = {
+                'n_classes': self.n_classes,
+                'n_features': self.n_features,
+                'base_score': self.base_score,
+                'feature_names': self.feature_names,
+                'mask_dtype': np.dtype(self._mask_dtype).name,
+                'source_digest': digest
+            }
+            with open(tmp_dir / 'metadata.json', 'w') as f:
+                json.dump(metadata, f)
+            try:
+                os.rename(tmp_dir, directory)
+            except OSError:
+                if not directory.exists():
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """save()로 저장한 배열을 (기본값은 읽기 전용 메모리 맵으로) 열어 엔진을 생성합니다."""
+        directory = Path(directory)
+        with open(directory / 'metadata.json', 'r') as f:
+            metadata = json.load(f)
+
+        def load_array(name):
+            return np.load(directory / f'{name}.npy', mmap_mode=mmap_mode)
+
+        engine = cls.__new__(cls)
+        for name in cls.NODE_ARRAYS + cls.EVAL_ARRAYS:
+            setattr(engine, name, load_array(name.lstrip('_')))
+        for name in cls.FEATURE_ARRAYS:
+            setattr(engine, name, [load_array(f'{name.lstrip("_")}_{f}') for f in range(metadata['n_features'])])
+        engine.n_classes = metadata['n_classes']
+        engine.n_features = metadata['n_features']
+        engine.base_score = metadata['base_score']
+        engine.feature_names = metadata['feature_names']
+        engine.classes_ = np.arange(engine.n_classes)
+        engine._mask_dtype = np.dtype(metadata['mask_dtype']).type
+        engine.digest = metadata['source_digest']
+        return engine
+
+    @classmethod
+    def load_cached(cls, model_path, cache_dir):
+        """모델 파일 해시별 배열 캐시를 메모리 맵으로 엽니다. 캐시가 없으면 JSON에서 만들어 저장합니다.
+
+        캐시는 cache_dir/<해시 앞 16자리>/ 에 저장되어 한 번 만들어지면 바뀌지 않으므로,
+        여러 워커가 동시에 만들거나 열어도 안전하고 같은 페이지 캐시를 공유합니다.
+        """
+        digest = cls.source_digest(model_path)
+        cache_dir = Path(cache_dir)
+        directory = cache_dir / digest[:16]
+        try:
+            return cls.load(directory)
+        except (OSError, ValueError, KeyError):
+            pass
+
+        engine = cls.from_json(model_path)
+        engine.save(directory, digest=digest)
+        # 이전 모델의 캐시는 지웁니다 (이미 메모리 맵으로 연 프로세스는 삭제 후에도 계속 읽을 수 있습니다)
+        for stale in cache_dir.iterdir():
+            if stale.is_dir() and stale.name != directory.name and '.' not in stale.name:
+                shutil.rmtree(stale, ignore_errors=True)
+        try:
+            return cls.load(directory)
+        except (OSError, ValueError, KeyError):
+            # 캐시 디렉터리가 손상되었으면 메모리에 만든 엔진을 그대로 사용합니다
+            return engine
+
+    def _build_bitmasks(self):
+        """노드 배열로부터 특성별 비트마스크 평가 테이블을 만듭니다."""
+        n_trees = len(self.roots)
+        # 트리마다 리프를 왼쪽에서 오른쪽 순서로 번호 매기고, 각 분할 노드에 왼쪽 서브트리 리프 비트를 기록합니다
+        splits = [[[] for _ in range(n_trees)] for _ in range(self.n_features)]
+        leaf_values = []
+        max_leaves = 0
+        for tree_idx, root in enumerate(self.roots.tolist()):
+            leaves = []
+
+            def visit(node):
+                """서브트리의 리프 비트마스크를 반환합니다."""
+                if self.left[node] == -1:
+                    leaves.append(self.value[node])
+                    return 1 << (len(leaves) - 1)
+                left_bits = visit(self.left[node])
+                right_bits = visit(self.right[node])
+                splits[self.feature[node]][tree_idx].append(
+                    (self.threshold[node], left_bits, self.default_left[node])
+                )
+                return left_bits | right_bits
+
+            visit(root)
+            leaf_values.append(leaves)
+            max_leaves = max(max_leaves, len(leaves))
+
+        if max_leaves > 64:
+            raise ValueError("트리당 리프가 64개를 넘는 모델은 지원하지 않습니다")
+        self._mask_dtype = next(dtype for dtype in (np.uint8, np.uint16, np.uint32, np.uint64)
+                                if np.iinfo(dtype).bits >= max_leaves)
+
+        # 특성별 (슬롯, 트리) 테이블: 비어 있는 슬롯은 비트 0이라 결과에 영향을 주지 않습니다
+        self._split_threshold = []
+        self._split_bits = []
+        self._split_default_left = []
+        for per_tree in splits:
+            n_slots = max((len(nodes) for nodes in per_tree), default=0)
+            threshold = np.full((n_slots, n_trees), np.inf, dtype=np.float32)
+            bits = np.zeros((n_slots, n_trees), dtype=self._mask_dtype)
+            default_left = np.ones((n_slots, n_trees), dtype=bool)
+            for tree_idx, nodes in enumerate(per_tree):
+                for slot, (node_threshold, node_bits, node_default) in enumerate(nodes):
+                    threshold[slot, tree_idx] = node_threshold
+                    bits[slot, tree_idx] = node_bits
+                    default_left[slot, tree_idx] = node_default
+            self._split_threshold.append(threshold)
+            self._split_bits.append(bits)
+            self._split_default_left.append(default_left)
+
+        # 리프 값은 (트리, 최대 리프 수) 배열을 평탄화해 보관합니다
+        self._leaf_values = np.zeros((n_trees, max_leaves), dtype=np.float32)
+        for tree_idx, leaves in enumerate(leaf_values):
+            self._leaf_values[tree_idx, :len(leaves)] = leaves
+        self._leaf_values = self._leaf_values.ravel()
+        self._leaf_offset = np.arange(n_trees, dtype=np.intp) * max_leaves
+
+    def _exit_leaves(self, chunk):
+        """각 행 × 트리의 도착 리프 번호를 계산합니다."""
+        eliminated = np.zeros((chunk.shape[0], len(self.roots)), dtype=self._mask_dtype)
+        has_nan = np.isnan(chunk).any()
+        for f in range(self.n_features):
+            threshold = self._split_threshold[f]
+            if not threshold.shape[0]:
+                continue
+            x = chunk[:, f, None, None]
+            # xgboost와 같이 x < 임계값이면 왼쪽으로 이동합니다
+            go_right = x >= threshold
+            if has_nan:
+                # 결측값은 노드의 default_left 방향으로 이동합니다
+                missing = np.isnan(chunk[:, f])
+                go_right[missing] = ~self._split_default_left[f]
+            eliminated |= np.bitwise_or.reduce(go_right * self._split_bits[f], axis=1)
+
+        # 제거되지 않은 리프 중 가장 왼쪽(최하위 비트)이 도착 리프입니다
+        remaining = ~eliminated
+        lowest = remaining & (~remaining + 1)
+        return np.frexp(lowest.astype(np.float64))[1] - 1
+
+    def predict_margin(self, X):
+        """각 행의 클래스별 마진(소프트맥스 이전 점수)을 계산합니다."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"입력은 (행 수, {self.n_features}) 형태의 2차원 배열이어야 합니다")
+
+        margin = np.empty((X.shape[0], self.n_classes), dtype=np.float32)
+        for start in range(0, X.shape[0], self.CHUNK_ROWS):
+            chunk = X[start:start + self.CHUNK_ROWS]
+            leaves = self._exit_leaves(chunk)
+            margin[start:start + chunk.shape[0]] = (
+                self._leaf_values[self._leaf_offset + leaves] @ self._class_matrix
+            )
+
+        margin += np.float32(self.base_score)
+        return margin
+
+    def predict_proba(self, X):
+        """다중 클래스 소프트맥스 확률을 반환합니다."""
+        margin = self.predict_margin(X)
+        margin -= margin.max(axis=1, keepdims=True)
+        np.exp(margin, out=margin)
+        margin /= margin.sum(axis=1, keepdims=True)
+        return margin
+
+    def predict(self, X):
+        """확률이 가장 높은 클래스를 반환합니다."""
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 class SimulatorInput(models.Model):
     """시뮬레이터 입력값을 저장하는 모델"""
@@ -23,7 +24,15 @@ class SimulatorInput(models.Model):
     torque = models.FloatField()              # 토크 (Nm)
     tool_wear = models.IntegerField()         # 공구 마모도 (min)
     
-    created_at = models.DateTimeField(auto_now_add=True, null=True)  # 데이터 생성 시간
+    machine_id = models.CharField(max_length=64, blank=True, default='')  # 기계/라인 ID ('' = 미지정)
+    created_at = models.DateTimeField(default=timezone.now)  # 데이터 생성 시간 (일괄 적재 시 측정 시각을 넣을 수 있습니다)
+    
+    class Meta:
+        indexes = [
+            # "기계 X의 최근 N시간" 조회용
+            models.Index(fields=['machine_id', 'created_at'], name='input_machine_created_idx'),
+            models.Index(fields=['created_at'], name='input_created_idx'),
+        ]
     
     def __str__(self):
         return f"입력 #{self.id} - {self.created_at}"
@@ -51,5 +60,40 @@ class SimulatorOutput(models.Model):
         default=0
     )  # 예측된 고장 유형
     
+    # 고장 유형별 예측 확률 (확률 없이 저장된 기존 기록은 비어 있습니다)
+    probability_hdf = models.FloatField(null=True, blank=True)
+    probability_pwf = models.FloatField(null=True, blank=True)
+    probability_osf = models.FloatField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"출력 #{self.id_id} - {self.get_prediction_display()}"
+
+class PredictionRollup(models.Model):
+    """기계별 1분 단위 예측 집계 (긴 기간 조회는 원본 기록 대신 이 테이블을 읽습니다)"""
+    
+    machine_id = models.CharField(max_length=64, blank=True, default='')  # 기계/라인 ID
+    minute = models.DateTimeField()                   # 집계 구간 시작 시각 (UTC, 분 단위)
+    
+    count = models.IntegerField(default=0)            # 예측 건수
+    failures = models.IntegerField(default=0)         # 고장으로 예측된 건수
+    hdf_count = models.IntegerField(default=0)        # 열 발산 고장 예측 건수
+    pwf_count = models.IntegerField(default=0)        # 전력 고장 예측 건수
+    osf_count = models.IntegerField(default=0)        # 과부하 고장 예측 건수
+    
+    probability_count = models.IntegerField(default=0)  # 확률이 기록된 건수 (평균 계산용)
+    probability_hdf_sum = models.FloatField(default=0.0)
+    probability_pwf_sum = models.FloatField(default=0.0)
+    probability_osf_sum = models.FloatField(default=0.0)
+    failure_probability_max = models.FloatField(null=True, blank=True)  # 고장 확률(HDF+PWF+OSF) 최댓값
+    
+    class Meta:
+        constraints = [
+            # 기계별 시간 범위 조회에도 이 유니크 인덱스를 사용합니다
+            models.UniqueConstraint(fields=['machine_id', 'minute'], name='rollup_machine_minute_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['minute'], name='rollup_minute_idx'),
+        ]
+    
     def __str__(self):
-        return f"출력 #{self.id_id} - {self.get_prediction_display()}"
\ No newline at end of file
+        return f"집계 {self.machine_id or '-'} {self.minute:%Y-%m-%d %H:%M}"
\ No newline at end of file
@@ -0,0 +1,179 @@
+"""
+예측 입력값/결과 저장을 요청 처리와 분리하는 write-behind 버퍼
+요청 스레드는 큐에 넣기만 하고, 백그라운드 스레드가 크기/시간 기준으로 모아서
+SimulatorInput, SimulatorOutput을 bulk_create로 저장합니다.
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.utils import timezone
+
+from . import history
+from .models import SimulatorInput, SimulatorOutput
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionLogWriter:
+    """예측 입력/결과 쌍을 모아 일괄 저장하는 클래스입니다.
+
+    batch_size개가 쌓이거나 flush_interval초가 지나면 백그라운드 스레드가 저장합니다.
+    synchronous=True이면 버퍼 없이 record() 호출 시점에 바로 저장합니다.
+    입력값에 created_at이 없으면 저장 시점 기준이므로 요청 시각보다 최대 flush_interval초 늦을 수 있습니다.
+    """
+
+    def __init__(self, batch_size=200, flush_interval=1.0, max_pending=10000, synchronous=False):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.synchronous = synchronous
+
+        self._pending = deque()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._pid = None
+        self._closed = False
+
+    def record(self, input_data, prediction, probabilities=None):
+        """predictor 입력 형식의 입력값과 예측 코드(와 API 형식의 확률 dict)를 기록합니다.
+
+        입력값에 machine_id가 있으면 기계 ID로, created_at(측정 시각)이 있으면 생성 시간으로 함께 저장합니다.
+        """
+        self.record_many([(input_data, prediction, probabilities)])
+
+    def record_many(self, pairs):
+        """(입력값, 예측 코드, 확률 dict 또는 None) 목록을 기록합니다."""
+        pairs = list(pairs)
+        if not pairs:
+            return
+        if self.synchronous or self._closed:
+            self.write(pairs)
+            return
+
+        self._ensure_thread()
+        with self._condition:
+            # 버퍼가 가득 차면 백그라운드 저장이 따라잡을 때까지 기다립니다
+            while len(self._pending) >= self.max_pending and not self._closed:
+                self._condition.notify_all()
+                self._condition.wait(self.flush_interval)
+            self._pending.extend(pairs)
+            if len(self._pending) >= self.batch_size:
+                self._condition.notify_all()
+
+    def flush(self):
+        """버퍼에 남은 기록을 현재 스레드에서 즉시 저장합니다."""
+        while True:
+            pairs = self._drain()
+            if not pairs:
+                return
+            self.write(pairs)
+
+    def close(self):
+        """백그라운드 스레드를 멈추고 남은 기록을 모두 저장합니다."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join()
+        self.flush()
+
+    def write(self, pairs):
+        """입력값과 예측 결과를 bulk_create로 한 번에 저장하고, 같은 트랜잭션에서 해당 분의 롤업을 다시 집계합니다."""
+        chunk_size = getattr(settings, 'PREDICT_BATCH_DB_CHUNK', 500)
+        with transaction.atomic():
+            inputs = SimulatorInput.objects.bulk_create([
+                SimulatorInput(
+                    type=input_data['type'],
+                    air_temperature=input_data['Air_Temperature'],
+                    process_temperature=input_data['Process_Temperature'],
+                    rotational_speed=input_data['Rotational_Speed'],
+                    torque=input_data['Torque'],
+                    tool_wear=input_data['Tool_Wear'],
+                    machine_id=input_data.get('machine_id', ''),
+                    created_at=input_data.get('created_at') or timezone.now()
+                )
+                for input_data, _, _ in pairs
+            ], batch_size=chunk_size)
+            SimulatorOutput.objects.bulk_create([
+                SimulatorOutput(
+                    id=simulator_input,
+                    prediction=prediction,
+                    probability_hdf=probabilities['HDF'] if probabilities else None,
+                    probability_pwf=probabilities['PWF'] if probabilities else None,
+                    probability_osf=probabilities['OSF'] if probabilities else None
+                )
+                for simulator_input, (_, prediction, probabilities) in zip(inputs, pairs)
+            ], batch_size=chunk_size)
+
+            # 롤업은 같은 트랜잭션 안에서 갱신해야 동시에 같은 분을 쓰는 워커와 순서가 엇갈리지 않습니다
+            if inputs and getattr(settings, 'PREDICTION_ROLLUP_ON_WRITE', True):
+                history.refresh_minute_rollups(
+                    (simulator_input.machine_id, history.floor_minute(simulator_input.created_at))
+                    for simulator_input in inputs
+                )
+
+    def _drain(self):
+        """버퍼에서 최대 batch_size개의 기록을 꺼냅니다."""
+        with self._condition:
+            count = min(len(self._pending), self.batch_size)
+            pairs = [self._pending.popleft() for _ in range(count)]
+            self._condition.notify_all()
+            return pairs
+
+    def _ensure_thread(self):
+        """현재 프로세스에 백그라운드 스레드가 없으면 시작합니다 (fork 이후에도 다시 시작됩니다)."""
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._condition:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='prediction-log-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """크기 또는 시간 기준에 도달할 때마다 버퍼를 저장하는 백그라운드 루프입니다."""
+        try:
+            while True:
+                with self._condition:
+                    if not self._closed and len(self._pending) < self.batch_size:
+                        self._condition.wait(self.flush_interval)
+                    closed = self._closed
+                pairs = self._drain()
+                if pairs:
+                    close_old_connections()
+                    try:
+                        self.write(pairs)
+                    except Exception as e:
+                        logger.error("예측 기록 저장 실패 (%d건 유실): %s", len(pairs), str(e))
+                if closed:
+                    return
+        finally:
+            connections.close_all()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    """settings 값으로 구성된 프로세스 전역 PredictionLogWriter를 반환합니다."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = PredictionLogWriter(
+                    batch_size=getattr(settings, 'PREDICTION_LOG_BATCH_SIZE', 200),
+                    flush_interval=getattr(settings, 'PREDICTION_LOG_FLUSH_INTERVAL', 1.0),
+                    max_pending=getattr(settings, 'PREDICTION_LOG_MAX_PENDING', 10000),
+                    synchronous=not getattr(settings, 'PREDICTION_LOG_ASYNC', True)
+                )
+                # 프로세스 종료 시 남은 기록을 반드시 저장합니다
+                atexit.register(_writer.close)
+    return _writer
@@ -0,0 +1,121 @@
+"""
+모델 성능 리포트 레지스트리
+모델별 분류 리포트 CSV를 한 번만 읽어 메모리에 보관하고, 파일 수정 시각이 바뀐 리포트만 다시 읽습니다.
+새 모델을 추가할 때는 MODEL_REPORTS에 항목 하나만 추가하면 됩니다.
+"""
+import csv
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+
+
+@dataclass(frozen=True)
+class ModelReport:
+    """모델 비교 페이지 하나를 구성하는 정적 정보입니다."""
+    key: str            # URL 경로와 URL 이름으로 사용됩니다 (예: 'knn' -> /knn/, maintenance:knn)
+    label: str          # 네비게이션에 표시할 이름
+    icon: str
+    csv_name: str       # maintenance/ml/reports 아래 분류 리포트 파일
+    accuracy: float     # 테스트 세트 정확도(%) - 리포트 CSV에는 클래스별 지표만 있습니다
+    graph_file: str     # ROC 커브 차트 (static 경로)
+    matrix_file: str    # 혼동 행렬 차트 (static 경로)
+    explanation: str
+
+
+MODEL_REPORTS = (
+    ModelReport('logistic', '로지스틱 회귀', '🔄', 'classification_report_logistic.csv', 87.50,
+                'images/graphs/roc_curve_logistic_2.html',
+                'images/confusion_matrix/confusion_matrix_logistic.html',
+                '로지스틱 회귀 모델의 성능 분석 결과입니다.'),
+    ModelReport('knn', 'KNN', '🎯', 'classification_report_knn.csv', 93.78,
+                'images/graphs/roc_curve_knn_2.html',
+                'images/confusion_matrix/confusion_matrix_knn.html',
+                'k-최근접 이웃 알고리즘 모델의 성능 분석 결과입니다.'),
+    ModelReport('svm', 'SVM', '💡', 'classification_report_svm.csv', 96.46,
+                'images/graphs/roc_curve_svm_2.html',
+                'images/confusion_matrix/confusion_matrix_svm.html',
+                '서포트 벡터 머신 모델의 성능 분석 결과입니다.'),
+    ModelReport('decision_tree', '의사결정트리', '🌳', 'classification_report_dtc.csv', 97.56,
+                'images/graphs/roc_curve_decision_tree_2.html',
+                'images/confusion_matrix/confusion_matrix_dtc.html',
+                '의사결정나무 모델의 성능 분석 결과입니다.'),
+    ModelReport('random_forest', '랜덤포레스트', '🌲', 'classification_report_rfc.csv', 97.59,
+                'images/graphs/roc_curve_random_forest_2.html',
+                'images/confusion_matrix/confusion_matrix_rfc.html',
+                '랜덤 포레스트 모델의 성능 분석 결과입니다.'),
+    ModelReport('xgboost', 'XGBoost', '🚀', 'classification_report_xgb.csv', 97.46,
+                'images/graphs/roc_curve_xgboost_2.html',
+                'images/confusion_matrix/confusion_matrix_xgb.html',
+                'XGBoost 모델의 성능 분석 결과입니다.'),
+)
+
+
+def read_metrics(csv_path):
+    """분류 리포트 CSV를 읽어 지표를 백분율로 변환한 목록을 반환합니다."""
+    metrics = []
+    with open(csv_path, 'r', encoding='utf-8') as file:
+        reader = csv.DictReader(file)
+        for row in reader:
+            metrics.append({
+                'name': row['name'],
+                'precision': float(row['precision']) * 100,
+                'recall': float(row['recall']) * 100,
+                'f1_score': float(row['f1_score']) * 100,
+            })
+    return metrics
+
+
+class ReportRegistry:
+    """모델별 리포트 지표를 캐시하는 스레드 안전 레지스트리입니다.
+
+    조회할 때마다 CSV의 수정 시각(st_mtime_ns)만 확인하고, 바뀐 경우에만 다시 파싱합니다.
+    """
+
+    def __init__(self, reports, reports_dir):
+        self.reports = {report.key: report for report in reports}
+        self.reports_dir = Path(reports_dir)
+        self._lock = threading.Lock()
+        self._cache = {}
+
+    def __contains__(self, key):
+        return key in self.reports
+
+    def csv_path(self, key):
+        return self.reports_dir / self.reports[key].csv_name
+
+    def load_all(self):
+        """모든 리포트를 미리 읽어 둡니다 (시작 시 호출)."""
+        for key in self.reports:
+            self.get(key)
+
+    def get(self, key):
+        """(ModelReport, 지표 목록, 수정 시각 ns)를 반환합니다. 없는 모델이면 KeyError가 발생합니다."""
+        report = self.reports[key]
+        path = self.csv_path(key)
+        mtime = os.stat(path).st_mtime_ns
+
+        cached = self._cache.get(key)
+        if cached is None or cached[1] != mtime:
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached is None or cached[1] != mtime:
+                    cached = (read_metrics(path), mtime)
+                    self._cache[key] = cached
+        metrics, mtime = cached
+        return report, metrics, mtime
+
+
+_registry = None
+
+
+def get_registry():
+    """프로세스 전역 ReportRegistry를 반환합니다."""
+    global _registry
+    if _registry is None:
+        _registry = ReportRegistry(
+            MODEL_REPORTS, Path(settings.BASE_DIR) / 'maintenance' / 'ml' / 'reports'
+        )
+    return _registry
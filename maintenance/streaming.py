@@ -0,0 +1,183 @@
+"""
+연속 측정값 스트리밍 수집 엔드포인트 (ASGI)
+장시간 열려 있는 NDJSON(chunked) 업로드를 조각 단위로 읽어 마이크로 배치로 예측하고,
+결과를 한 줄씩 바로 돌려보냅니다.
+
+Django의 ASGI 핸들러는 뷰를 호출하기 전에 요청 본문 전체를 읽어 두기 때문에,
+이 엔드포인트는 config/asgi.py에서 Django보다 먼저 라우팅되는 순수 ASGI 앱으로 동작합니다.
+미들웨어를 거치지 않으므로 본문을 읽기 전에 Host(ALLOWED_HOSTS)와 CSRF 검사를 직접 수행합니다.
+"""
+import asyncio
+import io
+import json
+import logging
+
+from django.conf import settings
+from django.core.exceptions import DisallowedHost
+from django.core.handlers.asgi import ASGIRequest
+from django.middleware.csrf import CsrfViewMiddleware
+
+from . import views
+
+logger = logging.getLogger(__name__)
+
+# config/asgi.py에서 이 앱으로 보내는 경로
+STREAM_PATH = '/api/predict/stream/'
+
+
+class NDJSONLineSplitter:
+    """수신한 바이트 조각을 완성된 줄 단위로 나누는 클래스입니다.
+
+    아직 줄바꿈이 오지 않은 마지막 조각만 보관하므로 메모리 사용량은 max_line_bytes로 제한됩니다.
+    완성된 줄이든 마지막 조각이든 max_line_bytes를 넘는 줄이 있으면 ValueError를 발생시킵니다.
+    """
+
+    def __init__(self, max_line_bytes):
+        self.max_line_bytes = max_line_bytes
+        self._partial = bytearray()
+
+    def feed(self, chunk):
+        """바이트 조각을 받아 완성된 줄 목록을 반환합니다."""
+        self._partial += chunk
+        *lines, rest = self._partial.split(b'\n')
+        # 한 조각 안에 완성된 긴 줄과 아직 끝나지 않은 마지막 줄 모두 길이를 확인합니다
+        if max(map(len, lines), default=0) > self.max_line_bytes or len(rest) > self.max_line_bytes:
+            raise ValueError(f"한 줄의 길이는 {self.max_line_bytes}바이트를 넘을 수 없습니다")
+        self._partial = bytearray(rest)
+        return [line for line in lines if line.strip()]
+
+    def close(self):
+        """스트림 종료 시 줄바꿈 없이 남은 마지막 줄을 반환합니다."""
+        rest, self._partial = bytes(self._partial), bytearray()
+        return [rest] if rest.strip() else []
+
+
+def score_line(row, index):
+    """한 줄을 따로 예측합니다. 예외가 나면 그 줄의 오류 결과를 반환합니다."""
+    try:
+        return views.score_rows([row], start_index=index)[0]
+    except Exception as e:
+        return {'index': index, 'status': 'error', 'message': str(e)}
+
+
+def score_lines(lines, start_index):
+    """NDJSON 줄 목록을 파싱해 예측하고 결과 줄(bytes)을 반환합니다."""
+    rows, parse_errors = [], {}
+    for i, line in enumerate(lines):
+        try:
+            rows.append(json.loads(line))
+        except (ValueError, UnicodeDecodeError, RecursionError) as e:
+            rows.append(None)
+            parse_errors[i] = f"JSON 형식이 올바르지 않습니다: {str(e)}"
+
+    try:
+        results = views.score_rows(rows, start_index=start_index)
+    except Exception as e:
+        # 응답이 이미 시작되었으므로 한 줄 때문에 스트림이 끊기지 않게 줄마다 다시 예측해 실패한 줄만 오류로 돌려줍니다
+        logger.error("스트림 배치 예측 실패, 줄 단위로 다시 예측합니다: %s", str(e))
+        results = [score_line(row, start_index + i) for i, row in enumerate(rows)]
+    output = []
+    for i, (row, result) in enumerate(zip(rows, results)):
+        if i in parse_errors:
+            result['message'] = parse_errors[i]
+        # 여러 기계가 한 스트림을 공유할 수 있도록 machine_id를 그대로 돌려줍니다
+        if isinstance(row, dict) and 'machine_id' in row:
+            result['machine_id'] = row['machine_id']
+        output.append(json.dumps(result, ensure_ascii=False).encode('utf-8') + b'\n')
+    return output
+
+
+def check_request(scope):
+    """Django 요청과 같은 규칙으로 Host와 CSRF(Origin/Referer, 쿠키와 X-CSRFToken 헤더)를 검사합니다.
+
+    헤더만으로 검사하므로 본문은 읽지 않습니다. 통과하면 None, 실패하면 (상태 코드, 메시지)를 반환합니다.
+    """
+    request = ASGIRequest(scope, io.BytesIO())
+    try:
+        request.get_host()
+    except DisallowedHost as e:
+        logger.warning("스트림 요청 거부: %s", str(e))
+        return 400, '허용되지 않은 Host입니다.'
+
+    middleware = CsrfViewMiddleware(lambda request: None)
+    middleware.process_request(request)
+    if middleware.process_view(request, telemetry_stream, (), {}) is not None:
+        return 403, 'CSRF 검증에 실패했습니다.'
+    return None
+
+
+async def send_json(send, status, payload):
+    """단일 JSON 응답을 보냅니다."""
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json')],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def telemetry_stream(scope, receive, send):
+    """NDJSON 측정값 스트림을 받아 예측 결과를 NDJSON으로 스트리밍하는 ASGI 앱입니다.
+
+    요청 본문의 각 줄은 배치 API와 같은 필드(type, air_temperature, ...)를 가진 JSON 객체이며,
+    응답의 각 줄은 같은 순서의 예측 결과입니다.
+    """
+    if scope['method'] != 'POST':
+        await send_json(send, 405, {'status': 'error', 'message': '잘못된 요청 메소드입니다.'})
+        return
+
+    rejected = check_request(scope)
+    if rejected is not None:
+        status, message = rejected
+        await send_json(send, status, {'status': 'error', 'message': message})
+        return
+
+    # 첫 연결이면 모델을 로드하므로 이벤트 루프를 막지 않도록 스레드에서 확인합니다
+    if await asyncio.to_thread(views.get_predictor) is None:
+        await send_json(send, 503, {'status': 'error', 'message': 'ML 모델이 로드되지 않았습니다.'})
+        return
+
+    batch_size = getattr(settings, 'TELEMETRY_STREAM_BATCH_SIZE', 256)
+    splitter = NDJSONLineSplitter(getattr(settings, 'TELEMETRY_STREAM_MAX_LINE_BYTES', 65536))
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [(b'content-type', b'application/x-ndjson')],
+    })
+
+    scored = 0
+
+    async def flush(lines):
+        """줄 목록을 마이크로 배치로 나눠 스레드에서 예측하고 결과를 바로 보냅니다."""
+        nonlocal scored
+        for start in range(0, len(lines), batch_size):
+            batch = lines[start:start + batch_size]
+            output = await asyncio.to_thread(score_lines, batch, scored)
+            scored += len(batch)
+            await send({'type': 'http.response.body', 'body': b''.join(output), 'more_body': True})
+
+    try:
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                logger.info("스트림 연결 종료: %d행 처리", scored)
+                return
+            more_body = message.get('more_body', False)
+            lines = splitter.feed(message.get('body', b''))
+            if not more_body:
+                lines += splitter.close()
+            if lines:
+                await flush(lines)
+
+    except ValueError as e:
+        error = {'status': 'error', 'message': str(e)}
+        await send({
+            'type': 'http.response.body',
+            'body': json.dumps(error, ensure_ascii=False).encode('utf-8') + b'\n',
+            'more_body': True,
+        })
+
+    await send({'type': 'http.response.body', 'body': b''})
@@ -0,0 +1 @@
+# maintenance 템플릿 태그
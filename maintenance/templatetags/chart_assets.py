@@ -0,0 +1,20 @@
+from django import template
+from django.urls import reverse
+
+from maintenance import charts
+
+register = template.Library()
+
+
+@register.simple_tag
+def chart_figure_url(static_path):
+    """차트 HTML의 static 경로에 해당하는 figure JSON URL을 반환합니다 (빌드 전이면 빈 문자열)."""
+    filename = charts.get_manifest().get()['charts'].get(static_path)
+    return reverse('maintenance:chart_asset', args=[filename]) if filename else ''
+
+
+@register.simple_tag
+def chart_plotly_url():
+    """공통 plotly.js 번들 URL을 반환합니다 (빌드 전이면 빈 문자열)."""
+    filename = charts.get_manifest().get()['plotly']
+    return reverse('maintenance:chart_asset', args=[filename]) if filename else ''
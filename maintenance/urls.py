@@ -1,6 +1,7 @@
 # maintenance/urls.py
 from django.urls import path
 from . import views
+from .reports import MODEL_REPORTS
 
 app_name = 'maintenance'
 
@@ -18,12 +19,22 @@ app_name = 'maintenance'
 
 urlpatterns = [
     path('', views.index, name='index'),
-    path('logistic/', views.logistic_regression, name='logistic'),
-    path('knn/', views.knn_model, name='knn'),
-    path('svm/', views.svm_model, name='svm'),
-    path('decision_tree/', views.decision_tree, name='decision_tree'),
-    path('random_forest/', views.random_forest, name='random_forest'),
-    path('xgboost/', views.xgboost, name='xgboost'),
     path('simulator/', views.simulator, name='simulator'),
     path('api/predict/', views.predict_failure, name='predict_failure'),  # URL 패턴 수정
-]
\ No newline at end of file
+    path('api/predict/batch/', views.predict_failure_batch, name='predict_failure_batch'),
+    path('api/predict/cache/', views.prediction_cache_stats, name='prediction_cache_stats'),
+    path('api/predict/batcher/', views.predict_batcher_stats, name='predict_batcher_stats'),
+    path('api/timings/', views.request_timings, name='request_timings'),
+    path('api/history/<str:machine_id>/', views.machine_history, name='machine_history'),
+    path('api/trend/<str:machine_id>/', views.machine_trend, name='machine_trend'),
+    path('api/fleet/', views.fleet_risk, name='fleet_risk'),
+    path('api/model/', views.model_status, name='model_status'),
+    path('api/model/reload/', views.model_reload, name='model_reload'),
+    path('charts/<str:filename>', views.chart_asset, name='chart_asset'),
+]
+
+# 모델 성능 리포트 페이지 (/logistic/, /knn/, ...) - 모델은 reports.MODEL_REPORTS에 등록합니다
+urlpatterns += [
+    path(f'{report.key}/', views.model_report, {'model_key': report.key}, name=report.key)
+    for report in MODEL_REPORTS
+]
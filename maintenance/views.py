@@ -1,15 +1,31 @@
 # maintenance/views.py
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.template import Context
+from django.template.loader import get_template
+from django.template.loader_tags import ExtendsNode, IncludeNode
+from django.http import FileResponse, Http404, HttpResponseNotModified, JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import condition, require_GET, require_POST
 import csv
+import io
+import json
+import math
 import os
+import time
+from datetime import datetime, timedelta, timezone
 from django.conf import settings
 import logging
 import traceback
+from .ml import features as feature_pipeline
+from .ml.cache import PredictionCache
+from .ml.grid import PredictionGrid, model_digest
+from .ml.holder import ModelHolder
 from .ml.predictor import MillingMachinePredictor
+from .ml.registry import MODEL_FILES, PRIMARY_MODEL, ModelRegistry
 from .ml.models.config import MLConfig
 from pathlib import Path
-from .models import SimulatorInput, SimulatorOutput
+from django.utils.dateparse import parse_datetime
+from . import charts, fleet, history, instrumentation, machine_state, prediction_log, reports
 
 # 로거 설정으로 디버깅과 오류 추적을 용이하게 합니다
 logger = logging.getLogger(__name__)
@@ -23,16 +39,159 @@ def handle_error(error, error_type="일반 오류"):
         'message': f'{error_type}가 발생했습니다: {str(error)}'
     })
 
-# 애플리케이션 시작 시 XGBoost 모델을 메모리에 로드합니다
-try:
-    model_path = Path(settings.BASE_DIR) / 'maintenance' / 'ml' / 'models' / 'model_xgboost.json'
-    scaler_path = Path(settings.BASE_DIR) / 'maintenance' / 'ml' / 'models' / 'scaler_params.json'
-    predictor = MillingMachinePredictor(model_path, scaler_path)
-    logger.info("XGBoost 모델 로드 및 스케일러 로드 성공!")
+# 모델/스케일러 파일 경로
+model_path = Path(settings.BASE_DIR) / 'maintenance' / 'ml' / 'models' / 'model_xgboost.json'
+scaler_path = Path(settings.BASE_DIR) / 'maintenance' / 'ml' / 'models' / 'scaler_params.json'
+
+# 예측 캐시는 모델 버전이 바뀌어도 같은 객체를 사용합니다 (버전이 바뀌면 스스로 비워집니다)
+prediction_cache = None
+if getattr(settings, 'PREDICTION_CACHE_ENABLED', False):
+    prediction_cache = PredictionCache(
+        max_size=getattr(settings, 'PREDICTION_CACHE_SIZE', 4096),
+        ttl=getattr(settings, 'PREDICTION_CACHE_TTL', 300.0),
+        decimals=getattr(settings, 'PREDICTION_CACHE_DECIMALS', 2)
+    )
+
+def load_prediction_grid():
+    """확률 격자를 열고, 현재 모델 파일로 만든 격자가 아니면 None을 반환합니다."""
+    if not getattr(settings, 'PREDICTION_GRID_ENABLED', False):
+        return None
+    try:
+        prediction_grid = PredictionGrid.load(settings.PREDICTION_GRID_PATH)
+        if prediction_grid.digest != model_digest(model_path, scaler_path):
+            logger.warning("확률 격자가 현재 모델과 다릅니다. build_prediction_grid를 다시 실행하세요.")
+            return None
+        return prediction_grid
+    except (OSError, ValueError) as e:
+        logger.warning(f"확률 격자 로드 실패, 모델로만 예측합니다: {str(e)}")
+        return None
+
+_inference_pool = None
+
+def get_inference_pool():
+    """설정에서 켜져 있으면 프로세스 전역 추론 프로세스 풀을 반환합니다.
 
-except Exception as e:
-    logger.error(f"XGBoost 모델, 스케일러 로드 실패: {str(e)}")
-    predictor = None
+    풀 워커는 작업마다 모델 파일 상태를 확인해 스스로 다시 로드하므로 모델 버전이 바뀌어도 풀은 유지됩니다.
+    """
+    global _inference_pool
+    if not getattr(settings, 'INFERENCE_POOL_ENABLED', False):
+        return None
+    if _inference_pool is None:
+        from .ml.process_pool import InferencePool
+        _inference_pool = InferencePool(
+            model_path, scaler_path,
+            engine=getattr(settings, 'PREDICTOR_ENGINE', 'xgboost'),
+            workers=getattr(settings, 'INFERENCE_POOL_WORKERS', None),
+            max_batch_rows=getattr(settings, 'INFERENCE_POOL_MAX_BATCH_ROWS', 4096),
+            min_rows=getattr(settings, 'INFERENCE_POOL_MIN_ROWS', 2048)
+        )
+    return _inference_pool
+
+_batcher = None
+
+def get_batcher():
+    """설정에서 켜져 있으면 단일 예측 요청을 모아 처리하는 프로세스 전역 MicroBatcher를 반환합니다."""
+    global _batcher
+    if not getattr(settings, 'PREDICT_BATCHER_ENABLED', False):
+        return None
+    if _batcher is None:
+        from .ml.batcher import MicroBatcher
+        _batcher = MicroBatcher(
+            max_batch_rows=getattr(settings, 'PREDICT_BATCHER_MAX_ROWS', 64),
+            max_wait_ms=getattr(settings, 'PREDICT_BATCHER_MAX_WAIT_MS', 2.0)
+        )
+    return _batcher
+
+def load_models():
+    """XGBoost 예측기와 비교 모델 레지스트리를 새로 만듭니다 (ModelHolder의 loader)."""
+    predictor = MillingMachinePredictor(
+        model_path, scaler_path,
+        engine=getattr(settings, 'PREDICTOR_ENGINE', 'xgboost'),
+        cache=prediction_cache,
+        grid=load_prediction_grid(),
+        grid_method=getattr(settings, 'PREDICTION_GRID_METHOD', 'linear'),
+        tree_cache_dir=getattr(settings, 'PREDICTOR_TREE_CACHE_DIR', None),
+        pool=get_inference_pool(),
+        batcher=get_batcher(),
+        explain_exact_max_rows=getattr(settings, 'PREDICTION_EXPLAIN_EXACT_MAX_ROWS', 64)
+    )
+    # 비교 모델들은 ?models= 요청에서 처음 사용할 때 로드됩니다
+    model_registry = ModelRegistry(
+        predictor, model_path.parent,
+        max_workers=getattr(settings, 'MODEL_REGISTRY_WORKERS', 6)
+    )
+    return predictor, model_registry
+
+# 모델은 ModelHolder가 버전 단위로 보관하며, 파일이 바뀌면 재시작 없이 교체됩니다
+model_holder = ModelHolder(
+    load_models,
+    watched_paths=[model_path, scaler_path],
+    sample={'type': 'M', 'Air_Temperature': 300.0, 'Process_Temperature': 310.0,
+            'Rotational_Speed': 1500, 'Torque': 40.0, 'Tool_Wear': 100},
+    poll_interval=getattr(settings, 'MODEL_RELOAD_POLL_INTERVAL', 5.0),
+    retry_base=getattr(settings, 'MODEL_RELOAD_RETRY_BASE', 1.0),
+    retry_max=getattr(settings, 'MODEL_RELOAD_RETRY_MAX', 300.0)
+)
+
+# 모델은 import 시점이 아니라 첫 예측 요청(또는 warm_up 호출) 때 로드합니다.
+# 예측하지 않는 페이지와 manage.py 명령은 xgboost import와 모델 로드 비용을 치르지 않습니다.
+def get_model_version():
+    """현재 서비스 중인 모델 버전을 반환합니다 (로드에 실패했으면 None).
+
+    처음 호출될 때 모델을 로드하며, 파일 감시 스레드는 fork 이후 자식 프로세스에서도
+    동작하도록 여기서 확인합니다.
+    """
+    if getattr(settings, 'MODEL_RELOAD_WATCH', False):
+        model_holder.start_watcher()
+    version = model_holder.current
+    if version is not None:
+        return version
+    # 첫 요청에서 일어나는 모델 로드는 별도 단계로 기록합니다
+    with instrumentation.stage('model_load'):
+        return model_holder.ensure_loaded()
+
+def warm_up(start_watcher=True):
+    """워커 프로세스가 요청을 받기 전에 모델을 미리 로드합니다 (fork 이후 호출용 훅).
+
+    config/gunicorn.conf.py의 post_worker_init에서 호출하며, 로드 결과를 반환합니다.
+    preload 모드에서 fork 전 마스터 프로세스가 호출할 때는 start_watcher=False로 감시 스레드를 띄우지 않습니다.
+    """
+    start = time.perf_counter()
+    version = get_model_version() if start_watcher else model_holder.ensure_loaded('사전 로드')
+    if version is None:
+        logger.error(f"XGBoost 모델, 스케일러 로드 실패: {model_holder.last_error}")
+        return False
+    logger.info("XGBoost 모델 로드 및 스케일러 로드 성공! (%.0fms)", (time.perf_counter() - start) * 1000)
+    return True
+
+def get_predictor():
+    """현재 버전의 예측기를 반환합니다. 요청마다 한 번만 호출해 지역 변수로 사용합니다."""
+    version = get_model_version()
+    return version.predictor if version is not None else None
+
+# 모델 성능 리포트 CSV를 미리 읽어 둡니다 (이후에는 파일이 바뀐 리포트만 다시 읽습니다)
+try:
+    reports.get_registry().load_all()
+except (OSError, KeyError, ValueError) as e:
+    logger.error(f"모델 리포트 로드 실패: {str(e)}")
+
+# 예측 입력 필드 (시뮬레이터 폼과 배치 API가 공통으로 사용)
+REQUIRED_FIELDS = [
+    'type',
+    'air_temperature',
+    'process_temperature',
+    'rotational_speed',
+    'torque',
+    'tool_wear'
+]
+
+# 예측 결과 문자열을 SimulatorOutput.prediction 값으로 변환합니다
+PREDICTION_CODES = {
+    'none': 0,  # 정상 상태
+    'HDF': 2,   # 열 발산 고장
+    'PWF': 3,   # 전력 고장
+    'OSF': 4    # 과부하 고장
+}
 
 def index(request):
     """메인 랜딩 페이지를 렌더링합니다"""
@@ -40,9 +199,8 @@ def index(request):
 
 def simulator(request):
     """시뮬레이터 페이지를 렌더링합니다"""
-    context = {}
-    if predictor:
-        context['feature_ranges'] = MLConfig.FEATURE_CONFIG['features']
+    # 입력 범위는 설정값이므로 모델을 로드하지 않습니다 (모델은 첫 예측 요청에서 로드됩니다)
+    context = {'feature_ranges': MLConfig.FEATURE_CONFIG['features']}
     return render(request, 'simulator.html', context)
 
 def predict_failure(request):
@@ -54,7 +212,9 @@ def predict_failure(request):
             'message': '잘못된 요청 메소드입니다.'
         })
     
-    if predictor is None:
+    # 요청 처리 중에 모델이 교체되어도 이 요청은 처음 잡은 버전으로 끝까지 처리합니다
+    version = get_model_version()
+    if version is None:
         logger.error("ML 모델이 로드되지 않았습니다.")
         return JsonResponse({
             'status': 'error',
@@ -62,55 +222,29 @@ def predict_failure(request):
         })
 
     try:
-        # POST 데이터 상세 로깅
-        logger.info("받은 POST 데이터: %s", request.POST)
-        
-        # 필수 입력 필드 검증
-        required_fields = [
-            'type',
-            'air_temperature',
-            'process_temperature',
-            'rotational_speed',
-            'torque',
-            'tool_wear'
-        ]
-        
-        # POST 데이터 상세 로깅
-        logger.info("POST 데이터 상세:")
-        for field in required_fields:
-            logger.info(f"{field}: {request.POST.get(field)}")
+        # 요청별 상세 입력/결과는 샘플링된 요청에만 구조화 로그로 남깁니다 (instrumentation.payload)
+        for field in REQUIRED_FIELDS:
             if not request.POST.get(field):
                 logger.error("필수 필드 누락: %s", field)
                 return handle_error(f"필수 필드 누락: {field}", "유효성 검사 오류")
         
         try:
-            # 사용자 입력값을 데이터베이스에 저장 (기본값 설정)
-            simulator_input = SimulatorInput.objects.create(
-                type=request.POST.get('type', 'L'),
-                air_temperature=float(request.POST.get('air_temperature', 295.3)),
-                process_temperature=float(request.POST.get('process_temperature', 305.7)),
-                rotational_speed=int(float(request.POST.get('rotational_speed', 1168))),
-                torque=float(request.POST.get('torque', 3.8)),
-                tool_wear=int(float(request.POST.get('tool_wear', 0)))
-            )
-            logger.info("데이터베이스 저장 완료: %s", simulator_input)
-            
             # 예측을 위한 입력 데이터 준비 - predictor 형식에 맞게 변환
-            input_data = {
-                'type': simulator_input.type,
-                'Air_Temperature': simulator_input.air_temperature,
-                'Process_Temperature': simulator_input.process_temperature,
-                'Rotational_Speed': simulator_input.rotational_speed,
-                'Torque': simulator_input.torque,
-                'Tool_Wear': simulator_input.tool_wear
-            }
-            
-            logger.info("Predictor 입력 데이터 변환: %s", input_data)
+            with instrumentation.stage('parse'):
+                input_data = to_predictor_input(request.POST)
+            instrumentation.payload(input=input_data)
             
+            # ?models=all 또는 ?models=knn,xgboost 이면 여러 모델로 병렬 예측해 비교합니다
+            if request.GET.get('models'):
+                return predict_with_models(version.registry, input_data, request.GET['models'])
+
             # 예측 수행
             try:
-                result = predictor.predict(input_data)
-                logger.info("예측 성공: %s", result)
+                # exact=1 이면 격자 보간 없이 항상 모델로 예측하고, explain=1 이면 특성 기여도 설명을 추가합니다
+                exact = request.POST.get('exact') in ('1', 'true')
+                explain = is_explain_requested(request)
+                result = version.predictor.predict_fast(input_data, exact=exact, explain=explain)
+                instrumentation.payload(result=result)
             except Exception as e:
                 logger.error("예측 실패: %s", str(e))
                 logger.error("입력 데이터: %s", input_data)
@@ -121,21 +255,14 @@ def predict_failure(request):
                 return JsonResponse(result)
             
             # 예측 결과의 문자열을 숫자로 변환
-            prediction_value = {
-                'none': 0,  # 정상 상태
-                'HDF': 2,   # 열 발산 고장
-                'PWF': 3,   # 전력 고장
-                'OSF': 4    # 과부하 고장
-            }.get(result['prediction'], 0)
+            prediction_value = PREDICTION_CODES.get(result['prediction'], 0)
             
-            # 예측 결과를 데이터베이스에 저장
-            simulator_output = SimulatorOutput.objects.create(
-                id=simulator_input,  # OneToOne 관계로 입력값과 연결
-                prediction=prediction_value
-            )
-            logger.info("예측 결과 저장 완료: %s", simulator_output)
+            # 입력값과 예측 결과는 write-behind 버퍼를 통해 응답 이후에 저장됩니다
+            with instrumentation.stage('db_write'):
+                prediction_log.get_writer().record(input_data, prediction_value, result['probabilities'])
             
-            return JsonResponse(result)
+            with instrumentation.stage('serialize'):
+                return JsonResponse(result)
             
         except (ValueError, TypeError) as e:
             logger.error("데이터 형식 오류: %s", str(e))
@@ -147,197 +274,357 @@ def predict_failure(request):
         logger.error("상세 오류: %s", traceback.format_exc())
         return handle_error(str(e), "예측 오류")
 
-def logistic_regression(request):
-    """
-    로지스틱 회귀 모델의 성능 분석 결과를 보여주는 뷰 함수입니다.
-    CSV 파일에서 성능 지표를 읽어와서 시각화된 결과를 제공합니다.
+def predict_with_models(model_registry, input_data, models_param):
+    """비교 모델 레지스트리로 하나의 입력을 여러 모델에서 예측하고 모델별 결과와 소요 시간을 반환합니다."""
+    if models_param == 'all':
+        keys = None
+    else:
+        keys = [key.strip() for key in models_param.split(',') if key.strip()]
+        unknown = [key for key in keys if key not in MODEL_FILES]
+        if unknown:
+            return handle_error(f"알 수 없는 모델입니다: {', '.join(unknown)}", "유효성 검사 오류")
+
+    result = model_registry.predict_all(input_data, keys)
+
+    # 기록은 기존과 같이 기본 모델(XGBoost)의 예측만 저장합니다
+    primary = result.get('models', {}).get(PRIMARY_MODEL)
+    if primary is not None and primary['status'] == 'success':
+        prediction_log.get_writer().record(
+            input_data, PREDICTION_CODES.get(primary['prediction'], 0), primary['probabilities']
+        )
+
+    return JsonResponse(result)
+
+def prediction_cache_stats(request):
+    """예측 캐시의 적중/실패 카운터를 반환합니다 (캐시 크기 조정용)."""
+    # 캐시는 모델 버전과 무관한 객체이므로 모델을 로드하지 않고 바로 조회합니다
+    if prediction_cache is None:
+        return JsonResponse({'status': 'success', 'enabled': False})
+    return JsonResponse({'status': 'success', 'enabled': True, **prediction_cache.stats()})
+
+def predict_batcher_stats(request):
+    """마이크로 배칭의 배치 크기와 큐 대기 시간 히스토그램을 반환합니다."""
+    batcher = get_batcher()
+    if batcher is None:
+        return JsonResponse({'status': 'success', 'enabled': False})
+    return JsonResponse({'status': 'success', 'enabled': True, **batcher.stats()})
+
+@require_GET
+def request_timings(request):
+    """요청 단계별(parse, preprocess, model, db_write, serialize, total) 소요 시간 히스토그램(ms)을 반환합니다."""
+    return JsonResponse({'status': 'success', 'stages': instrumentation.stage_stats.snapshot()})
+
+@require_GET
+def machine_history(request, machine_id):
+    """기계의 예측 기록 시계열을 반환합니다.
+
+    start/end(ISO 8601) 또는 hours(기본 24)로 기간을 지정합니다. 짧은 기간은 원본 기록을,
+    긴 기간은 1분 롤업을 분/시간/일 단위로 묶어 반환하며 resolution(raw/minute/hour/day)으로 직접 고를 수 있습니다.
     """
-    csv_path = os.path.join(
-        settings.BASE_DIR,
-        'maintenance/ml/reports/classification_report_logistic.csv'
-    )
-
-    # CSV 파일에서 성능 지표를 읽어와 백분율로 변환합니다
-    metrics = []
-    with open(csv_path,'r',encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            metrics.append({
-                'name': row['name'],
-                'precision': float(row['precision'])*100,
-                'recall': float(row['recall'])*100,
-                'f1_score': float(row['f1_score'])*100,
-            })
-
-    # 성능 분석 결과를 템플릿에 전달할 컨텍스트를 준비합니다
-    context = {
-        'selected_model': 'logistic',
-        'report_data': metrics,
-        'accuracy': 87.50,
-        'graph_file': 'images/graphs/roc_curve_logistic_2.html',
-        'matrix_file': 'images/confusion_matrix/confusion_matrix_logistic.html',
-        'explanation': '로지스틱 회귀 모델의 성능 분석 결과입니다.'
-    }
+    try:
+        end = parse_datetime(request.GET['end']) if 'end' in request.GET else datetime.now(timezone.utc)
+        if 'start' in request.GET:
+            start = parse_datetime(request.GET['start'])
+        else:
+            start = end - timedelta(hours=float(request.GET.get('hours', 24))) if end else None
+        if start is None or end is None:
+            raise ValueError("start/end는 ISO 8601 형식이어야 합니다")
+        start, end = (value if value.tzinfo else value.replace(tzinfo=timezone.utc) for value in (start, end))
+        if start >= end:
+            raise ValueError("start는 end보다 이전이어야 합니다")
+        resolution = request.GET.get('resolution') or None
+        if resolution not in (None, 'raw') + history.RESOLUTIONS:
+            raise ValueError(f"지원하지 않는 해상도입니다: {resolution}")
+    except (ValueError, OverflowError) as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+
+    result = history.history(machine_id, start, end, resolution)
+    return JsonResponse({
+        'status': 'success',
+        'machine_id': machine_id,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        **result
+    })
 
-    return render(request, 'model_comparison.html', context)
+@require_GET
+def machine_trend(request, machine_id):
+    """기계의 최근 측정값 추세와 고장 유형별 확률이 임계값(threshold, 기본 설정값)에 도달하는 예상 시간을 반환합니다.
 
-def knn_model(request):
+    기계별 상태는 새 예측 기록만 반영해 증분 갱신하므로 대시보드가 자주 새로고침해도 전체 기록을 다시 읽지 않습니다.
     """
-    K-최근접 이웃 모델의 성능 분석 결과를 보여주는 뷰 함수입니다.
-    CSV 파일에서 읽은 성능 지표를 시각화하여 제공합니다.
-    """
-    csv_path = os.path.join(
-        settings.BASE_DIR,
-        'maintenance/ml/reports/classification_report_knn.csv'
-    )
+    try:
+        threshold = float(request.GET.get('threshold', getattr(settings, 'MACHINE_STATE_THRESHOLD', 0.5)))
+        if not 0 < threshold < 1:
+            raise ValueError("threshold는 0과 1 사이여야 합니다")
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
 
-    # 성능 지표 데이터를 읽어옵니다
-    metrics = []
-    with open(csv_path, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            metrics.append({
-                'name': row['name'],
-                'precision': float(row['precision']) * 100,
-                'recall': float(row['recall']) * 100,
-                'f1_score': float(row['f1_score']) * 100,
-            })
+    predictor = get_predictor()
+    if predictor is None:
+        return JsonResponse({'status': 'error', 'message': 'ML 모델이 로드되지 않았습니다.'}, status=503)
 
-    context = {
-        'selected_model': 'knn',
-        'report_data': metrics,
-        'accuracy': 93.78,
-        'graph_file': 'images/graphs/roc_curve_knn_2.html',
-        'matrix_file': 'images/confusion_matrix/confusion_matrix_knn.html',
-        'explanation': 'k-최근접 이웃 알고리즘 모델의 성능 분석 결과입니다.'
-    }
+    trend = machine_state.get_store().trend(
+        machine_id, predictor, threshold,
+        horizon_hours=getattr(settings, 'MACHINE_STATE_HORIZON_HOURS', 24.0),
+        steps=getattr(settings, 'MACHINE_STATE_HORIZON_STEPS', 97)
+    )
+    if trend is None:
+        return JsonResponse({'status': 'error', 'message': f'측정값 기록이 없는 기계입니다: {machine_id}'}, status=404)
+    return JsonResponse({'status': 'success', 'machine_id': machine_id, **trend})
 
-    return render(request, 'model_comparison.html', context)
+@require_GET
+def fleet_risk(request):
+    """전체 기계의 현재 고장 확률 분포, 예측 고장 유형별 기계 수, 위험 상위 k개(기본 설정값) 기계를 반환합니다.
 
-def svm_model(request):
+    기계별 최신 예측을 메모리에서 증분으로 집계하므로 응답 시간은 기계 수나 기록 양과 거의 무관합니다.
     """
-    서포트 벡터 머신(SVM) 모델의 성능 분석 결과를 보여주는 뷰 함수입니다.
-    정밀도, 재현율, F1 점수 등의 성능 지표를 시각화합니다.
+    try:
+        k = int(request.GET.get('k', getattr(settings, 'FLEET_TOP_K', 10)))
+        if not 1 <= k <= 100:
+            raise ValueError("k는 1에서 100 사이여야 합니다")
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    return JsonResponse({'status': 'success', **fleet.get_monitor().snapshot(k)})
+
+@require_GET
+def model_status(request):
+    """서비스 중인 모델 버전과 마지막 로드/재시도 상태를 반환합니다."""
+    return JsonResponse({'status': 'success', **model_holder.status()})
+
+@require_POST
+def model_reload(request):
+    """관리자 요청으로 모델을 다시 로드합니다.
+
+    로드는 백그라운드에서 진행되며, wait=1 이면 검증과 교체가 끝날 때까지 기다렸다가 결과를 반환합니다.
     """
-    csv_path = os.path.join(
-        settings.BASE_DIR,
-        'maintenance/ml/reports/classification_report_svm.csv'
-    )
+    if not request.user.is_staff:
+        return JsonResponse({'status': 'error', 'message': '관리자만 모델을 다시 로드할 수 있습니다.'}, status=403)
 
-    metrics = []
-    with open(csv_path, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            metrics.append({
-                'name': row['name'],
-                'precision': float(row['precision']) * 100,
-                'recall': float(row['recall']) * 100,
-                'f1_score': float(row['f1_score']) * 100,
-            })
+    thread = model_holder.reload_async(f"관리자 요청 ({request.user.get_username()})")
+    if request.POST.get('wait') in ('1', 'true'):
+        thread.join(timeout=getattr(settings, 'MODEL_RELOAD_WAIT_TIMEOUT', 60.0))
+        return JsonResponse({'status': 'success', **model_holder.status()})
+    return JsonResponse({'status': 'accepted', **model_holder.status()}, status=202)
 
-    context = {
-        'selected_model': 'svm',
-        'report_data': metrics,
-        'accuracy': 96.46,
-        'graph_file': 'images/graphs/roc_curve_svm_2.html',
-        'matrix_file': 'images/confusion_matrix/confusion_matrix_svm.html',
-        'explanation': '서포트 벡터 머신 모델의 성능 분석 결과입니다.'
-    }
+@require_GET
+def chart_asset(request, filename):
+    """빌드된 차트 자산(plotly.js 번들, figure JSON)을 사전 압축본과 장기 캐시 헤더로 제공합니다.
 
-    return render(request, 'model_comparison.html', context)
-
-def decision_tree(request):
+    파일명에 내용 해시가 들어 있으므로 한 번 받은 파일은 바뀌지 않는 것으로 보고 immutable로 캐시합니다.
     """
-    의사결정나무 모델의 성능 분석 결과를 보여주는 뷰 함수입니다.
-    모델의 분류 성능을 다양한 지표로 평가하여 시각화합니다.
+    if filename not in charts.get_manifest().filenames():
+        raise Http404("차트 자산을 찾을 수 없습니다")
+
+    etag = '"%s"' % filename
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponseNotModified()
+    else:
+        path, encoding = charts.negotiate_encoding(request.headers.get('Accept-Encoding', ''), filename)
+        content_type = 'text/javascript' if filename.endswith('.js') else 'application/json'
+        response = FileResponse(open(path, 'rb'), filename=filename, content_type=f'{content_type}; charset=utf-8')
+        if encoding:
+            response['Content-Encoding'] = encoding
+
+    response['ETag'] = etag
+    response['Vary'] = 'Accept-Encoding'
+    response['Cache-Control'] = 'public, max-age=%d, immutable' % getattr(settings, 'CHART_ASSETS_MAX_AGE', 31536000)
+    return response
+
+def parse_batch_rows(request):
+    """배치 요청 본문을 행(dict) 목록으로 변환합니다.
+
+    CSV 파일 업로드('file' 필드) 또는 JSON 배열/{"readings": [...]} 본문을 지원합니다.
     """
-    csv_path = os.path.join(
-        settings.BASE_DIR,
-        'maintenance/ml/reports/classification_report_dtc.csv'
-    )
+    if 'file' in request.FILES:
+        text = io.TextIOWrapper(request.FILES['file'], encoding='utf-8-sig')
+        return list(csv.DictReader(text))
 
-    metrics = []
-    with open(csv_path, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            metrics.append({
-                'name': row['name'],
-                'precision': float(row['precision']) * 100,
-                'recall': float(row['recall']) * 100,
-                'f1_score': float(row['f1_score']) * 100,
-            })
-
-    context = {
-        'selected_model': 'decision_tree',
-        'report_data': metrics,
-        'accuracy': 97.56,
-        'graph_file': 'images/graphs/roc_curve_decision_tree_2.html',
-        'matrix_file': 'images/confusion_matrix/confusion_matrix_dtc.html',
-        'explanation': '의사결정나무 모델의 성능 분석 결과입니다.'
+    try:
+        payload = json.loads(request.body)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"JSON 형식이 올바르지 않습니다: {str(e)}")
+
+    if isinstance(payload, dict):
+        payload = payload.get('readings')
+    if not isinstance(payload, list):
+        raise ValueError("입력은 JSON 배열이거나 'readings' 배열을 포함해야 합니다")
+    return payload
+
+def is_explain_requested(request):
+    """쿼리 문자열이나 폼 필드에 explain=1(또는 true)이 있는지 확인합니다."""
+    return (request.GET.get('explain') or request.POST.get('explain')) in ('1', 'true')
+
+def to_predictor_input(row):
+    """폼/배치 입력 행을 단일 예측과 같은 규칙으로 predictor 입력 형식으로 변환합니다."""
+    if not isinstance(row, dict):
+        raise ValueError("입력 행은 객체 형식이어야 합니다")
+    for field in REQUIRED_FIELDS:
+        if row.get(field) in (None, ''):
+            raise ValueError(f"필수 필드 누락: {field}")
+    values = [float(row[field]) for field in REQUIRED_FIELDS[1:]]
+    # JSON은 Infinity/1e999도 받으므로 int() 변환 전에 유한한 값인지 확인합니다
+    if not all(map(math.isfinite, values)):
+        raise ValueError(feature_pipeline.NOT_FINITE_MESSAGE)
+    air_temperature, process_temperature, rotational_speed, torque, tool_wear = values
+    input_data = {
+        'type': row['type'],
+        'Air_Temperature': air_temperature,
+        'Process_Temperature': process_temperature,
+        'Rotational_Speed': int(rotational_speed),
+        'Torque': torque,
+        'Tool_Wear': int(tool_wear)
     }
+    # 기계 ID는 예측에는 쓰지 않고 예측 기록에만 저장합니다
+    if row.get('machine_id'):
+        input_data['machine_id'] = str(row['machine_id'])[:64]
+    return input_data
+
+def score_rows(rows, start_index=0, record=True, exact=True, explain=False):
+    """입력 행 목록을 한 번에 예측하고, 성공한 행을 예측 기록 버퍼에 넣습니다.
+
+    결과는 입력 순서대로 반환되며 index는 start_index부터 매겨집니다.
+    record=False이면 데이터베이스에 기록하지 않습니다 (실시간 미리보기 등).
+    exact=False이면 확률 격자가 있을 때 격자 보간값으로 응답합니다.
+    explain=True이면 성공한 행마다 특성 기여도 설명을 추가합니다.
+    """
+    predictor = get_predictor()
+    if predictor is None:
+        raise RuntimeError("ML 모델이 로드되지 않았습니다.")
 
-    return render(request, 'model_comparison.html', context)
+    # 행 단위로 입력을 변환하고, 변환에 실패한 행은 오류로 기록합니다
+    results = [None] * len(rows)
+    records, positions = [], []
+    with instrumentation.stage('parse'):
+        for i, row in enumerate(rows):
+            try:
+                records.append(to_predictor_input(row))
+                positions.append(i)
+            except (KeyError, TypeError, ValueError, OverflowError) as e:
+                results[i] = {'index': start_index + i, 'status': 'error', 'message': str(e)}
+
+    predictions = predictor.predict_batch(records, exact=exact, explain=explain)
+    for position, result in zip(positions, predictions):
+        result['index'] = start_index + position
+        results[position] = result
+
+    if not record:
+        return results
+
+    # 성공한 행의 입력값과 결과는 write-behind 버퍼를 통해 일괄 저장됩니다
+    with instrumentation.stage('db_write'):
+        prediction_log.get_writer().record_many(
+            (record, PREDICTION_CODES.get(result['prediction'], 0), result['probabilities'])
+            for record, result in zip(records, predictions)
+            if result['status'] == 'success'
+        )
+    return results
+
+def predict_failure_batch(request):
+    """배치 예측 API 엔드포인트
+    여러 측정값을 한 번에 예측하고 행별 결과와 검증 오류를 반환합니다."""
+    if request.method != 'POST':
+        logger.error("잘못된 요청 메소드: %s", request.method)
+        return JsonResponse({
+            'status': 'error',
+            'message': '잘못된 요청 메소드입니다.'
+        })
 
-def random_forest(request):
-    """
-    랜덤 포레스트 모델의 성능 분석 결과를 보여주는 뷰 함수입니다.
-    앙상블 학습 모델의 우수한 분류 성능을 다양한 지표로 보여줍니다.
-    """
-    csv_path = os.path.join(
-        settings.BASE_DIR,
-        'maintenance/ml/reports/classification_report_rfc.csv'
-    )
+    if get_predictor() is None:
+        logger.error("ML 모델이 로드되지 않았습니다.")
+        return JsonResponse({
+            'status': 'error',
+            'message': 'ML 모델이 로드되지 않았습니다.'
+        })
 
-    metrics = []
-    with open(csv_path, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            metrics.append({
-                'name': row['name'],
-                'precision': float(row['precision']) * 100,
-                'recall': float(row['recall']) * 100,
-                'f1_score': float(row['f1_score']) * 100,
-            })
+    try:
+        with instrumentation.stage('parse'):
+            rows = parse_batch_rows(request)
+    except ValueError as e:
+        return handle_error(str(e), "유효성 검사 오류")
 
-    context = {
-        'selected_model': 'random_forest',
-        'report_data': metrics,
-        'accuracy': 97.59,
-        'graph_file': 'images/graphs/roc_curve_random_forest_2.html',
-        'matrix_file': 'images/confusion_matrix/confusion_matrix_rfc.html',
-        'explanation': '랜덤 포레스트 모델의 성능 분석 결과입니다.'
-    }
+    max_rows = getattr(settings, 'PREDICT_BATCH_MAX_ROWS', 10000)
+    if len(rows) > max_rows:
+        return handle_error(f"한 번에 최대 {max_rows}개 행까지 예측할 수 있습니다", "유효성 검사 오류")
 
-    return render(request, 'model_comparison.html', context)
+    # 설명(explain=1)은 행마다 트리 전체를 계산하므로 더 작은 행 수로 제한합니다
+    explain = is_explain_requested(request)
+    max_explain_rows = getattr(settings, 'PREDICTION_EXPLAIN_MAX_ROWS', 1000)
+    if explain and len(rows) > max_explain_rows:
+        return handle_error(f"설명(explain=1)은 한 번에 최대 {max_explain_rows}개 행까지 요청할 수 있습니다", "유효성 검사 오류")
+
+    try:
+        results = score_rows(rows, explain=explain)
+
+        succeeded = sum(1 for result in results if result['status'] == 'success')
+        instrumentation.payload(count=len(rows), succeeded=succeeded)
+
+        with instrumentation.stage('serialize'):
+            return JsonResponse({
+                'status': 'success',
+                'count': len(rows),
+                'succeeded': succeeded,
+                'failed': len(rows) - succeeded,
+                'results': results
+            })
 
-def xgboost(request):
+    except Exception as e:
+        return handle_error(str(e), "배치 예측 오류")
+
+def template_mtime(name, seen=None):
+    """템플릿과 그 템플릿이 상속({% extends %})/포함({% include %})하는 템플릿 파일들의 최신 수정 시각(ns)을 반환합니다."""
+    seen = set() if seen is None else seen
+    if name in seen:
+        return 0
+    seen.add(name)
+    template = get_template(name).template
+    mtime = os.stat(template.origin.name).st_mtime_ns
+    for node in template.nodelist.get_nodes_by_type((ExtendsNode, IncludeNode)):
+        # 변수로 정한 템플릿 이름은 요청마다 달라질 수 있으므로 문자열 상수만 따라갑니다
+        parent = (node.parent_name if isinstance(node, ExtendsNode) else node.template).resolve(Context())
+        if isinstance(parent, str) and parent:
+            mtime = max(mtime, template_mtime(parent, seen))
+    return mtime
+
+def report_page_mtime(request, model_key):
+    """리포트 페이지 내용을 결정하는 파일들(CSV, 차트 매니페스트, 상속 템플릿 포함)의 최신 수정 시각(ns)을 반환합니다."""
+    registry = reports.get_registry()
+    if model_key not in registry:
+        return None
+    _, _, report_mtime = registry.get(model_key)
+    return max(report_mtime, charts.get_manifest().mtime() or 0, template_mtime('model_comparison.html'))
+
+def report_etag(request, model_key):
+    mtime = report_page_mtime(request, model_key)
+    return f'{model_key}-{mtime:x}' if mtime is not None else None
+
+def report_last_modified(request, model_key):
+    mtime = report_page_mtime(request, model_key)
+    return datetime.fromtimestamp(mtime / 1e9, tz=timezone.utc) if mtime is not None else None
+
+@condition(etag_func=report_etag, last_modified_func=report_last_modified)
+def model_report(request, model_key):
     """
-    XGBoost 모델의 성능 분석 결과를 보여주는 뷰 함수입니다.
-    그라디언트 부스팅의 강력한 성능을 다양한 지표로 시각화합니다.
+    모델 성능 분석 결과를 보여주는 뷰 함수입니다.
+    리포트 레지스트리에 캐시된 지표를 사용하며, 리포트가 바뀌지 않았으면 304로 응답합니다.
     """
-    csv_path = os.path.join(
-        settings.BASE_DIR,
-        'maintenance/ml/reports/classification_report_xgb.csv'
-    )
-
-    metrics = []
-    with open(csv_path, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            metrics.append({
-                'name': row['name'],
-                'precision': float(row['precision']) * 100,
-                'recall': float(row['recall']) * 100,
-                'f1_score': float(row['f1_score']) * 100,
-            })
+    registry = reports.get_registry()
+    if model_key not in registry:
+        raise Http404("등록되지 않은 모델입니다")
+    report, metrics, _ = registry.get(model_key)
 
+    # 성능 분석 결과를 템플릿에 전달할 컨텍스트를 준비합니다
     context = {
-        'selected_model': 'xgboost',
+        'selected_model': report.key,
+        'report_models': [
+            {'key': r.key, 'label': r.label, 'icon': r.icon, 'url': reverse(f'maintenance:{r.key}')}
+            for r in registry.reports.values()
+        ],
         'report_data': metrics,
-        'accuracy': 97.46,
-        'graph_file': 'images/graphs/roc_curve_xgboost_2.html',
-        'matrix_file': 'images/confusion_matrix/confusion_matrix_xgb.html',
-        'explanation': 'XGBoost 모델의 성능 분석 결과입니다.'
+        'accuracy': report.accuracy,
+        'graph_file': report.graph_file,
+        'matrix_file': report.matrix_file,
+        'explanation': report.explanation
     }
 
-    return render(request, 'model_comparison.html', context)
\ No newline at end of file
+    return render(request, 'model_comparison.html', context)
@@ -0,0 +1,65 @@
+// static/js/model_comparison.js
+
+// 모델 비교 페이지의 차트를 화면에 보일 때만 불러옵니다
+// plotly.js 번들은 처음 필요할 때 한 번만 받고, 차트마다 figure JSON(수 KB)만 따로 받습니다
+document.addEventListener('DOMContentLoaded', function () {
+    const chartElements = document.querySelectorAll('.lazy-chart[data-figure-src]');
+    if (chartElements.length === 0) {
+        return;
+    }
+
+    // plotly.js 스크립트 로드는 페이지당 한 번만 수행합니다
+    let plotlyPromise = null;
+
+    function loadPlotly(src) {
+        if (!plotlyPromise) {
+            plotlyPromise = new Promise((resolve, reject) => {
+                window.PlotlyConfig = { MathJaxConfig: 'local' };
+                const script = document.createElement('script');
+                script.src = src;
+                script.onload = () => resolve(window.Plotly);
+                script.onerror = () => reject(new Error('plotly.js를 불러오지 못했습니다'));
+                document.head.appendChild(script);
+            });
+        }
+        return plotlyPromise;
+    }
+
+    // figure JSON과 plotly.js를 동시에 받아서 차트를 그립니다
+    async function renderChart(element) {
+        try {
+            const [Plotly, figure] = await Promise.all([
+                loadPlotly(element.dataset.plotlySrc),
+                fetch(element.dataset.figureSrc).then(response => {
+                    if (!response.ok) {
+                        throw new Error(`차트 데이터 요청 실패: ${response.status}`);
+                    }
+                    return response.json();
+                })
+            ]);
+            element.classList.remove('loading');
+            await Plotly.newPlot(element, figure.data, figure.layout, figure.config);
+        } catch (error) {
+            console.error('차트 로드 오류:', error);
+            element.classList.remove('loading');
+            element.textContent = '차트를 불러오지 못했습니다.';
+        }
+    }
+
+    // IntersectionObserver가 없는 브라우저에서는 바로 그립니다
+    if (!('IntersectionObserver' in window)) {
+        chartElements.forEach(renderChart);
+        return;
+    }
+
+    const observer = new IntersectionObserver((entries) => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                observer.unobserve(entry.target);
+                renderChart(entry.target);
+            }
+        });
+    }, { rootMargin: '200px 0px' });
+
+    chartElements.forEach(element => observer.observe(element));
+});
@@ -253,6 +253,96 @@ document.addEventListener('DOMContentLoaded', function () {  // DOM이 로드된
         return classMap[prediction] || 'status-normal';
     }
 
+    // 서버 예측 결과를 고장 상태, 결과 텍스트, 3D 모델에 반영하는 함수
+    function renderPrediction(result) {
+        // 예측 결과 변환
+        const predictionMap = {
+            'none': 0,  // 정상
+            'HDF': 2,   // 열 발산 고장
+            'PWF': 3,   // 전력 고장
+            'OSF': 4    // 과부하 고장
+        };
+
+        const prediction = {
+            class: predictionMap[result.prediction]
+        };
+
+        console.log('변환된 예측 결과:', prediction);
+
+        // 1. 고장 상태 모니터링 업데이트
+        updatePredictionDisplay(prediction);
+
+        // 2. 예측 결과 표시 업데이트
+        const predictionResult = document.getElementById('prediction-result');
+        const predictionText = document.getElementById('prediction-text');
+
+        if (predictionResult && predictionText) {
+            predictionResult.classList.remove('hidden');
+            predictionText.textContent = getPredictionText(prediction.class);
+        }
+
+        // 3. 3D 모델 상태 업데이트
+        if (window.millingMachineVisualization) {
+            try {
+                if (typeof window.millingMachineVisualization.updateMachineState === 'function') {
+                    setTimeout(() => {
+                        window.millingMachineVisualization.updateMachineState(prediction.class);
+                    }, 300);
+                } else {
+                    console.warn('3D 모델의 updateMachineState 함수를 찾을 수 없습니다.');
+                }
+            } catch (error) {
+                console.warn('3D 모델 업데이트 중 오류:', error);
+            }
+        }
+    }
+
+    // 실시간 예측 채널 (WebSocket) - 슬라이더를 움직이는 동안 최신 값만 서버로 보내고 결과를 푸시받습니다
+    // ASGI 서버가 아니어서 연결할 수 없으면 기존처럼 폼 제출로만 예측합니다
+    const LIVE_MACHINE_ID = `simulator-${Math.random().toString(36).slice(2, 10)}`;
+    let liveSocket = null;
+
+    function connectLiveChannel() {
+        if (!('WebSocket' in window)) return;
+
+        const scheme = window.location.protocol === 'https:' ? 'wss' : 'ws';
+        const socket = new WebSocket(`${scheme}://${window.location.host}/ws/predict/`);
+
+        socket.addEventListener('open', function () {
+            liveSocket = socket;
+            socket.send(JSON.stringify({ action: 'subscribe', machine_id: LIVE_MACHINE_ID }));
+        });
+
+        socket.addEventListener('message', function (event) {
+            const message = JSON.parse(event.data);
+            if (message.type === 'prediction' && message.status === 'success') {
+                renderPrediction(message);
+            }
+        });
+
+        socket.addEventListener('close', function () {
+            liveSocket = null;
+        });
+    }
+
+    // 현재 폼 값을 실시간 채널로 보냅니다 (서버가 틱 단위로 최신 값만 예측합니다)
+    function sendLiveUpdate() {
+        if (!liveSocket || liveSocket.readyState !== WebSocket.OPEN) return;
+
+        let processedData;
+        try {
+            processedData = calculateDerivedFeatures(new FormData(parameterForm));
+        } catch (error) {
+            return;
+        }
+
+        liveSocket.send(JSON.stringify({
+            action: 'update',
+            machine_id: LIVE_MACHINE_ID,
+            params: Object.fromEntries(processedData)
+        }));
+    }
+
     // 서버에 예측 요청을 보내는 함수
     async function requestPrediction(formData) {
         try {
@@ -285,46 +375,7 @@ document.addEventListener('DOMContentLoaded', function () {  // DOM이 로드된
                 throw new Error(result.message);
             }
 
-            // 예측 결과 변환
-            const predictionMap = {
-                'none': 0,  // 정상
-                'HDF': 2,   // 열 발산 고장
-                'PWF': 3,   // 전력 고장
-                'OSF': 4    // 과부하 고장
-            };
-
-            const prediction = {
-                class: predictionMap[result.prediction]
-            };
-
-            console.log('변환된 예측 결과:', prediction);
-
-            // 1. 고장 상태 모니터링 업데이트
-            updatePredictionDisplay(prediction);
-
-            // 2. 예측 결과 표시 업데이트
-            const predictionResult = document.getElementById('prediction-result');
-            const predictionText = document.getElementById('prediction-text');
-
-            if (predictionResult && predictionText) {
-                predictionResult.classList.remove('hidden');
-                predictionText.textContent = getPredictionText(prediction.class);
-            }
-
-            // 3. 3D 모델 상태 업데이트
-            if (window.millingMachineVisualization) {
-                try {
-                    if (typeof window.millingMachineVisualization.updateMachineState === 'function') {
-                        setTimeout(() => {
-                            window.millingMachineVisualization.updateMachineState(prediction.class);
-                        }, 300);
-                    } else {
-                        console.warn('3D 모델의 updateMachineState 함수를 찾을 수 없습니다.');
-                    }
-                } catch (error) {
-                    console.warn('3D 모델 업데이트 중 오류:', error);
-                }
-            }
+            renderPrediction(result);
 
         } catch (error) {
             console.error('예측 요청 오류:', error);
@@ -378,6 +429,7 @@ document.addEventListener('DOMContentLoaded', function () {  // DOM이 로드된
             }
 
             updateSliderStatus(this, value);
+            sendLiveUpdate();
         });
     });
 
@@ -386,9 +438,12 @@ document.addEventListener('DOMContentLoaded', function () {  // DOM이 로드된
             typeTabs.forEach(t => t.classList.remove('active'));
             this.classList.add('active');
             typeInput.value = this.dataset.value;
+            sendLiveUpdate();
         });
     });
 
+    connectLiveChannel();
+
     // 폼 제출 이벤트에서만 예측 실행
     parameterForm.addEventListener('submit', async function (e) {
         e.preventDefault();